@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import (
+    EngineConfig,
+    _align_signals,
+    _prepare_bars,
+    run_engine_arrays,
+)
+from backtest.metrics import score_curves
+
+METRIC_COLS = [
+    "initial_equity",
+    "final_equity",
+    "total_return",
+    "max_drawdown",
+    "num_trades",
+    "num_completed",
+    "num_wins",
+    "avg_fees",
+    "total_fees",
+]
+
+TRADE_COLS = ["column", "entry_bar", "exit_bar", "bars_held", "net_ret"]
+
+EngineResult = Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class BatchCurves:
+    """Per-bar equity (columns, bars) and completed trades (TRADE_COLS, ordered by column then exit)."""
+
+    equity: np.ndarray
+    trades: pd.DataFrame
+
+
+def _config_vectors(configs: Sequence[EngineConfig]) -> Dict[str, np.ndarray]:
+    if not configs:
+        raise ValueError("configs must not be empty")
+    if any(not c.one_position for c in configs):
+        raise ValueError("batched engine only supports one_position=True")
+    return {
+        "fee": np.array([c.fee_taker for c in configs], dtype=np.float64),
+        "slip": np.array([c.slippage_side for c in configs], dtype=np.float64),
+        "stop": np.array([c.stop_loss_pct for c in configs], dtype=np.float64),
+        "hold": np.array([c.hold_min_bars for c in configs], dtype=np.int64),
+        "init": np.array([c.initial_equity for c in configs], dtype=np.float64),
+    }
+
+
+def _close_positions(
+    idx: np.ndarray,
+    raw_px: Any,
+    side: np.ndarray,
+    slip: np.ndarray,
+    fee: np.ndarray,
+    entry_px: np.ndarray,
+    equity: np.ndarray,
+    fee_entry: np.ndarray,
+    acc: Dict[str, np.ndarray],
+) -> None:
+    # Same arithmetic as run_engine_arrays, applied to the columns in idx.
+    long_side = side == 1
+    exit_px = np.where(long_side, raw_px * (1.0 - slip), raw_px * (1.0 + slip))
+    gross_ret = np.where(long_side, (exit_px / entry_px[idx]) - 1.0, (entry_px[idx] / exit_px) - 1.0)
+
+    eq = equity[idx] * (1.0 + gross_ret)
+    fee_exit = eq * fee
+    equity[idx] = eq - fee_exit
+
+    acc["num_completed"][idx] += 1
+    acc["num_wins"][idx] += gross_ret > 0
+    acc["total_fees"][idx] += fee_entry[idx] + fee_exit
+
+
+def run_batch_arrays(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    signal_codes: np.ndarray,
+    configs: Sequence[EngineConfig],
+) -> pd.DataFrame:
+    """Advance one engine state per column, vectorized across columns, in a single pass over bars.
+
+    signal_codes is either 1-D (shared by every config) or 2-D with shape (columns, bars).
+    Returns the run_engine metrics, one row per column. total_fees/avg_fees are
+    accumulated sequentially, so they can differ from pandas' pairwise sums in the last ulp.
+    """
+    return _run_batch(open_, high, low, close, signal_codes, configs, record=False)[0]
+
+
+def run_batch_curves(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    signal_codes: np.ndarray,
+    configs: Sequence[EngineConfig],
+) -> Tuple[pd.DataFrame, BatchCurves]:
+    """run_batch_arrays plus every column's equity curve and completed trades, for backtest.metrics."""
+    return _run_batch(open_, high, low, close, signal_codes, configs, record=True)
+
+
+def _run_batch(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    signal_codes: np.ndarray,
+    configs: Sequence[EngineConfig],
+    record: bool,
+) -> Tuple[pd.DataFrame, Optional[BatchCurves]]:
+    o_arr = np.ascontiguousarray(open_, dtype=np.float64)
+    h_arr = np.ascontiguousarray(high, dtype=np.float64)
+    l_arr = np.ascontiguousarray(low, dtype=np.float64)
+    c_arr = np.ascontiguousarray(close, dtype=np.float64)
+    n = len(o_arr)
+
+    codes = np.asarray(signal_codes, dtype=np.int8)
+    if codes.ndim == 1:
+        k = len(configs)
+        if len(codes) != n:
+            raise ValueError("signal_codes length must match bars")
+        rows = codes.tolist()
+    elif codes.ndim == 2:
+        k = codes.shape[0]
+        if codes.shape[1] != n:
+            raise ValueError("signal_codes must have shape (columns, bars)")
+        if len(configs) == 1:
+            configs = list(configs) * k
+        if len(configs) != k:
+            raise ValueError("need one config per signal row (or a single shared config)")
+        rows = np.ascontiguousarray(codes.T)
+    else:
+        raise ValueError("signal_codes must be 1-D or 2-D")
+
+    cv = _config_vectors(configs)
+    fee, slip, stop, hold, init = cv["fee"], cv["slip"], cv["stop"], cv["hold"], cv["init"]
+
+    equity = init.copy()
+    peak = init.copy()
+    max_dd = np.zeros(k, dtype=np.float64)
+
+    position = np.zeros(k, dtype=np.int8)
+    entry_px = np.zeros(k, dtype=np.float64)
+    stop_px = np.zeros(k, dtype=np.float64)
+    entry_bar = np.zeros(k, dtype=np.int64)
+    fee_entry = np.zeros(k, dtype=np.float64)
+    eq_before = init.copy()
+
+    # Recording: equity rows per bar (transposed at the end) and one array chunk per exit event.
+    equity_rows = np.empty((n, k), dtype=np.float64) if record else None
+    closed: List[Tuple[np.ndarray, np.ndarray, np.ndarray, int]] = []
+
+    def log_exits(idx: np.ndarray, i: int) -> None:
+        closed.append((idx, entry_bar[idx], equity[idx] / eq_before[idx] - 1.0, i))
+
+    acc = {
+        "num_trades": np.zeros(k, dtype=np.int64),
+        "num_completed": np.zeros(k, dtype=np.int64),
+        "num_wins": np.zeros(k, dtype=np.int64),
+        "total_fees": np.zeros(k, dtype=np.float64),
+    }
+
+    opens = o_arr.tolist()
+    highs = h_arr.tolist()
+    lows = l_arr.tolist()
+    dd = np.zeros(k, dtype=np.float64)
+
+    for i in range(n):
+        s = rows[i]
+        o = opens[i]
+        in_pos = position != 0
+
+        # A) Signal exits at open[i] (guarded by hold_min_bars)
+        exiting = in_pos & (position != s) & ((i - entry_bar) >= hold)
+        if exiting.any():
+            idx = np.flatnonzero(exiting)
+            _close_positions(idx, o, position[idx], slip[idx], fee[idx], entry_px, equity, fee_entry, acc)
+            position[idx] = 0
+            if record:
+                log_exits(idx, i)
+
+        # B) Entries at open[i] (only if flat and we did not exit this bar)
+        entering = (position == 0) & ~exiting & (s != 0)
+        if entering.any():
+            idx = np.flatnonzero(entering)
+            side = s[idx] if codes.ndim == 2 else np.full(len(idx), s, dtype=np.int8)
+            long_side = side == 1
+            fill_px = np.where(long_side, o * (1.0 + slip[idx]), o * (1.0 - slip[idx]))
+            fe = equity[idx] * fee[idx]
+            eq_before[idx] = equity[idx]
+            equity[idx] -= fe
+
+            position[idx] = side
+            entry_px[idx] = fill_px
+            stop_px[idx] = np.where(long_side, fill_px * (1.0 - stop[idx]), fill_px * (1.0 + stop[idx]))
+            entry_bar[idx] = i
+            fee_entry[idx] = fe
+            acc["num_trades"][idx] += 1
+
+        # C) Stops (can exit any time)
+        if position.any():
+            stopped = ((position == 1) & (lows[i] <= stop_px)) | ((position == -1) & (highs[i] >= stop_px))
+            if stopped.any():
+                idx = np.flatnonzero(stopped)
+                _close_positions(idx, stop_px[idx], position[idx], slip[idx], fee[idx], entry_px, equity, fee_entry, acc)
+                position[idx] = 0
+                if record:
+                    log_exits(idx, i)
+
+        np.maximum(peak, equity, out=peak)
+        np.divide(peak - equity, peak, out=dd, where=peak > 0)
+        dd[peak <= 0] = 0.0
+        np.maximum(max_dd, dd, out=max_dd)
+        if record:
+            equity_rows[i] = equity
+
+    final_equity = equity.copy() if n else init.copy()
+
+    # D) Force close any open position at end of data (EOD liquidation)
+    if n and position.any():
+        idx = np.flatnonzero(position)
+        _close_positions(idx, c_arr[n - 1], position[idx], slip[idx], fee[idx], entry_px, equity, fee_entry, acc)
+        position[idx] = 0
+        if record:
+            log_exits(idx, n - 1)
+
+    completed = acc["num_completed"]
+    avg_fees = np.divide(acc["total_fees"], completed, out=np.zeros(k), where=completed > 0)
+
+    metrics = pd.DataFrame(
+        {
+            "initial_equity": init,
+            "final_equity": final_equity,
+            "total_return": final_equity - init,
+            "max_drawdown": max_dd,
+            "num_trades": acc["num_trades"],
+            "num_completed": completed,
+            "num_wins": acc["num_wins"],
+            "avg_fees": avg_fees,
+            "total_fees": acc["total_fees"],
+        },
+        columns=METRIC_COLS,
+    )
+    if not record:
+        return metrics, None
+
+    if closed:
+        column = np.concatenate([c[0] for c in closed])
+        exit_bar = np.concatenate([np.full(len(c[0]), c[3], dtype=np.int64) for c in closed])
+        entry = np.concatenate([c[1] for c in closed])
+        net_ret = np.concatenate([c[2] for c in closed])
+        order = np.argsort(column, kind="stable")
+    else:
+        column = exit_bar = entry = order = np.zeros(0, dtype=np.int64)
+        net_ret = np.zeros(0, dtype=np.float64)
+    trades = pd.DataFrame(
+        {
+            "column": column[order],
+            "entry_bar": entry[order],
+            "exit_bar": exit_bar[order],
+            "bars_held": (exit_bar - entry)[order],
+            "net_ret": net_ret[order],
+        },
+        columns=TRADE_COLS,
+    )
+    return metrics, BatchCurves(np.ascontiguousarray(equity_rows.T), trades)
+
+
+def _run_scored(
+    ts: pd.Series,
+    o: np.ndarray,
+    h: np.ndarray,
+    l: np.ndarray,
+    c: np.ndarray,
+    codes: np.ndarray,
+    configs: Sequence[EngineConfig],
+    score: bool,
+) -> pd.DataFrame:
+    if not score:
+        return run_batch_arrays(o, h, l, c, codes, configs)
+    metrics, curves = run_batch_curves(o, h, l, c, codes, configs)
+    perf = score_curves(curves.equity, ts, metrics["initial_equity"].to_numpy(), curves.trades)
+    return pd.concat([metrics, perf.drop(columns=[col for col in perf.columns if col in metrics])], axis=1)
+
+
+def run_engine_grid(
+    df: pd.DataFrame,
+    signals: pd.Series,
+    configs: Sequence[EngineConfig],
+    keep: Iterable[int] = (),
+    score: bool = False,
+) -> Tuple[pd.DataFrame, Dict[int, EngineResult]]:
+    """Run one signal series under many EngineConfigs with a single bar preparation.
+
+    Returns a metrics table (one row per config, config fields first) and full
+    run_engine outputs for the config positions listed in keep. score=True appends
+    the backtest.metrics PERF_COLS, computed from the batched equity curves.
+    """
+    configs = list(configs)
+    df = _prepare_bars(df)
+    codes = _align_signals(signals, df["ts"])
+
+    o = df["open"].to_numpy()
+    h = df["high"].to_numpy()
+    l = df["low"].to_numpy()
+    c = df["close"].to_numpy()
+
+    metrics = _run_scored(df["ts"], o, h, l, c, codes, configs, score)
+    params = pd.DataFrame([asdict(cfg) for cfg in configs])
+    table = pd.concat([params, metrics.drop(columns=list(params.columns), errors="ignore")], axis=1)
+
+    details: Dict[int, EngineResult] = {}
+    for j in sorted(set(keep)):
+        details[j] = run_engine_arrays(df["ts"], o, h, l, c, codes, configs[j])
+
+    return table, details
+
+
+def config_grid(base: EngineConfig, **axes: List[Any]) -> List[EngineConfig]:
+    """Cartesian product of EngineConfig field values around base, first axis varying slowest."""
+    grid = [asdict(base)]
+    for field, values in axes.items():
+        grid = [{**g, field: v} for g in grid for v in values]
+    return [EngineConfig(**g) for g in grid]
+
+
+def run_strategy_matrix(
+    df: pd.DataFrame,
+    signals: pd.DataFrame,
+    cfg: EngineConfig,
+    score: bool = False,
+) -> pd.DataFrame:
+    """Simulate every signal column (one strategy each) against the same bars in one pass.
+
+    signals is indexed by ts with one column per strategy. Returns one metrics row per
+    strategy, in column order, with a leading "strategy" column (plus PERF_COLS with score=True).
+    """
+    if not isinstance(signals, pd.DataFrame) or signals.shape[1] == 0:
+        raise ValueError("signals must be a DataFrame with one column per strategy")
+
+    df = _prepare_bars(df)
+    ts = df["ts"]
+    codes = np.vstack([_align_signals(signals[col], ts) for col in signals.columns])
+
+    metrics = _run_scored(
+        ts,
+        df["open"].to_numpy(),
+        df["high"].to_numpy(),
+        df["low"].to_numpy(),
+        df["close"].to_numpy(),
+        codes,
+        [cfg],
+        score,
+    )
+    metrics.insert(0, "strategy", [str(c) for c in signals.columns])
+    return metrics
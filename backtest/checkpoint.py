@@ -0,0 +1,128 @@
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import (
+    EngineConfig,
+    EngineState,
+    _TRADE_TS_COLS,
+    _align_signals,
+    _prepare_bars,
+)
+from data_parquet.bars import as_frame
+
+
+def save_checkpoint(state: EngineState, path: str) -> None:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(p.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(state.to_dict(), f, indent=2)
+    os.replace(tmp, p)
+
+
+def load_checkpoint(path: str, cfg: Optional[EngineConfig] = None) -> EngineState:
+    with open(path, "r") as f:
+        state = EngineState.from_dict(json.load(f))
+    if cfg is not None and state.cfg != cfg:
+        raise ValueError(f"checkpoint config {state.cfg} does not match {cfg}")
+    return state
+
+
+def _write_part(df: pd.DataFrame, out_dir: str, first_bar_idx: int) -> None:
+    # Part files are named by the first bar they cover, so re-running a step that
+    # crashed before its checkpoint was saved overwrites the same part.
+    d = Path(out_dir)
+    d.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(d / f"part-{first_bar_idx:010d}.parquet", index=False)
+
+
+def _sorted_ts(index: pd.Index) -> bool:
+    # tz-aware and non-decreasing: safe to searchsorted against the checkpoint's UTC last_ts.
+    return isinstance(index, pd.DatetimeIndex) and index.tz is not None and index.is_monotonic_increasing
+
+
+def _tail(df: pd.DataFrame, signals: pd.Series, last_ts: pd.Timestamp) -> Tuple[pd.DataFrame, pd.Series]:
+    """Rows of df and signals after last_ts, cut with searchsorted where ts is sorted."""
+    ts = pd.DatetimeIndex(df["ts"]) if isinstance(df["ts"].dtype, pd.DatetimeTZDtype) else None
+    if ts is not None and _sorted_ts(ts):
+        df = df.iloc[int(ts.searchsorted(last_ts, side="right")) :]
+    if _sorted_ts(signals.index):
+        signals = signals.iloc[int(signals.index.searchsorted(last_ts, side="right")) :]
+    return df, signals
+
+
+def resume_engine(
+    df: pd.DataFrame,
+    signals: pd.Series,
+    cfg: EngineConfig,
+    checkpoint_path: str,
+    trades_dir: str,
+    equity_dir: str,
+) -> Tuple[pd.DataFrame, pd.DataFrame, EngineState]:
+    """Advance the engine over bars newer than the checkpoint.
+
+    With ts and the signal index sorted and tz-aware (as the bar loaders give them) the
+    history costs one vectorised sortedness check and a binary search; only the new bars
+    are prepared, aligned and replayed in Python. Otherwise the whole frame is parsed and
+    sorted first, O(n log n), and the whole signal series is encoded.
+
+    Closed trades and equity rows for the new bars are appended as parquet parts under
+    trades_dir / equity_dir (read them back with pd.read_parquet(dir)); the open position
+    stays in the checkpoint and is not liquidated.
+    """
+    if Path(checkpoint_path).exists():
+        state = load_checkpoint(checkpoint_path, cfg)
+    else:
+        state = EngineState(cfg)
+
+    df = as_frame(df)
+    if state.last_ts is not None:
+        df, signals = _tail(df, signals, state.last_ts)
+    bars = _prepare_bars(df)
+    if state.last_ts is not None:
+        # Only filters anything when df was not sorted.
+        bars = bars.loc[bars["ts"] > state.last_ts].reset_index(drop=True)
+    if bars.empty:
+        return pd.DataFrame([]), pd.DataFrame([]), state
+
+    codes = _align_signals(signals, bars["ts"])
+    first_bar_idx = state.bar_idx + 1
+
+    n = len(bars)
+    equity_arr = np.empty(n, dtype=np.float64)
+    peak_arr = np.empty(n, dtype=np.float64)
+    dd_arr = np.empty(n, dtype=np.float64)
+    closed: List[dict] = []
+
+    rows = zip(
+        list(bars["ts"]),
+        bars["open"].tolist(),
+        bars["high"].tolist(),
+        bars["low"].tolist(),
+        bars["close"].tolist(),
+        codes.tolist(),
+    )
+    for i, (t, o, h, l, c, s) in enumerate(rows):
+        for ev in state.on_bar(t, o, h, l, c, s):
+            if ev.kind == "exit":
+                closed.append(ev.trade)
+        equity_arr[i] = state.equity
+        peak_arr[i] = state.peak
+        dd_arr[i] = state.drawdown
+
+    trades_df = pd.DataFrame(closed)
+    if not trades_df.empty:
+        for col in _TRADE_TS_COLS:
+            trades_df[col] = pd.to_datetime(trades_df[col], utc=True, errors="coerce")
+        _write_part(trades_df, trades_dir, first_bar_idx)
+
+    equity_df = pd.DataFrame({"ts": bars["ts"], "equity": equity_arr, "peak": peak_arr, "drawdown": dd_arr})
+    _write_part(equity_df, equity_dir, first_bar_idx)
+
+    save_checkpoint(state, checkpoint_path)
+    return trades_df, equity_df, state
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from data_parquet.bars import as_frame
+from data_parquet.dataset import is_presorted
+from model.signals import DOWN, FLAT, SIGNAL_CODES, SIGNAL_DTYPE, UP, encode_signals
+
+# "array" drives EngineState (shared with the paper engine); "frame" is the original
+# per-row loop, kept as the reference implementation for parity tests.
+ENGINE_MODES = ("frame", "array")
+
+_TRADE_TS_COLS = ["decision_ts", "entry_ts", "exit_ts"]
+
 
 @dataclass(frozen=True)
 class EngineConfig:
@@ -27,25 +38,375 @@ def _apply_fill_price(direction: str, raw_price: float, slip: float) -> float:
     raise ValueError(f"bad direction: {direction}")
 
 
-def run_engine(
-    df: pd.DataFrame,
-    signals: pd.Series,
+def _new_trade_record(decision_ts: pd.Timestamp, side: str) -> Dict[str, Any]:
+    return {
+        "decision_ts": decision_ts,
+        "side": side,
+        "entry_ts": None,
+        "entry_raw_px": None,
+        "entry_px": None,
+        "entry_bar_idx": None,
+        "equity_before_entry": None,
+        "fee_entry": 0.0,
+        "exit_ts": None,
+        "exit_raw_px": None,
+        "exit_px": None,
+        "exit_bar_idx": None,
+        "equity_after_exit": None,
+        "fee_exit": 0.0,
+        "exit_reason": None,
+        "gross_ret": None,
+        "fees_total": None,
+        "net_pnl_dollars": None,
+        "net_ret": None,
+        "bars_held": None,
+    }
+
+
+def _finalize_trade_record(
+    t: Dict[str, Any],
+    exit_bar_idx: int,
+    exit_ts: pd.Timestamp,
+    exit_raw_px: float,
+    exit_px_filled: float,
+    fee_exit: float,
+    exit_reason: str,
+    gross_ret: float,
+    equity: float,
+) -> None:
+    t["exit_ts"] = exit_ts
+    t["exit_raw_px"] = float(exit_raw_px)
+    t["exit_px"] = float(exit_px_filled)
+    t["exit_bar_idx"] = int(exit_bar_idx)
+    t["fee_exit"] = float(fee_exit)
+    t["exit_reason"] = exit_reason
+    t["equity_after_exit"] = float(equity)
+    t["gross_ret"] = float(gross_ret)
+
+    fees_total = float(t["fee_entry"]) + float(fee_exit)
+    t["fees_total"] = float(fees_total)
+
+    eq_before = float(t["equity_before_entry"]) if t["equity_before_entry"] is not None else 0.0
+    net_pnl = float(equity) - eq_before
+    t["net_pnl_dollars"] = float(net_pnl)
+    t["net_ret"] = float(net_pnl / eq_before) if eq_before > 0 else 0.0
+
+    if t["entry_bar_idx"] is not None:
+        t["bars_held"] = int(exit_bar_idx - int(t["entry_bar_idx"]))
+
+
+def _build_outputs(
+    trades: List[Dict[str, Any]],
+    equity_df: pd.DataFrame,
     cfg: EngineConfig,
 ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]:
+    trades_df = pd.DataFrame(trades)
+
+    if not trades_df.empty:
+        for col in _TRADE_TS_COLS:
+            trades_df[col] = pd.to_datetime(trades_df[col], utc=True, errors="coerce")
+
+    if not equity_df.empty:
+        equity_df["ts"] = pd.to_datetime(equity_df["ts"], utc=True)
+
+    max_dd = float(equity_df["drawdown"].max()) if not equity_df.empty else 0.0
+    final_equity = float(equity_df["equity"].iloc[-1]) if not equity_df.empty else float(cfg.initial_equity)
+    total_ret = float(final_equity - float(cfg.initial_equity))
+
+    completed = trades_df.dropna(subset=["exit_px"]) if not trades_df.empty else trades_df
+
+    metrics: Dict[str, Any] = {
+        "initial_equity": float(cfg.initial_equity),
+        "final_equity": float(final_equity),
+        "total_return": float(total_ret),
+        "max_drawdown": float(max_dd),
+        "num_trades": int(len(trades_df)),
+        "num_completed": int(len(completed)) if not trades_df.empty else 0,
+        "num_wins": int((completed["gross_ret"] > 0).sum()) if not completed.empty else 0,
+        "avg_fees": float(completed["fees_total"].mean()) if not completed.empty else 0.0,
+        "total_fees": float(completed["fees_total"].sum()) if not completed.empty else 0.0,
+    }
+
+    return trades_df, equity_df, metrics
+
+
+def _prepare_bars(df: pd.DataFrame) -> pd.DataFrame:
+    df = as_frame(df)
     required_cols = {"ts", "open", "high", "low", "close", "volume"}
     missing = required_cols - set(df.columns)
     if missing:
         raise ValueError(f"df missing cols: {missing}")
 
+    if is_presorted(df):
+        return df.reset_index(drop=True)
+
     df = df.copy()
     df["ts"] = pd.to_datetime(df["ts"], utc=True)
-    df = df.sort_values("ts").reset_index(drop=True)
+    return df.sort_values("ts").reset_index(drop=True)
 
-    sig = signals.copy()
-    if not isinstance(sig.index, pd.DatetimeIndex):
+
+def _align_signals(signals: pd.Series, ts: pd.Series) -> np.ndarray:
+    if not isinstance(signals.index, pd.DatetimeIndex):
         raise ValueError("signals index must be DateTimeIndex aligned to df ts")
-    sig.index = pd.to_datetime(sig.index, utc=True)
-    sig = sig.reindex(df["ts"]).fillna("flat").astype("object")
+    sig = pd.Series(encode_signals(signals), index=pd.to_datetime(signals.index, utc=True))
+    return sig.reindex(ts, fill_value=FLAT).to_numpy(dtype=SIGNAL_DTYPE)
+
+
+@dataclass(frozen=True)
+class TradeEvent:
+    kind: str  # "entry" or "exit"
+    bar_idx: int
+    trade: Dict[str, Any]
+
+
+_NO_EVENTS: Tuple[TradeEvent, ...] = ()
+
+
+class EngineState:
+    """Bar-by-bar engine shared by backtests and the paper engine.
+
+    on_bar() applies signal exits, entries and stops at one bar in O(1) and returns the
+    trade events it produced. The open trade record is mutated in place when it closes,
+    so an "entry" event's trade dict ends up complete. liquidate() is the EOD force close.
+    """
+
+    def __init__(self, cfg: EngineConfig) -> None:
+        self.cfg = cfg
+        self._fee = float(cfg.fee_taker)
+        self._slip = float(cfg.slippage_side)
+        self._stop = float(cfg.stop_loss_pct)
+        self._hold = int(cfg.hold_min_bars)
+
+        self.equity = float(cfg.initial_equity)
+        self.peak = float(cfg.initial_equity)
+        self.drawdown = 0.0
+
+        self.position = FLAT
+        self.entry_px: Optional[float] = None
+        self.entry_bar_idx: Optional[int] = None
+        self.trade: Optional[Dict[str, Any]] = None
+
+        self.bar_idx = -1
+        self.last_ts: Optional[pd.Timestamp] = None
+        self.last_close: Optional[float] = None
+
+    def _close(self, i: int, ts: Any, raw_px: float, fill_px: float, gross_ret: float, reason: str) -> TradeEvent:
+        equity = self.equity * (1.0 + gross_ret)
+        fee_exit = equity * self._fee
+        equity -= fee_exit
+        self.equity = equity
+
+        trade = self.trade
+        _finalize_trade_record(trade, i, ts, raw_px, fill_px, fee_exit, reason, gross_ret, equity)
+        self.position, self.entry_px, self.entry_bar_idx, self.trade = FLAT, None, None, None
+        return TradeEvent("exit", i, trade)
+
+    def on_bar(self, ts: Any, o: float, h: float, l: float, c: float, signal: Any) -> Tuple[TradeEvent, ...]:
+        if signal.__class__ is str:
+            signal = SIGNAL_CODES[signal]
+        slip = self._slip
+        i = self.bar_idx + 1
+        events = _NO_EVENTS
+        exited_this_bar = False
+        position = self.position
+
+        # A) Signal exits at open[i] (guarded by hold_min_bars)
+        if position != FLAT and signal != position and (i - self.entry_bar_idx) >= self._hold:
+            entry_px = self.entry_px
+            if position == UP:
+                exit_px = o * (1.0 - slip)
+                gross_ret = (exit_px / entry_px) - 1.0
+            else:
+                exit_px = o * (1.0 + slip)
+                gross_ret = (entry_px / exit_px) - 1.0
+            events = (self._close(i, ts, o, exit_px, gross_ret, "signal"),)
+            position = FLAT
+            exited_this_bar = True
+
+        # B) Entries at open[i] (only if flat and we did not exit this bar)
+        if position == FLAT and (not exited_this_bar) and signal != FLAT:
+            trade = _new_trade_record(ts, "long" if signal == UP else "short")
+            trade["equity_before_entry"] = float(self.equity)
+            trade["entry_ts"] = ts
+            trade["entry_raw_px"] = float(o)
+            trade["entry_bar_idx"] = int(i)
+
+            fill_px = o * (1.0 + slip) if signal == UP else o * (1.0 - slip)
+            fee_entry = self.equity * self._fee
+            self.equity -= fee_entry
+
+            trade["entry_px"] = float(fill_px)
+            trade["fee_entry"] = float(fee_entry)
+
+            position = UP if signal == UP else DOWN
+            self.position, self.entry_px, self.entry_bar_idx, self.trade = position, fill_px, i, trade
+            events = events + (TradeEvent("entry", i, trade),)
+
+        # C) Stops (can exit any time)
+        if position == UP:
+            stop_px = self.entry_px * (1.0 - self._stop)
+            if l <= stop_px:
+                stop_fill = stop_px * (1.0 - slip)
+                gross_ret = (stop_fill / self.entry_px) - 1.0
+                events = events + (self._close(i, ts, stop_px, stop_fill, gross_ret, "stop"),)
+
+        elif position == DOWN:
+            stop_px = self.entry_px * (1.0 + self._stop)
+            if h >= stop_px:
+                stop_fill = stop_px * (1.0 + slip)
+                gross_ret = (self.entry_px / stop_fill) - 1.0
+                events = events + (self._close(i, ts, stop_px, stop_fill, gross_ret, "stop"),)
+
+        equity = self.equity
+        peak = max(self.peak, equity)
+        self.peak = peak
+        self.drawdown = (peak - equity) / peak if peak > 0 else 0.0
+
+        self.bar_idx = i
+        self.last_ts = ts
+        self.last_close = c
+        return events
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe snapshot of everything needed to resume; timestamps as ISO strings."""
+
+        def _ts(v: Any) -> Any:
+            return v.isoformat() if isinstance(v, pd.Timestamp) else v
+
+        trade = None if self.trade is None else {k: _ts(v) for k, v in self.trade.items()}
+        return {
+            "cfg": asdict(self.cfg),
+            "equity": self.equity,
+            "peak": self.peak,
+            "drawdown": self.drawdown,
+            "position": int(self.position),
+            "entry_px": self.entry_px,
+            "entry_bar_idx": self.entry_bar_idx,
+            "trade": trade,
+            "bar_idx": self.bar_idx,
+            "last_ts": _ts(self.last_ts),
+            "ts_unit": self.last_ts.unit if isinstance(self.last_ts, pd.Timestamp) else None,
+            "last_close": self.last_close,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "EngineState":
+        unit = d.get("ts_unit")
+
+        def _ts(v: Any) -> Any:
+            if v is None:
+                return None
+            ts = pd.Timestamp(v)
+            return ts.as_unit(unit) if unit else ts
+
+        state = cls(EngineConfig(**d["cfg"]))
+        state.equity = float(d["equity"])
+        state.peak = float(d["peak"])
+        state.drawdown = float(d["drawdown"])
+        state.position = int(d["position"])
+        state.entry_px = d["entry_px"]
+        state.entry_bar_idx = d["entry_bar_idx"]
+        state.bar_idx = int(d["bar_idx"])
+        state.last_ts = _ts(d["last_ts"])
+        state.last_close = d["last_close"]
+        if d["trade"] is not None:
+            trade = dict(d["trade"])
+            for col in _TRADE_TS_COLS:
+                trade[col] = _ts(trade[col])
+            state.trade = trade
+        return state
+
+    def liquidate(self) -> Tuple[TradeEvent, ...]:
+        # D) Force close any open position at the last processed bar's close (EOD liquidation)
+        if self.position == FLAT or self.trade is None:
+            return _NO_EVENTS
+
+        slip = self._slip
+        last_close = float(self.last_close)
+        if self.position == UP:
+            exit_px = last_close * (1.0 - slip)
+            gross_ret = (exit_px / self.entry_px) - 1.0
+        else:
+            exit_px = last_close * (1.0 + slip)
+            gross_ret = (self.entry_px / exit_px) - 1.0
+        return (self._close(self.bar_idx, self.last_ts, last_close, exit_px, gross_ret, "eod"),)
+
+
+def run_engine_arrays(
+    ts: Any,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    signal_codes: np.ndarray,
+    cfg: EngineConfig,
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]:
+    """Drive EngineState over contiguous arrays, writing equity/peak/drawdown into preallocated buffers.
+
+    Inputs must already be sorted by ts. signal_codes uses model.signals codes (1 up, -1 down, 0 flat).
+    """
+    ts_idx = pd.DatetimeIndex(pd.to_datetime(ts, utc=True))
+    o_arr = np.ascontiguousarray(open_, dtype=np.float64)
+    h_arr = np.ascontiguousarray(high, dtype=np.float64)
+    l_arr = np.ascontiguousarray(low, dtype=np.float64)
+    c_arr = np.ascontiguousarray(close, dtype=np.float64)
+    codes = np.ascontiguousarray(signal_codes, dtype=SIGNAL_DTYPE)
+
+    n = len(ts_idx)
+    if any(len(a) != n for a in (o_arr, h_arr, l_arr, c_arr, codes)):
+        raise ValueError("ts, ohlc and signal arrays must have the same length")
+
+    equity_arr = np.empty(n, dtype=np.float64)
+    peak_arr = np.empty(n, dtype=np.float64)
+    dd_arr = np.empty(n, dtype=np.float64)
+
+    state = EngineState(cfg)
+    on_bar = state.on_bar
+    trades: List[Dict[str, Any]] = []
+
+    bars = zip(list(ts_idx), o_arr.tolist(), h_arr.tolist(), l_arr.tolist(), c_arr.tolist(), codes.tolist())
+    for i, (t, o, h, l, c, s) in enumerate(bars):
+        for ev in on_bar(t, o, h, l, c, s):
+            if ev.kind == "entry":
+                trades.append(ev.trade)
+        equity_arr[i] = state.equity
+        peak_arr[i] = state.peak
+        dd_arr[i] = state.drawdown
+
+    state.liquidate()
+
+    if n == 0:
+        equity_df = pd.DataFrame([])
+    else:
+        equity_df = pd.DataFrame(
+            {"ts": ts_idx, "equity": equity_arr, "peak": peak_arr, "drawdown": dd_arr}
+        )
+
+    return _build_outputs(trades, equity_df, cfg)
+
+
+def run_engine(
+    df: pd.DataFrame,
+    signals: pd.Series,
+    cfg: EngineConfig,
+    mode: str = "array",
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]:
+    if mode not in ENGINE_MODES:
+        raise ValueError(f"mode must be one of {ENGINE_MODES}, got {mode!r}")
+
+    df = _prepare_bars(df)
+    sig = _align_signals(signals, df["ts"])
+
+    if mode == "array":
+        return run_engine_arrays(
+            df["ts"],
+            df["open"].to_numpy(),
+            df["high"].to_numpy(),
+            df["low"].to_numpy(),
+            df["close"].to_numpy(),
+            sig,
+            cfg,
+        )
 
     equity = float(cfg.initial_equity)
     peak = float(cfg.initial_equity)
@@ -67,30 +428,7 @@ def run_engine(
         )
 
     def _new_trade(decision_ts: pd.Timestamp, side: str) -> int:
-        trades.append(
-            {
-                "decision_ts": decision_ts,
-                "side": side,
-                "entry_ts": None,
-                "entry_raw_px": None,
-                "entry_px": None,
-                "entry_bar_idx": None,
-                "equity_before_entry": None,
-                "fee_entry": 0.0,
-                "exit_ts": None,
-                "exit_raw_px": None,
-                "exit_px": None,
-                "exit_bar_idx": None,
-                "equity_after_exit": None,
-                "fee_exit": 0.0,
-                "exit_reason": None,
-                "gross_ret": None,
-                "fees_total": None,
-                "net_pnl_dollars": None,
-                "net_ret": None,
-                "bars_held": None,
-            }
-        )
+        trades.append(_new_trade_record(decision_ts, side))
         return len(trades) - 1
 
     def finalize_trade(
@@ -103,27 +441,9 @@ def run_engine(
         exit_reason: str,
         gross_ret: float,
     ) -> None:
-        nonlocal equity
-        t = trades[trade_idx]
-        t["exit_ts"] = exit_ts
-        t["exit_raw_px"] = float(exit_raw_px)
-        t["exit_px"] = float(exit_px_filled)
-        t["exit_bar_idx"] = int(exit_bar_idx)
-        t["fee_exit"] = float(fee_exit)
-        t["exit_reason"] = exit_reason
-        t["equity_after_exit"] = float(equity)
-        t["gross_ret"] = float(gross_ret)
-
-        fees_total = float(t["fee_entry"]) + float(fee_exit)
-        t["fees_total"] = float(fees_total)
-
-        eq_before = float(t["equity_before_entry"]) if t["equity_before_entry"] is not None else 0.0
-        net_pnl = float(equity) - eq_before
-        t["net_pnl_dollars"] = float(net_pnl)
-        t["net_ret"] = float(net_pnl / eq_before) if eq_before > 0 else 0.0
-
-        if t["entry_bar_idx"] is not None:
-            t["bars_held"] = int(exit_bar_idx - int(t["entry_bar_idx"]))
+        _finalize_trade_record(
+            trades[trade_idx], exit_bar_idx, exit_ts, exit_raw_px, exit_px_filled, fee_exit, exit_reason, gross_ret, equity
+        )
 
     n = len(df)
 
@@ -135,12 +455,12 @@ def run_engine(
         h = float(df.loc[i, "high"])
         l = float(df.loc[i, "low"])
 
-        s = str(sig.iloc[i])
+        s = int(sig[i])
         bars_in_pos = i - entry_bar_idx if entry_bar_idx is not None else 0
         can_signal_exit = bars_in_pos >= int(cfg.hold_min_bars)
 
         # A) Signal exits at open[i] (guarded by hold_min_bars)
-        if position == "long" and can_signal_exit and s in ("down", "flat"):
+        if position == "long" and can_signal_exit and s in (DOWN, FLAT):
             exit_px = _apply_fill_price("long_exit", o, cfg.slippage_side)
             gross_ret = (exit_px / float(entry_px)) - 1.0
 
@@ -152,7 +472,7 @@ def run_engine(
             position, entry_px, entry_bar_idx, active_trade_idx = "flat", None, None, None
             exited_this_bar = True
 
-        elif position == "short" and can_signal_exit and s in ("up", "flat"):
+        elif position == "short" and can_signal_exit and s in (UP, FLAT):
             exit_px = _apply_fill_price("short_exit", o, cfg.slippage_side)
             gross_ret = (float(entry_px) / exit_px) - 1.0
 
@@ -166,7 +486,7 @@ def run_engine(
 
         # B) Entries at open[i] (only if flat and we did not exit this bar)
         if position == "flat" and (not exited_this_bar):
-            if s == "up":
+            if s == UP:
                 trade_idx = _new_trade(ts, "long")
                 t = trades[trade_idx]
                 t["equity_before_entry"] = float(equity)
@@ -183,7 +503,7 @@ def run_engine(
 
                 position, entry_px, entry_bar_idx, active_trade_idx = "long", float(fill_px), int(i), trade_idx
 
-            elif s == "down":
+            elif s == DOWN:
                 trade_idx = _new_trade(ts, "short")
                 t = trades[trade_idx]
                 t["equity_before_entry"] = float(equity)
@@ -252,32 +572,4 @@ def run_engine(
         finalize_trade(active_trade_idx, last_i, last_ts, last_close, exit_px, fee_exit, "eod", gross_ret)
         position, entry_px, entry_bar_idx, active_trade_idx = "flat", None, None, None
 
-    trades_df = pd.DataFrame(trades)
-    equity_df = pd.DataFrame(equity_rows)
-
-    if not trades_df.empty:
-        for col in ["decision_ts", "entry_ts", "exit_ts"]:
-            trades_df[col] = pd.to_datetime(trades_df[col], utc=True, errors="coerce")
-
-    if not equity_df.empty:
-        equity_df["ts"] = pd.to_datetime(equity_df["ts"], utc=True)
-
-    max_dd = float(equity_df["drawdown"].max()) if not equity_df.empty else 0.0
-    final_equity = float(equity_df["equity"].iloc[-1]) if not equity_df.empty else float(cfg.initial_equity)
-    total_ret = float(final_equity - float(cfg.initial_equity))
-
-    completed = trades_df.dropna(subset=["exit_px"]) if not trades_df.empty else trades_df
-
-    metrics: Dict[str, Any] = {
-        "initial_equity": float(cfg.initial_equity),
-        "final_equity": float(final_equity),
-        "total_return": float(total_ret),
-        "max_drawdown": float(max_dd),
-        "num_trades": int(len(trades_df)),
-        "num_completed": int(len(completed)) if not trades_df.empty else 0,
-        "num_wins": int((completed["gross_ret"] > 0).sum()) if not completed.empty else 0,
-        "avg_fees": float(completed["fees_total"].mean()) if not completed.empty else 0.0,
-        "total_fees": float(completed["fees_total"].sum()) if not completed.empty else 0.0,
-    }
-
-    return trades_df, equity_df, metrics
+    return _build_outputs(trades, pd.DataFrame(equity_rows), cfg)
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from backtest.results import KEY_COLS
+from backtest.windows import CONFIG_PATH
+
+DEFAULT_BASELINES = ("always_up", "yesterday_equals_today")
+
+# A window is one evaluation period on one set of bars; candidates are only compared within it.
+WINDOW_COLS = ["split", "data_hash"]
+
+
+@dataclass(frozen=True)
+class GateConfig:
+    max_drawdown: float
+    must_beat_baselines: bool = True
+    baselines: Tuple[str, ...] = DEFAULT_BASELINES
+
+    @classmethod
+    def from_config(cls, gates: Dict[str, Any]) -> "GateConfig":
+        return cls(
+            max_drawdown=float(gates["max_drawdown"]),
+            must_beat_baselines=bool(gates.get("must_beat_baselines", True)),
+            baselines=tuple(gates.get("baselines", DEFAULT_BASELINES)),
+        )
+
+
+def load_gate_config(path: str = CONFIG_PATH) -> GateConfig:
+    with open(path, "r") as f:
+        return GateConfig.from_config(yaml.safe_load(f)["gates"])
+
+
+def _codes(rows: pd.DataFrame, cols: List[str]) -> Tuple[np.ndarray, int]:
+    codes, uniques = pd.MultiIndex.from_frame(rows[cols].astype(str)).factorize()
+    return codes, len(uniques)
+
+
+def _best_per_group(codes: np.ndarray, n_groups: int, values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    best = np.full(n_groups, np.nan)
+    np.fmax.at(best, codes[mask], values[mask])
+    return best
+
+
+def evaluate_gates(results: pd.DataFrame, gates: GateConfig, rank_by: str = "growth") -> pd.DataFrame:
+    """Gate and rank every candidate row of a results set against the baselines, in array passes.
+
+    results has one row per run with strategy, config_hash, split, data_hash, final_equity,
+    max_drawdown (initial_equity optional), e.g. ResultsStore.query(). Candidates are all
+    strategies that are not baselines. Each baseline is matched on the candidate's window and
+    config_hash, falling back to its best run in the window. Returns one row per candidate with
+    a bool column per gate, "passed", and "rank" within its window (passing first, then rank_by
+    descending, 1 = best).
+    """
+    rows = results.reset_index(drop=True)
+    final = rows["final_equity"].to_numpy(dtype=np.float64)
+    init = rows["initial_equity"].to_numpy(dtype=np.float64) if "initial_equity" in rows else np.ones(len(rows))
+    growth = final / init
+    strategy = rows["strategy"].to_numpy()
+
+    win, n_win = _codes(rows, WINDOW_COLS)
+    win_cfg, n_win_cfg = _codes(rows, WINDOW_COLS + ["config_hash"])
+    is_candidate = ~np.isin(strategy, gates.baselines)
+
+    gate_cols: Dict[str, np.ndarray] = {
+        "gate_max_drawdown": rows["max_drawdown"].to_numpy(dtype=np.float64) <= gates.max_drawdown,
+    }
+    bar = np.full(len(rows), np.nan)
+    if gates.must_beat_baselines:
+        for name in gates.baselines:
+            mask = strategy == name
+            per_cfg = _best_per_group(win_cfg, n_win_cfg, growth, mask)[win_cfg]
+            per_win = _best_per_group(win, n_win, growth, mask)[win]
+            base = np.where(np.isnan(per_cfg), per_win, per_cfg)
+            # A missing baseline cannot be beaten: NaN compares False.
+            gate_cols[f"gate_beats_{name}"] = growth > base
+            bar = np.fmax(bar, base)
+
+    passed = np.logical_and.reduce(list(gate_cols.values()))
+    out = rows.assign(growth=growth, excess_growth=growth - bar, **gate_cols, passed=passed)
+    out = out[is_candidate].reset_index(drop=True)
+
+    # Rank within each window: sort by (window, failed, -score), then number positions per window.
+    cand_win = win[is_candidate]
+    score = out[rank_by].to_numpy(dtype=np.float64)
+    order = np.lexsort((-np.nan_to_num(score, nan=-np.inf), ~out["passed"].to_numpy(), cand_win))
+    sorted_win = cand_win[order]
+    starts = np.flatnonzero(np.r_[True, sorted_win[1:] != sorted_win[:-1]])
+    first = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order)) - first + 1
+    out["rank"] = rank
+    return out
+
+
+def gate_matrix(gated: pd.DataFrame) -> pd.DataFrame:
+    """Pass/fail matrix: one row per candidate key, one bool column per gate plus "passed"."""
+    keys = [c for c in KEY_COLS if c in gated.columns]
+    cols = [c for c in gated.columns if c.startswith("gate_")] + ["passed"]
+    return gated.set_index(keys)[cols]
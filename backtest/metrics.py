@@ -0,0 +1,191 @@
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+PERF_COLS = [
+    "cagr",
+    "ann_vol",
+    "sharpe",
+    "sortino",
+    "calmar",
+    "max_drawdown",
+    "max_dd_duration",
+    "exposure",
+    "turnover",
+    "avg_bars_held",
+    "max_win_streak",
+    "max_loss_streak",
+]
+
+YEAR_NS = int(365.25 * 24 * 3600 * 10**9)
+
+EquityLike = Union[np.ndarray, float]
+
+
+def longest_underwater(at_peak: np.ndarray) -> np.ndarray:
+    """Longest run of False per row of a 2-D bool array (e.g. bars below the running peak).
+
+    Works from the positions of the True entries only.
+    """
+    rows, n = at_peak.shape
+    width = n + 2
+    # Every row gets sentinel highs at step -1 (the initial equity) and step n.
+    flat = np.flatnonzero(at_peak)
+    r = np.arange(rows, dtype=np.int64) * width
+    keys = np.sort(np.concatenate([flat // n * width + flat % n + 1, r, r + n + 1]))
+    row_of = keys // width
+    gaps = np.where(row_of[1:] == row_of[:-1], np.diff(keys) - 1, 0)
+    return np.maximum.reduceat(gaps, np.searchsorted(row_of, np.arange(rows)))
+
+
+def _ts_ns(ts: Any) -> np.ndarray:
+    return pd.DatetimeIndex(pd.to_datetime(ts, utc=True)).as_unit("ns").asi8
+
+
+def periods_per_year(ts: Any) -> float:
+    """Bars per year from the median bar spacing (8766 for hourly bars)."""
+    ns = _ts_ns(ts)
+    if len(ns) < 2:
+        return float("nan")
+    return YEAR_NS / float(np.median(np.diff(ns)))
+
+
+def _as_batch(equity: Any, initial_equity: EquityLike) -> Tuple[np.ndarray, np.ndarray]:
+    eq = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+    init = np.broadcast_to(np.asarray(initial_equity, dtype=np.float64), (eq.shape[0],))
+    return eq, init
+
+
+def curve_metrics(equity: Any, initial_equity: EquityLike, ppy: float) -> Dict[str, np.ndarray]:
+    """Return/risk metrics of one equity curve (bars,) or a batch (curves, bars), one value per curve.
+
+    Bar returns start from initial_equity, so the first bar's fees count. max_dd_duration
+    is the longest run of bars below the running peak (which starts at initial_equity).
+    """
+    eq, init = _as_batch(equity, initial_equity)
+    k, n = eq.shape
+    nan = np.full(k, np.nan)
+    if n == 0:
+        out = {c: nan for c in ("cagr", "ann_vol", "sharpe", "sortino", "calmar")}
+        return {**out, "max_drawdown": np.zeros(k), "max_dd_duration": np.zeros(k, dtype=np.int64)}
+
+    prev = np.empty_like(eq)
+    prev[:, 0] = init
+    prev[:, 1:] = eq[:, :-1]
+    r = eq / prev - 1.0
+
+    mean = r.mean(axis=1)
+    sd = r.std(axis=1, ddof=1) if n > 1 else nan
+    downside = np.sqrt(np.mean(np.minimum(r, 0.0) ** 2, axis=1))
+    scale = np.sqrt(ppy)
+
+    peak = np.maximum(np.maximum.accumulate(eq, axis=1), init[:, None])
+    dd = (peak - eq) / peak
+    max_dd = dd.max(axis=1)
+
+    years = n / ppy
+    growth = eq[:, -1] / init
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cagr = np.where(growth > 0, np.power(np.maximum(growth, 0.0), 1.0 / years) - 1.0, -1.0)
+        return {
+            "cagr": cagr,
+            "ann_vol": sd * scale,
+            "sharpe": np.where(sd > 0, mean / sd * scale, np.nan),
+            "sortino": np.where(downside > 0, mean / downside * scale, np.nan),
+            "calmar": np.where(max_dd > 0, cagr / max_dd, np.nan),
+            "max_drawdown": max_dd,
+            "max_dd_duration": longest_underwater(eq >= peak),
+        }
+
+
+def trade_metrics(trades: pd.DataFrame, n_curves: int, n_bars: int, ppy: float) -> Dict[str, np.ndarray]:
+    """Exposure, turnover, holding time and win/loss streaks from a flat trade table.
+
+    trades has backtest.batch.TRADE_COLS (column, bars_held, net_ret, ...) ordered by
+    column then exit, so every curve is handled with bincount/maximum.at instead of a groupby.
+    Turnover is equity notional traded per year (2 per round trip, full-capital sizing).
+    """
+    col = trades["column"].to_numpy(dtype=np.int64)
+    held = trades["bars_held"].to_numpy(dtype=np.float64)
+    win = trades["net_ret"].to_numpy(dtype=np.float64) > 0
+
+    count = np.bincount(col, minlength=n_curves)
+    bars = np.bincount(col, weights=held, minlength=n_curves)
+    years = n_bars / ppy if n_bars else np.nan
+
+    # Runs of equal outcome within a column: a new run starts at a column or outcome change.
+    start = np.ones(len(col), dtype=bool)
+    start[1:] = (col[1:] != col[:-1]) | (win[1:] != win[:-1])
+    run_len = np.diff(np.append(np.flatnonzero(start), len(col)))
+    run_col = col[start]
+    run_win = win[start]
+    win_streak = np.zeros(n_curves, dtype=np.int64)
+    loss_streak = np.zeros(n_curves, dtype=np.int64)
+    np.maximum.at(win_streak, run_col[run_win], run_len[run_win])
+    np.maximum.at(loss_streak, run_col[~run_win], run_len[~run_win])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "exposure": bars / n_bars if n_bars else np.full(n_curves, np.nan),
+            "turnover": 2.0 * count / years,
+            "avg_bars_held": np.where(count > 0, bars / count, np.nan),
+            "max_win_streak": win_streak,
+            "max_loss_streak": loss_streak,
+        }
+
+
+def monthly_returns(equity: Any, ts: Any, initial_equity: EquityLike) -> pd.DataFrame:
+    """Calendar-month (UTC) returns, one row per curve and one "YYYY-MM" column per month.
+
+    Each month compounds from the last equity of the previous month (initial_equity for the first).
+    """
+    eq, init = _as_batch(equity, initial_equity)
+    ns = _ts_ns(ts)
+    if len(ns) != eq.shape[1]:
+        raise ValueError("ts length must match the equity curves")
+    if len(ns) == 0:
+        return pd.DataFrame(index=range(eq.shape[0]))
+
+    month = ns.astype("datetime64[ns]").astype("datetime64[M]")
+    ends = np.append(np.flatnonzero(month[1:] != month[:-1]), len(month) - 1)
+    close = eq[:, ends]
+    prev = np.concatenate([init[:, None], close[:, :-1]], axis=1)
+    return pd.DataFrame(close / prev - 1.0, columns=[str(m) for m in month[ends]])
+
+
+def score_curves(
+    equity: Any,
+    ts: Any,
+    initial_equity: EquityLike,
+    trades: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """PERF_COLS for every curve of a batch (or one curve) sharing the same bars.
+
+    Without trades the trade-based columns are NaN.
+    """
+    eq, init = _as_batch(equity, initial_equity)
+    k, n = eq.shape
+    ppy = periods_per_year(ts)
+
+    out: Dict[str, Any] = curve_metrics(eq, init, ppy)
+    if trades is not None:
+        out.update(trade_metrics(trades, k, n, ppy))
+    return pd.DataFrame({c: out.get(c, np.full(k, np.nan)) for c in PERF_COLS}, columns=PERF_COLS)
+
+
+def run_metrics(trades: pd.DataFrame, equity: pd.DataFrame, initial_equity: float) -> Dict[str, Any]:
+    """PERF_COLS for one run_engine result (its trades and equity frames)."""
+    if equity.empty:
+        return {c: float("nan") for c in PERF_COLS}
+
+    completed = trades.dropna(subset=["exit_px"]) if not trades.empty else trades
+    flat = pd.DataFrame(
+        {
+            "column": np.zeros(len(completed), dtype=np.int64),
+            "bars_held": completed["bars_held"].to_numpy(dtype=np.float64) if len(completed) else [],
+            "net_ret": completed["net_ret"].to_numpy(dtype=np.float64) if len(completed) else [],
+        }
+    )
+    row = score_curves(equity["equity"].to_numpy(), equity["ts"], initial_equity, flat).iloc[0]
+    return {c: row[c].item() for c in PERF_COLS}
@@ -0,0 +1,94 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import EngineConfig, _align_signals, _prepare_bars, run_engine_arrays
+from backtest.walkforward import STRATEGY_BUILDERS, split_ranges
+from data_parquet.dataset import frame_from_arrays, load_bar_arrays, write_bars_ipc
+
+# (split name, start row, stop row, strategy name)
+Job = Tuple[str, int, int, str]
+
+_worker_arrays: Optional[Dict[str, np.ndarray]] = None
+
+
+def _open_bars(path: str) -> None:
+    # Process-pool initializer: map the shared bars once per worker, as read-only column views.
+    global _worker_arrays
+    _worker_arrays, _ = load_bar_arrays(path)
+
+
+def _close_bars() -> None:
+    global _worker_arrays
+    _worker_arrays = None
+
+
+def _run_job(job: Job, cfg_dict: Dict[str, Any]) -> Dict[str, Any]:
+    split_name, start, stop, strategy = job
+    # Slices of the mapped columns: the split is never copied, only viewed.
+    cols = {c: a[start:stop] for c, a in _worker_arrays.items()}
+    split_df = frame_from_arrays(cols, presorted=True)
+    ts = pd.DatetimeIndex(split_df["ts"])
+    codes = _align_signals(STRATEGY_BUILDERS[strategy](split_df), split_df["ts"])
+    _, _, metrics = run_engine_arrays(
+        ts, cols["open"], cols["high"], cols["low"], cols["close"], codes, EngineConfig(**cfg_dict)
+    )
+    return {"split": split_name, "strategy": strategy, **metrics}
+
+
+def walkforward_jobs(df: pd.DataFrame, strategies: Sequence[str]) -> List[Job]:
+    """One job per (split, strategy); df must already be sorted by ts."""
+    unknown = set(strategies) - set(STRATEGY_BUILDERS)
+    if unknown:
+        raise KeyError(f"unknown strategies: {sorted(unknown)}")
+    return [
+        (split_name, start, stop, strategy)
+        for split_name, (start, stop) in split_ranges(df["ts"]).items()
+        if stop > start
+        for strategy in strategies
+    ]
+
+
+def run_walkforward_parallel(
+    df: pd.DataFrame,
+    cfg: EngineConfig,
+    strategies: Sequence[str] = tuple(STRATEGY_BUILDERS),
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Run every (split, strategy) walk-forward job on a process pool.
+
+    Bars are written once to a temporary Arrow IPC file (write_bars_ipc) and memory-mapped
+    by each worker; jobs run on views of the mapped columns, so no bars are pickled or
+    copied. Rows come back in job order (splits, then
+    strategies), so the table is identical for any worker count.
+    """
+    df = _prepare_bars(df)
+    jobs = walkforward_jobs(df, strategies)
+    workers = workers or os.cpu_count() or 1
+    cfg_dict = asdict(cfg)
+    if not jobs:
+        return pd.DataFrame([])
+
+    with tempfile.TemporaryDirectory(prefix="wf_bars_") as tmp:
+        path = os.path.join(tmp, "bars.arrow")
+        write_bars_ipc(df, path)
+
+        if workers == 1:
+            _open_bars(path)
+            try:
+                rows = [_run_job(job, cfg_dict) for job in jobs]
+            finally:
+                _close_bars()
+        else:
+            # Submit the longest splits first for better packing; results are keyed by job position.
+            order = sorted(range(len(jobs)), key=lambda j: jobs[j][2] - jobs[j][1], reverse=True)
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_open_bars, initargs=(path,)) as ex:
+                futures = {j: ex.submit(_run_job, jobs[j], cfg_dict) for j in order}
+                rows = [futures[j].result() for j in range(len(jobs))]
+
+    return pd.DataFrame(rows)
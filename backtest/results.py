@@ -0,0 +1,168 @@
+import glob
+import hashlib
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, is_dataclass
+from typing import Any, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from features.cache import bars_hash
+
+RESULTS_ROOT = "reports/results"
+RESULT_TABLES = ("metrics", "trades", "equity")
+
+# Every row of every table carries the run key plus the run it came from.
+KEY_COLS = ["strategy", "config_hash", "split", "data_hash"]
+RUN_COLS = ["run_id", "run_ts"]
+
+# Directory partitions (low cardinality); config_hash/data_hash stay columns, filtered by statistics.
+PARTITION_COLS = ["strategy", "split"]
+_PARTITIONING = ds.partitioning(pa.schema([(c, pa.string()) for c in PARTITION_COLS]), flavor="hive")
+
+# Layout, one dataset per experiment and table, one file per append and partition:
+#   reports/results/<experiment>/metrics/strategy=v2/split=test/part-<run_id>.parquet
+
+Filters = Union[Mapping[str, Any], ds.Expression, None]
+
+
+def config_hash(cfg: Any) -> str:
+    """Stable short hash of an EngineConfig (or any dataclass / dict of parameters)."""
+    params = asdict(cfg) if is_dataclass(cfg) else dict(cfg)
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def data_hash(df: pd.DataFrame) -> str:
+    """Short bars_hash of the bars a run was evaluated on."""
+    return bars_hash(df)[:16]
+
+
+def _expression(filters: Filters) -> Optional[ds.Expression]:
+    if filters is None or isinstance(filters, ds.Expression):
+        return filters
+    expr = None
+    for col, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            term = pc.field(col).isin(list(value))
+        else:
+            term = pc.field(col) == value
+        expr = term if expr is None else expr & term
+    return expr
+
+
+class ResultsStore:
+    """Append-only, hive-partitioned parquet results of backtest runs for one experiment.
+
+    append() writes one file per (strategy, split) partition of the rows it is given, so a
+    whole sweep lands in a handful of files. query() reads with partition pruning and
+    row-group predicate pushdown; latest=True keeps the newest run per KEY_COLS.
+    """
+
+    def __init__(self, experiment: str = "walkforward", root: str = RESULTS_ROOT) -> None:
+        self.path = os.path.join(root, experiment)
+
+    def table_dir(self, table: str) -> str:
+        if table not in RESULT_TABLES:
+            raise ValueError(f"table must be one of {RESULT_TABLES}, got {table!r}")
+        return os.path.join(self.path, table)
+
+    def append(self, table: str, rows: pd.DataFrame, run_id: Optional[str] = None) -> List[str]:
+        """Append rows that carry KEY_COLS; returns the files written."""
+        missing = [c for c in KEY_COLS if c not in rows.columns]
+        if missing:
+            raise ValueError(f"rows missing key columns: {missing}")
+        if rows.empty:
+            return []
+
+        run_id = run_id or uuid.uuid4().hex
+        rows = rows.assign(run_id=run_id, run_ts=pd.Timestamp(time.time_ns(), unit="ns", tz="UTC"))
+        base = self.table_dir(table)
+
+        written = []
+        for (strategy, split), part in rows.groupby(PARTITION_COLS, sort=False):
+            part_dir = os.path.join(base, f"strategy={strategy}", f"split={split}")
+            os.makedirs(part_dir, exist_ok=True)
+            fname = os.path.join(part_dir, f"part-{run_id}.parquet")
+            tmp = os.path.join(part_dir, f".part-{run_id}.{uuid.uuid4().hex}.tmp")
+            body = pa.Table.from_pandas(part.drop(columns=PARTITION_COLS), preserve_index=False)
+            pq.write_table(body, tmp)
+            os.replace(tmp, fname)
+            written.append(fname)
+        return written
+
+    def append_run(
+        self,
+        strategy: str,
+        split: str,
+        cfg: Any,
+        bars: pd.DataFrame,
+        metrics: Mapping[str, Any],
+        trades: Optional[pd.DataFrame] = None,
+        equity: Optional[pd.DataFrame] = None,
+    ) -> str:
+        """Store one run_engine result (metrics, and optionally trades/equity) under one run_id."""
+        key = {
+            "strategy": strategy,
+            "config_hash": config_hash(cfg),
+            "split": split,
+            "data_hash": data_hash(bars),
+        }
+        run_id = uuid.uuid4().hex
+        self.append("metrics", pd.DataFrame([{**key, **metrics}]), run_id)
+        for table, frame in (("trades", trades), ("equity", equity)):
+            if frame is not None and not frame.empty:
+                self.append(table, frame.assign(**key), run_id)
+        return run_id
+
+    def _dataset(self, table: str) -> Optional[ds.Dataset]:
+        files = sorted(glob.glob(os.path.join(self.table_dir(table), "**", "part-*.parquet"), recursive=True))
+        if not files:
+            return None
+        # Appends may add columns (e.g. scored sweeps); read every file against the union schema.
+        schema = pa.unify_schemas([pq.read_schema(f) for f in files] + [_PARTITIONING.schema])
+        return ds.dataset(
+            files,
+            schema=schema,
+            format="parquet",
+            partitioning=_PARTITIONING,
+            partition_base_dir=self.table_dir(table),
+        )
+
+    def query(
+        self,
+        table: str = "metrics",
+        filters: Filters = None,
+        columns: Optional[Sequence[str]] = None,
+        latest: bool = True,
+    ) -> pd.DataFrame:
+        """Rows matching filters ({column: value or list of values}, or a dataset expression).
+
+        With latest=True only rows of the newest run per KEY_COLS are returned.
+        """
+        dataset = self._dataset(table)
+        if dataset is None:
+            return pd.DataFrame(columns=list(columns) if columns is not None else KEY_COLS + RUN_COLS)
+
+        cols = None
+        if columns is not None:
+            cols = list(dict.fromkeys([*columns, *(KEY_COLS + RUN_COLS if latest else [])]))
+        out = dataset.to_table(filter=_expression(filters), columns=cols).to_pandas()
+        if latest and not out.empty:
+            newest = out.groupby(KEY_COLS, sort=False)["run_ts"].transform("max")
+            out = out[out["run_ts"] == newest]
+        if columns is not None:
+            out = out[list(columns)]
+        else:
+            out = out[KEY_COLS + [c for c in out.columns if c not in KEY_COLS]]
+        return out.reset_index(drop=True)
+
+    def runs(self) -> pd.DataFrame:
+        """Key and run_id/run_ts of every stored run, newest first."""
+        out = self.query("metrics", columns=KEY_COLS + RUN_COLS, latest=False)
+        return out.sort_values("run_ts", ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,151 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backtest.metrics import longest_underwater
+
+RESAMPLE_METHODS = ("bootstrap", "block")
+PATH_STATS = ["final_equity", "max_drawdown", "max_underwater", "underwater_frac"]
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Upper bound on elements per (paths x steps) chunk; a few float64 temporaries of this
+# size are alive at once (~8 MB each).
+CHUNK_ELEMS = 1 << 20
+
+
+def trade_returns(trades: pd.DataFrame) -> np.ndarray:
+    """Net return of each completed trade, in trade order."""
+    if trades.empty or "net_ret" not in trades.columns:
+        return np.zeros(0, dtype=np.float64)
+    return trades["net_ret"].dropna().to_numpy(dtype=np.float64)
+
+
+def bar_returns(equity: pd.DataFrame) -> np.ndarray:
+    """Bar-to-bar returns of the equity curve."""
+    eq = equity["equity"].to_numpy(dtype=np.float64) if not equity.empty else np.zeros(0)
+    if len(eq) < 2:
+        return np.zeros(0, dtype=np.float64)
+    return eq[1:] / eq[:-1] - 1.0
+
+
+def _draw_indices(rng: np.random.Generator, n: int, rows: int, method: str, block_size: int) -> np.ndarray:
+    if method == "bootstrap":
+        return rng.integers(0, n, size=(rows, n), dtype=np.int32)
+    # Circular moving-block bootstrap: blocks of block_size consecutive steps, wrapping at the end.
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(rows, n_blocks), dtype=np.int32)
+    idx = (starts[:, :, None] + np.arange(block_size, dtype=np.int32)) % n
+    return idx.reshape(rows, -1)[:, :n]
+
+
+def _path_stats(log_returns: np.ndarray, initial_equity: float) -> Dict[str, np.ndarray]:
+    # log_returns: (paths, steps), overwritten. Works in log equity relative to the start,
+    # so the running peak starts at 0 and the drawdown is 1 - exp(log_equity - log_peak).
+    log_eq = np.cumsum(log_returns, axis=1, out=log_returns)
+    log_peak = np.maximum.accumulate(log_eq, axis=1)
+    np.maximum(log_peak, 0.0, out=log_peak)
+    at_peak = log_eq >= log_peak
+    log_dd = np.subtract(log_peak, log_eq, out=log_peak)
+
+    n = log_eq.shape[1]
+    return {
+        "final_equity": initial_equity * np.exp(log_eq[:, -1]),
+        "max_drawdown": -np.expm1(-log_dd.max(axis=1)),
+        "max_underwater": longest_underwater(at_peak),
+        "underwater_frac": 1.0 - at_peak.sum(axis=1) / n,
+    }
+
+
+def resample_paths(
+    returns: np.ndarray,
+    n_paths: int = 10_000,
+    method: str = "bootstrap",
+    block_size: int = 24,
+    seed: int = 0,
+    initial_equity: float = 1.0,
+    chunk_elems: int = CHUNK_ELEMS,
+) -> pd.DataFrame:
+    """Per-path statistics of n_paths resampled return sequences of the original length.
+
+    "bootstrap" draws steps independently; "block" draws circular blocks of block_size
+    consecutive steps, keeping short-range dependence. Paths are generated in chunks
+    from one seeded generator, so results do not depend on chunk_elems.
+    max_underwater is the longest run of steps below the running peak.
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"method must be one of {RESAMPLE_METHODS}, got {method!r}")
+    if block_size < 1:
+        raise ValueError("block_size must be >= 1")
+
+    r = np.asarray(returns, dtype=np.float64)
+    n = len(r)
+    if (r <= -1.0).any():
+        raise ValueError("returns must be > -1")
+    if n == 0:
+        return pd.DataFrame(
+            {
+                "final_equity": np.full(n_paths, float(initial_equity)),
+                "max_drawdown": np.zeros(n_paths),
+                "max_underwater": np.zeros(n_paths, dtype=np.int64),
+                "underwater_frac": np.zeros(n_paths),
+            },
+            columns=PATH_STATS,
+        )
+
+    log_r = np.log1p(r)
+    rng = np.random.default_rng(seed)
+    rows = max(1, chunk_elems // n)
+    parts = []
+    for start in range(0, n_paths, rows):
+        idx = _draw_indices(rng, n, min(rows, n_paths - start), method, block_size)
+        parts.append(_path_stats(log_r[idx], float(initial_equity)))
+
+    return pd.DataFrame({k: np.concatenate([p[k] for p in parts]) for k in PATH_STATS}, columns=PATH_STATS)
+
+
+def summarize_paths(paths: pd.DataFrame, quantiles: Sequence[float] = QUANTILES) -> pd.DataFrame:
+    """Mean and quantiles of every path statistic, one row per statistic."""
+    q = paths.quantile(list(quantiles)).T
+    q.columns = [f"p{int(round(x * 100)):02d}" for x in quantiles]
+    q.insert(0, "mean", paths.mean())
+    q.index.name = "stat"
+    return q
+
+
+def robustness_report(
+    trades: pd.DataFrame,
+    equity: pd.DataFrame,
+    n_paths: int = 10_000,
+    trade_block: int = 5,
+    bar_block: int = 24,
+    seed: int = 0,
+    initial_equity: Optional[float] = None,
+) -> pd.DataFrame:
+    """Bootstrap and block-bootstrap distributions of trade and bar returns of one run.
+
+    Rows are (source, method, stat) with the mean and quantiles across paths.
+    """
+    if initial_equity is None:
+        initial_equity = float(equity["equity"].iloc[0]) if not equity.empty else 1.0
+
+    sources = {
+        "trades": (trade_returns(trades), trade_block),
+        "bars": (bar_returns(equity), bar_block),
+    }
+    tables = []
+    for k, (source, (returns, block)) in enumerate(sources.items()):
+        for j, method in enumerate(RESAMPLE_METHODS):
+            paths = resample_paths(
+                returns,
+                n_paths=n_paths,
+                method=method,
+                block_size=block,
+                seed=seed + 2 * k + j,
+                initial_equity=initial_equity,
+            )
+            table = summarize_paths(paths).reset_index()
+            table.insert(0, "method", method)
+            table.insert(0, "source", source)
+            tables.append(table)
+    return pd.concat(tables, ignore_index=True)
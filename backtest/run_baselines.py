@@ -1,22 +1,14 @@
-import json
 import pandas as pd
 import matplotlib.pyplot as plt
 
 from backtest.engine import EngineConfig, run_engine
+from backtest.results import ResultsStore
+from data_parquet.dataset import load_canonical_bars
 from model.baselines import always_up, yesterday_equals_today
 
-CANON_PATH = "data_parquet/BTCUSD_USD_1h_20220323_now.parquet"
-
-
-def write_outputs(prefix: str, trades: pd.DataFrame, equity: pd.DataFrame, metrics: dict):
-    trades.to_parquet(f"reports/{prefix}_trades.parquet", index=False)
-    equity.to_parquet(f"reports/{prefix}_equity.parquet", index=False)
-    with open(f"reports/{prefix}_metrics.json", "w") as f:
-        json.dump(metrics, f, indent=2)
-
 
 def main():
-    df = pd.read_parquet(CANON_PATH)
+    df = load_canonical_bars()
     df["ts"] = pd.to_datetime(df["ts"], utc=True)
     df = df.sort_values("ts").reset_index(drop=True)
 
@@ -28,17 +20,18 @@ def main():
     )
 
     ts = pd.DatetimeIndex(df["ts"])
+    results = ResultsStore("baselines")
 
     # always_up baseline
     sig1 = always_up(ts)
     t1, e1, m1 = run_engine(df, sig1, cfg)
-    write_outputs("baseline_always_up", t1, e1, m1)
+    results.append_run("always_up", "full", cfg, df, m1, t1, e1)
 
     # yesterday_equals_today baseline
     close = pd.Series(df["close"].values, index=ts)
     sig2 = yesterday_equals_today(close)
     t2, e2, m2 = run_engine(df, sig2, cfg)
-    write_outputs("baseline_yday_eq_today", t2, e2, m2)
+    results.append_run("yesterday_equals_today", "full", cfg, df, m2, t2, e2)
 
     # plot equity curves
     plt.figure()
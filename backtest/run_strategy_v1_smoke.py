@@ -1,11 +1,10 @@
-import pandas as pd
-
 from backtest.engine import EngineConfig, run_engine
+from data_parquet.dataset import load_canonical_bars
 from model.strategy_v1 import build_signals_v1
 
 
 def main():
-    df = pd.read_parquet("data_parquet/BTCUSD_USD_1h_20220323_now.parquet")
+    df = load_canonical_bars()
     df = df.sort_values("ts").reset_index(drop=True)
 
     # Small slice so it runs fast
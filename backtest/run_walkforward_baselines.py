@@ -1,11 +1,10 @@
-import pandas as pd
-
 from backtest.engine import EngineConfig
 from backtest.walkforward import run_baselines_walkforward
+from data_parquet.dataset import load_canonical_bars
 
 
 def main():
-    df = pd.read_parquet("data_parquet/BTCUSD_USD_1h_20220323_now.parquet")
+    df = load_canonical_bars()
 
     cfg = EngineConfig(
         fee_taker=0.0004,
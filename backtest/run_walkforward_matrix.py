@@ -0,0 +1,47 @@
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from backtest.batch import run_strategy_matrix
+from backtest.engine import EngineConfig
+from backtest.results import ResultsStore, config_hash, data_hash
+from backtest.walkforward import STRATEGY_BUILDERS, split_walkforward
+from data_parquet.dataset import load_canonical_bars
+from features.cache import FeatureStore
+
+
+def main():
+    Path("reports").mkdir(parents=True, exist_ok=True)
+
+    df = load_canonical_bars()
+
+    cfg = EngineConfig(
+        fee_taker=0.0004,
+        slippage_side=0.0001,
+        stop_loss_pct=0.02,
+        initial_equity=1_000.0,
+    )
+
+    store = FeatureStore()
+    builders = {
+        name: partial(fn, feature_store=store) if name in ("v1", "v2") else fn
+        for name, fn in STRATEGY_BUILDERS.items()
+    }
+
+    tables = []
+    for split_name, split_df in split_walkforward(df).items():
+        signals = pd.DataFrame({name: build(split_df) for name, build in builders.items()})
+        metrics = run_strategy_matrix(split_df, signals, cfg, score=True)
+        metrics.insert(1, "config_hash", config_hash(cfg))
+        metrics.insert(2, "split", split_name)
+        metrics.insert(3, "data_hash", data_hash(split_df))
+        tables.append(metrics)
+
+    table = pd.concat(tables, ignore_index=True)
+    ResultsStore().append("metrics", table)
+    print(table[["split", "strategy", "final_equity", "max_drawdown", "sharpe", "num_trades"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
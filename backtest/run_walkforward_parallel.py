@@ -0,0 +1,32 @@
+import os
+from pathlib import Path
+
+from backtest.engine import EngineConfig
+from backtest.parallel import run_walkforward_parallel
+from backtest.results import ResultsStore, config_hash, data_hash
+from backtest.walkforward import split_walkforward
+from data_parquet.dataset import load_canonical_bars
+
+
+def main():
+    Path("reports").mkdir(parents=True, exist_ok=True)
+
+    df = load_canonical_bars()
+
+    cfg = EngineConfig(
+        fee_taker=0.0004,
+        slippage_side=0.0001,
+        stop_loss_pct=0.02,
+        initial_equity=1_000.0,
+    )
+
+    table = run_walkforward_parallel(df, cfg, workers=os.cpu_count())
+    hashes = {name: data_hash(split_df) for name, split_df in split_walkforward(df).items()}
+    table.insert(1, "config_hash", config_hash(cfg))
+    table.insert(2, "data_hash", table["split"].map(hashes))
+    ResultsStore().append("metrics", table)
+    print(table[["split", "strategy", "final_equity", "max_drawdown", "num_trades"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from backtest.engine import EngineConfig
+from backtest.results import ResultsStore, config_hash, data_hash
+from backtest.windows import WindowSpec, load_walkforward_config, run_rolling_walkforward
+from data_parquet.dataset import load_canonical_bars
+from features.cache import FeatureStore
+
+
+def main():
+    Path("reports").mkdir(parents=True, exist_ok=True)
+
+    df = load_canonical_bars()
+
+    cfg = EngineConfig(
+        fee_taker=0.0004,
+        slippage_side=0.0001,
+        stop_loss_pct=0.02,
+        initial_equity=1_000.0,
+    )
+
+    spec = WindowSpec.from_config(load_walkforward_config()["rolling"])
+    table = run_rolling_walkforward(df, spec, cfg, feature_store=FeatureStore())
+    table.insert(1, "config_hash", config_hash(cfg))
+    table.insert(2, "split", spec.mode)
+    table.insert(3, "data_hash", data_hash(df))
+    ResultsStore("rolling").append("metrics", table)
+    print(table[["strategy", "window", "test_start_ts", "final_equity", "max_drawdown", "num_trades"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
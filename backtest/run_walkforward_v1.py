@@ -1,8 +1,8 @@
-import json
-import pandas as pd
-
 from backtest.engine import EngineConfig, run_engine
+from backtest.results import ResultsStore
 from backtest.walkforward import split_walkforward
+from data_parquet.dataset import load_canonical_bars
+from features.cache import FeatureStore
 
 # IMPORTANT
 # This must match your strategy_v1 public function name.
@@ -11,7 +11,7 @@ from model.strategy_v1 import build_signals_v1
 
 
 def main():
-    df = pd.read_parquet("data_parquet/BTCUSD_USD_1h_20220323_now.parquet")
+    df = load_canonical_bars()
 
     cfg = EngineConfig(
         fee_taker=0.0004,
@@ -21,17 +21,15 @@ def main():
     )
 
     splits = split_walkforward(df)
+    store = FeatureStore()
+    results = ResultsStore()
 
     for split_name, split_df in splits.items():
-        signals = build_signals_v1(split_df)
+        signals = build_signals_v1(split_df, feature_store=store)
 
         trades, equity, metrics = run_engine(split_df, signals, cfg)
 
-        with open(f"reports/v1_{split_name}_metrics.json", "w") as f:
-            json.dump(metrics, f, indent=2)
-
-        trades.to_parquet(f"reports/v1_{split_name}_trades.parquet", index=False)
-        equity.to_parquet(f"reports/v1_{split_name}_equity.parquet", index=False)
+        results.append_run("v1", split_name, cfg, split_df, metrics, trades, equity)
 
     print("done")
 
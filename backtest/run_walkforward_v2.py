@@ -1,12 +1,22 @@
-import json
 from pathlib import Path
 
 import pandas as pd
 
 from backtest.engine import EngineConfig, run_engine
+from backtest.results import ResultsStore
 from backtest.walkforward import split_walkforward
+from data_parquet.dataset import load_canonical_bars
+from features.cache import FeatureStore
+from model.signals import encode_signals
 from model.strategy_v2 import build_signals_v2
 
+# The frozen v2 candidate; section9_eval gates exactly this config on the test split.
+CFG = EngineConfig(
+    fee_taker=0.0004,
+    slippage_side=0.0001,
+    stop_loss_pct=0.02,
+    initial_equity=1_000.0,
+)
 
 def _validate_signals(split_df: pd.DataFrame, signals: pd.Series) -> None:
     if not isinstance(signals, pd.Series):
@@ -23,41 +33,28 @@ def _validate_signals(split_df: pd.DataFrame, signals: pd.Series) -> None:
     if not signals.index.equals(df_ts):
         raise ValueError("signals index must exactly equal df['ts'] (same values, same order)")
 
-    bad = set(signals.dropna().unique()) - {"up", "down", "flat"}
-    if bad:
-        raise ValueError(f"Unexpected signal values: {bad}")
+    # raises ValueError on anything that is not a signal code or label
+    encode_signals(signals)
 
 
 def main():
     Path("reports").mkdir(parents=True, exist_ok=True)
 
-    df = pd.read_parquet("data_parquet/BTCUSD_USD_1h_20220323_now.parquet")
-    df = df.copy()
-    df["ts"] = pd.to_datetime(df["ts"], utc=True)
-    df = df.sort_values("ts")
-
-    cfg = EngineConfig(
-        fee_taker=0.0004,
-        slippage_side=0.0001,
-        stop_loss_pct=0.02,
-        initial_equity=1_000.0,
-    )
+    df = load_canonical_bars()
 
     splits = split_walkforward(df)
+    store = FeatureStore()
+    results = ResultsStore()
 
     for split_name, split_df in splits.items():
         print(f"Running {split_name}...")
 
-        signals = build_signals_v2(split_df)
+        signals = build_signals_v2(split_df, feature_store=store)
         _validate_signals(split_df, signals)
 
-        trades, equity, metrics = run_engine(split_df, signals, cfg)
-
-        with open(f"reports/v2_{split_name}_metrics.json", "w") as f:
-            json.dump(metrics, f, indent=2)
+        trades, equity, metrics = run_engine(split_df, signals, CFG)
 
-        trades.to_parquet(f"reports/v2_{split_name}_trades.parquet", index=False)
-        equity.to_parquet(f"reports/v2_{split_name}_equity.parquet", index=False)
+        results.append_run("v2", split_name, CFG, split_df, metrics, trades, equity)
 
         print(
             f"  {split_name}: trades={metrics['num_trades']}, "
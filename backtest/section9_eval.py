@@ -1,31 +1,56 @@
-import json
+import pandas as pd
 
-def load(p: str):
-    with open(p, "r") as f:
-        return json.load(f)
+from backtest.gates import evaluate_gates, gate_matrix, load_gate_config
+from backtest.results import ResultsStore, config_hash
+from backtest.run_walkforward_v2 import CFG
+
+CANDIDATE = "v2"
+
+
+def load_test_metrics(store: ResultsStore, candidate_hash: str) -> pd.DataFrame:
+    """Newest test-split metrics of every strategy and config, on the bars of the newest run of
+    the frozen candidate config."""
+    rows = store.query(filters={"split": "test"})
+    if not rows.empty:
+        rows = rows.sort_values("run_ts", kind="stable")
+    frozen = rows[(rows["strategy"] == CANDIDATE) & (rows["config_hash"] == candidate_hash)]
+    if frozen.empty:
+        raise FileNotFoundError(f"no {CANDIDATE} test results for config {candidate_hash} in {store.path}")
+    data = frozen["data_hash"].iloc[-1]
+    return rows[rows["data_hash"] == data].reset_index(drop=True)
 
-def main():
-    v = load("reports/v2_test_metrics.json")
-    b1 = load("reports/baseline_always_up_test_metrics.json")
-    b2 = load("reports/baseline_yday_eq_today_test_metrics.json")
 
-    gateA = v["max_drawdown"] <= 0.10
-    gateB = (v["final_equity"] > b1["final_equity"]) and (v["final_equity"] > b2["final_equity"])
+def candidate_row(gated: pd.DataFrame, candidate_hash: str) -> pd.Series:
+    """The frozen candidate's gated row; the decision never depends on how it ranks."""
+    row = gated[(gated["strategy"] == CANDIDATE) & (gated["config_hash"] == candidate_hash)]
+    if len(row) != 1:
+        raise ValueError(f"expected one {CANDIDATE} row for config {candidate_hash}, got {len(row)}")
+    return row.iloc[0]
+
+
+def main():
+    gates = load_gate_config()
+    frozen = config_hash(CFG)
+    gated = evaluate_gates(load_test_metrics(ResultsStore(), frozen), gates)
+    v = candidate_row(gated, frozen)
 
     print("SECTION 9 RESULTS\n")
-    print("V2 test")
+    print("V2 test, config", frozen)
     print("final_equity", v["final_equity"])
     print("total_return", v["total_return"])
     print("max_drawdown", v["max_drawdown"])
     print("num_trades", v["num_trades"])
     print()
-    print("Baseline always_up final_equity", b1["final_equity"])
-    print("Baseline yday_eq_today final_equity", b2["final_equity"])
+    print(gate_matrix(gated).to_string())
+    print()
+    # Information only: picking the best-ranked config here would be tuning on test data.
+    print(gated.sort_values("rank")[["rank", "strategy", "config_hash", "growth", "excess_growth", "passed"]].to_string(index=False))
     print()
-    print("Gate A drawdown <= 0.10", gateA)
-    print("Gate B beats both baselines", gateB)
+    print(f"Gate A drawdown <= {gates.max_drawdown}", bool(v["gate_max_drawdown"]))
+    if gates.must_beat_baselines:
+        print("Gate B beats all baselines", all(bool(v[f"gate_beats_{b}"]) for b in gates.baselines))
     print()
-    print("DECISION", "PASS" if (gateA and gateB) else "FAIL")
+    print("DECISION", "PASS" if v["passed"] else "FAIL")
 
 if __name__ == "__main__":
     main()
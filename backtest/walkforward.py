@@ -1,28 +1,59 @@
-import json
+from typing import Dict, Optional, Tuple
+
 import pandas as pd
 from backtest.engine import EngineConfig, run_engine
+from backtest.results import ResultsStore
+from backtest.windows import CONFIG_PATH, load_walkforward_config, split_bounds_from_config
+from data_parquet.bars import as_frame
+from data_parquet.dataset import is_presorted
 from model.baselines import always_up, yesterday_equals_today
+from model.strategy_v1 import build_signals_v1
+from model.strategy_v2 import build_signals_v2
+
+# name -> (inclusive start, exclusive end); None means open-ended. From the walkforward config.
+SPLIT_BOUNDS = split_bounds_from_config(load_walkforward_config(CONFIG_PATH))
+
+STRATEGY_BUILDERS = {
+    "always_up": always_up,
+    "yesterday_equals_today": yesterday_equals_today,
+    "v1": build_signals_v1,
+    "v2": build_signals_v2,
+}
+
+
+def split_ranges(ts: pd.Series) -> Dict[str, Tuple[int, int]]:
+    """Row ranges [start, stop) of each split in a ts column that is already sorted."""
+    values = pd.DatetimeIndex(pd.to_datetime(ts, utc=True))
+    out = {}
+    for name, (lo, hi) in SPLIT_BOUNDS.items():
+        start = int(values.searchsorted(pd.Timestamp(lo, tz="UTC"), side="left"))
+        stop = len(values) if hi is None else int(values.searchsorted(pd.Timestamp(hi, tz="UTC"), side="left"))
+        out[name] = (start, max(start, stop))
+    return out
 
 
 def split_walkforward(df: pd.DataFrame):
+    df = as_frame(df)
+    if is_presorted(df):
+        return {name: df.iloc[start:stop] for name, (start, stop) in split_ranges(df["ts"]).items()}
+
     df = df.copy()
     df["ts"] = pd.to_datetime(df["ts"], utc=True)
     df = df.sort_values("ts")
 
     ts = df["ts"]  # FIX: Get ts AFTER sort so indices align
 
-    train_mask = (ts >= "2021-01-01") & (ts < "2023-01-01")
-    validate_mask = (ts >= "2023-01-01") & (ts < "2024-01-01")
-    test_mask = ts >= "2024-01-01"
-
-    return {
-        "train": df.loc[train_mask].copy(),
-        "validate": df.loc[validate_mask].copy(),
-        "test": df.loc[test_mask].copy(),
-    }
+    splits = {}
+    for name, (lo, hi) in SPLIT_BOUNDS.items():
+        mask = ts >= lo
+        if hi is not None:
+            mask &= ts < hi
+        splits[name] = df.loc[mask].copy()
+    return splits
 
 
-def run_baselines_walkforward(df: pd.DataFrame, cfg: EngineConfig):
+def run_baselines_walkforward(df: pd.DataFrame, cfg: EngineConfig, store: Optional[ResultsStore] = None):
+    store = store or ResultsStore()
     splits = split_walkforward(df)
     for split_name, split_df in splits.items():
         signals_up = always_up(split_df)
@@ -31,14 +62,5 @@ def run_baselines_walkforward(df: pd.DataFrame, cfg: EngineConfig):
         trades_up, equity_up, metrics_up = run_engine(split_df, signals_up, cfg)
         trades_y, equity_y, metrics_y = run_engine(split_df, signals_yday, cfg)
 
-        with open(f"reports/baseline_always_up_{split_name}_metrics.json", "w") as f:
-            json.dump(metrics_up, f, indent=2)
-
-        with open(f"reports/baseline_yday_eq_today_{split_name}_metrics.json", "w") as f:
-            json.dump(metrics_y, f, indent=2)
-
-        trades_up.to_parquet(f"reports/baseline_always_up_{split_name}_trades.parquet", index=False)
-        equity_up.to_parquet(f"reports/baseline_always_up_{split_name}_equity.parquet", index=False)
-
-        trades_y.to_parquet(f"reports/baseline_yday_eq_today_{split_name}_trades.parquet", index=False)
-        equity_y.to_parquet(f"reports/baseline_yday_eq_today_{split_name}_equity.parquet", index=False)
+        store.append_run("always_up", split_name, cfg, split_df, metrics_up, trades_up, equity_up)
+        store.append_run("yesterday_equals_today", split_name, cfg, split_df, metrics_y, trades_y, equity_y)
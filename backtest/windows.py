@@ -0,0 +1,241 @@
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from backtest.batch import METRIC_COLS
+from backtest.engine import EngineConfig, _align_signals, _prepare_bars, run_engine_arrays
+from features.build_features import WARMUP_ROWS
+from features.cache import FeatureStore
+from model.baselines import always_up, yesterday_equals_today
+from model.signal_filters import filter_signal_codes
+from model.signals import FLAT
+from model.strategy_v1 import raw_signals_v1
+from model.strategy_v2 import raw_signals_v2
+
+WINDOW_MODES = ("rolling", "anchored")
+
+# Anchored to the repo rather than the working directory: walkforward reads it at import time.
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "v1.yaml")
+
+# Strategies with a split raw-signal/filter pipeline: (raw signal builder, filter params).
+# Filter params mirror the build_signals_v1/v2 defaults.
+ROLLING_STRATEGIES: Dict[str, Tuple[Callable[..., pd.Series], Dict[str, int]]] = {
+    "v1": (raw_signals_v1, {"confirm_bars": 2, "hold_bars": 24}),
+    "v2": (raw_signals_v2, {"confirm_bars": 3, "hold_bars": 72}),
+}
+
+# Baselines without a raw-signal/filter split: rebuilt from each window's bars.
+ROLLING_BASELINES: Dict[str, Callable[[pd.DataFrame], pd.Series]] = {
+    "always_up": always_up,
+    "yesterday_equals_today": yesterday_equals_today,
+}
+
+
+@dataclass(frozen=True)
+class WindowSpec:
+    mode: str
+    train: pd.Timedelta
+    test: pd.Timedelta
+    step: pd.Timedelta
+
+    def __post_init__(self) -> None:
+        if self.mode not in WINDOW_MODES:
+            raise ValueError(f"mode must be one of {WINDOW_MODES}, got {self.mode!r}")
+        if min(self.train, self.test, self.step) <= pd.Timedelta(0):
+            raise ValueError("train, test and step must be positive durations")
+
+    @classmethod
+    def from_config(cls, rolling: Dict[str, Any]) -> "WindowSpec":
+        return cls(
+            mode=str(rolling.get("mode", "rolling")),
+            train=pd.Timedelta(rolling["train"]),
+            test=pd.Timedelta(rolling["test"]),
+            step=pd.Timedelta(rolling["step"]),
+        )
+
+
+@dataclass(frozen=True)
+class Window:
+    """Row ranges [start, stop) into one sorted bar array; slice with .train / .test."""
+
+    index: int
+    train_start: int
+    train_stop: int
+    test_start: int
+    test_stop: int
+
+    @property
+    def train(self) -> slice:
+        return slice(self.train_start, self.train_stop)
+
+    @property
+    def test(self) -> slice:
+        return slice(self.test_start, self.test_stop)
+
+
+def load_walkforward_config(path: str = CONFIG_PATH) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return yaml.safe_load(f)["walkforward"]
+
+
+def split_bounds_from_config(wf: Dict[str, Any]) -> Dict[str, Tuple[str, Optional[str]]]:
+    """Config splits ([first day, last day] inclusive, "now" open-ended) as [start, end) bounds."""
+    out = {}
+    for name in ("train", "validate", "test"):
+        lo, hi = wf[name]
+        end = None if str(hi).lower() == "now" else (pd.Timestamp(hi) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        out[name] = (str(lo), end)
+    return out
+
+
+def _ts_ns(ts: Any) -> np.ndarray:
+    values = pd.DatetimeIndex(pd.to_datetime(ts, utc=True)).as_unit("ns").asi8
+    if len(values) > 1 and not (np.diff(values) > 0).all():
+        raise ValueError("ts must be sorted and unique")
+    return values
+
+
+def generate_windows(ts: Any, spec: WindowSpec) -> List[Window]:
+    """Rolling or anchored train/test windows over sorted ts, as index ranges (no copies).
+
+    Only windows whose test period fits inside the data are emitted.
+    """
+    values = _ts_ns(ts)
+    if len(values) == 0:
+        return []
+
+    first, last = int(values[0]), int(values[-1])
+    train_ns, test_ns, step_ns = spec.train.value, spec.test.value, spec.step.value
+
+    # k-th window: train ends at first + train + k * step, test covers the following test_ns
+    k = np.arange(max(0, (last - first - train_ns - test_ns) // step_ns + 1), dtype=np.int64)
+    train_end = first + train_ns + k * step_ns
+    test_end = train_end + test_ns
+    keep = test_end <= last + 1
+    train_end, test_end, k = train_end[keep], test_end[keep], k[keep]
+    train_begin = np.full_like(train_end, first) if spec.mode == "anchored" else first + k * step_ns
+
+    train_start = np.searchsorted(values, train_begin, side="left")
+    train_stop = np.searchsorted(values, train_end, side="left")
+    test_stop = np.searchsorted(values, test_end, side="left")
+
+    return [
+        Window(int(j), int(a), int(b), int(b), int(c))
+        for j, (a, b, c) in enumerate(zip(train_start, train_stop, test_stop))
+    ]
+
+
+def run_windows(
+    ts: Any,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    signal_codes: np.ndarray,
+    windows: List[Window],
+    cfg: EngineConfig,
+) -> pd.DataFrame:
+    """Engine metrics on each window's test range, using views of the shared arrays."""
+    ts_idx = pd.DatetimeIndex(pd.to_datetime(ts, utc=True))
+    rows = []
+    for w in windows:
+        rows.append(_window_row(ts_idx, open_, high, low, close, signal_codes[w.test], w, cfg))
+    return pd.DataFrame(rows)
+
+
+def _window_row(
+    ts_idx: pd.DatetimeIndex,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    test_codes: np.ndarray,
+    w: Window,
+    cfg: EngineConfig,
+) -> Dict[str, Any]:
+    sl = w.test
+    _, _, metrics = run_engine_arrays(ts_idx[sl], open_[sl], high[sl], low[sl], close[sl], test_codes, cfg)
+    return {
+        "window": w.index,
+        "test_start_ts": ts_idx[w.test_start] if w.test_stop > w.test_start else pd.NaT,
+        "test_bars": w.test_stop - w.test_start,
+        **{k: metrics[k] for k in METRIC_COLS},
+    }
+
+
+def run_rolling_retrain(
+    df: pd.DataFrame,
+    raw_signals: pd.Series,
+    windows: List[Window],
+    cfg: EngineConfig,
+    confirm_bars: int,
+    hold_bars: int,
+    warmup_rows: int = WARMUP_ROWS,
+) -> pd.DataFrame:
+    """Per-window metrics from raw signals computed once over the whole series.
+
+    Each window (train start to test stop) re-runs only the stateful steps: the first
+    warmup_rows bars are forced flat, as if features had been built on the window alone,
+    then the signal filters run from the window start and the engine runs on the test
+    range. This reproduces building signals separately on df.iloc[train_start:test_stop].
+    """
+    df = _prepare_bars(df)
+    ts_idx = pd.DatetimeIndex(df["ts"])
+    raw = _align_signals(raw_signals, df["ts"])
+    o, h, l, c = (df[k].to_numpy() for k in ("open", "high", "low", "close"))
+
+    rows = []
+    for w in windows:
+        seg = raw[w.train_start : w.test_stop].copy()
+        seg[:warmup_rows] = FLAT
+        filtered = filter_signal_codes(seg, confirm_bars=confirm_bars, hold_bars=hold_bars)
+        rows.append(_window_row(ts_idx, o, h, l, c, filtered[w.test_start - w.train_start :], w, cfg))
+    return pd.DataFrame(rows)
+
+
+def run_rolling_strategy(
+    df: pd.DataFrame,
+    strategy: str,
+    windows: List[Window],
+    cfg: EngineConfig,
+    feature_store: Optional[FeatureStore] = None,
+) -> pd.DataFrame:
+    raw_fn, filter_params = ROLLING_STRATEGIES[strategy]
+    raw = raw_fn(df, feature_store=feature_store)
+    table = run_rolling_retrain(df, raw, windows, cfg, **filter_params)
+    table.insert(0, "strategy", strategy)
+    return table
+
+
+def run_rolling_walkforward(
+    df: pd.DataFrame,
+    spec: WindowSpec,
+    cfg: EngineConfig,
+    feature_store: Optional[FeatureStore] = None,
+) -> pd.DataFrame:
+    """Per-window test metrics of ROLLING_BASELINES and ROLLING_STRATEGIES over the windows of spec."""
+    df = _prepare_bars(df)
+    windows = generate_windows(df["ts"], spec)
+    o, h, l, c = (df[k].to_numpy() for k in ("open", "high", "low", "close"))
+
+    ts_idx = pd.DatetimeIndex(df["ts"])
+
+    tables = []
+    for name, build in ROLLING_BASELINES.items():
+        # Rebuilt on each window's own bars (train start to test stop), like the rolling
+        # strategies, so history-dependent baselines never see bars before the window.
+        rows = []
+        for w in windows:
+            part = df.iloc[w.train_start : w.test_stop]
+            codes = _align_signals(build(part), part["ts"])[w.test_start - w.train_start :]
+            rows.append(_window_row(ts_idx, o, h, l, c, codes, w, cfg))
+        table = pd.DataFrame(rows)
+        table.insert(0, "strategy", name)
+        tables.append(table)
+    for name in ROLLING_STRATEGIES:
+        tables.append(run_rolling_strategy(df, name, windows, cfg, feature_store=feature_store))
+    return pd.concat(tables, ignore_index=True)
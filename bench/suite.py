@@ -0,0 +1,218 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import EngineConfig, run_engine
+from backtest.walkforward import split_walkforward
+from data_parquet.dataset import frame_from_arrays
+from data_raw.validate_ohlcv import HOUR_MS, validate_ohlcv
+from features.build_features import build_features
+from model.signal_filters import apply_signal_filters
+from model.strategy_v1 import build_signals_v1, raw_signals_v1
+from model.strategy_v2 import build_signals_v2
+
+BASELINE_PATH = "reports/bench_baseline.json"
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+RESULT_COLS = ["stage", "bars", "wall_s", "peak_bytes", "alloc_blocks", "alloc_bytes"]
+
+# A stage regresses when it is slower / uses more peak memory than the baseline by more
+# than these fractions. Wall-time deltas below MIN_WALL_DELTA_S are timer noise.
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.10
+MIN_WALL_DELTA_S = 0.005
+
+START = "2021-01-01"
+
+# validate_ohlcv_1m runs on MINUTE_SCALE x n minute bars, so the default sizes reach the
+# multi-million-row minute data the validator is meant for.
+MINUTE_MS = 60_000
+MINUTE_SCALE = 3
+
+
+def synthetic_bars(n: int, seed: int = 0, step_ms: int = HOUR_MS) -> pd.DataFrame:
+    """Geometric-random-walk OHLCV every step_ms (hourly by default) from START, as a
+    presorted canonical frame."""
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.r_[30_000.0, close[:-1]]
+    wick = np.abs(rng.normal(0.0, 0.003, n)) * close
+    ts = pd.Timestamp(START, tz="UTC").value + np.arange(n, dtype=np.int64) * step_ms * 1_000_000
+    arrays = {
+        "ts": ts,
+        "open": open_,
+        "high": np.maximum(open_, close) + wick,
+        "low": np.minimum(open_, close) - wick,
+        "close": close,
+        "volume": rng.lognormal(3.0, 1.0, n),
+    }
+    return frame_from_arrays(arrays, presorted=True)
+
+
+def raw_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """The same bars in the raw fetch layout (ts_ms) the validators read."""
+    out = df.drop(columns=["ts"])
+    out.insert(0, "ts_ms", pd.DatetimeIndex(df["ts"]).as_unit("ms").asi8)
+    return out
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    run: Callable[[Dict[str, Any]], Any]
+    scale: int = 1  # rows the stage sees per prepared bar
+
+
+CFG = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+
+# Each stage reads prepared inputs from ctx, so only the stage itself is measured.
+STAGES: List[Stage] = [
+    Stage("validate_ohlcv", lambda ctx: validate_ohlcv(ctx["raw"])),
+    Stage("validate_ohlcv_1m", lambda ctx: validate_ohlcv(ctx["raw_1m"], MINUTE_MS), MINUTE_SCALE),
+    Stage("build_features", lambda ctx: build_features(ctx["bars"])),
+    Stage("apply_signal_filters", lambda ctx: apply_signal_filters(ctx["raw_v1"])),
+    Stage("build_signals_v1", lambda ctx: build_signals_v1(ctx["bars"])),
+    Stage("build_signals_v2", lambda ctx: build_signals_v2(ctx["bars"])),
+    Stage("split_walkforward", lambda ctx: split_walkforward(ctx["bars"])),
+    Stage("run_engine", lambda ctx: run_engine(ctx["bars"], ctx["signals_v1"], CFG)),
+]
+
+
+def prepare(n: int, seed: int = 0) -> Dict[str, Any]:
+    bars = synthetic_bars(n, seed)
+    return {
+        "bars": bars,
+        "raw": raw_frame(bars),
+        "raw_1m": raw_frame(synthetic_bars(n * MINUTE_SCALE, seed, MINUTE_MS)),
+        "raw_v1": raw_signals_v1(bars),
+        "signals_v1": build_signals_v1(bars),
+    }
+
+
+def measure(stage: Stage, ctx: Dict[str, Any], repeat: int = 3) -> Dict[str, Any]:
+    """Best-of-repeat wall time, then one tracemalloc pass for peak and allocated memory.
+
+    alloc_blocks/alloc_bytes are what the stage still holds when it returns (its result and
+    caches); tracemalloc cannot count blocks that were freed before then, peak_bytes covers those.
+    """
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        stage.run(ctx)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = stage.run(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+        diff = tracemalloc.take_snapshot().compare_to(before, "filename")
+        del result
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "stage": stage.name,
+        "bars": len(ctx["bars"]) * stage.scale,
+        "wall_s": best,
+        "peak_bytes": int(peak - base),
+        "alloc_blocks": int(sum(d.count_diff for d in diff)),
+        "alloc_bytes": int(sum(d.size_diff for d in diff)),
+    }
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    stages: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+    seed: int = 0,
+) -> pd.DataFrame:
+    selected = [s for s in STAGES if stages is None or s.name in stages]
+    rows = []
+    for n in sizes:
+        ctx = prepare(int(n), seed)
+        for stage in selected:
+            rows.append(measure(stage, ctx, repeat))
+    return pd.DataFrame(rows, columns=RESULT_COLS)
+
+
+def save_baseline(results: pd.DataFrame, path: str = BASELINE_PATH) -> None:
+    payload = {
+        "created_utc": pd.Timestamp.now(tz="UTC").isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": results.to_dict(orient="records"),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_baseline(path: str = BASELINE_PATH) -> pd.DataFrame:
+    with open(path, "r") as f:
+        return pd.DataFrame(json.load(f)["results"], columns=RESULT_COLS)
+
+
+def compare(
+    results: pd.DataFrame,
+    baseline: pd.DataFrame,
+    time_tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+) -> pd.DataFrame:
+    """Current vs baseline for every (stage, bars) measured in both, with a regression flag."""
+    m = results.merge(baseline, on=["stage", "bars"], suffixes=("", "_base"))
+    m["wall_ratio"] = m["wall_s"] / m["wall_s_base"]
+    m["peak_ratio"] = m["peak_bytes"] / m["peak_bytes_base"].clip(lower=1)
+    slower = (m["wall_ratio"] > 1.0 + time_tolerance) & (m["wall_s"] - m["wall_s_base"] > MIN_WALL_DELTA_S)
+    bigger = m["peak_ratio"] > 1.0 + memory_tolerance
+    m["regression"] = slower | bigger
+    cols = ["stage", "bars", "wall_s", "wall_s_base", "wall_ratio", "peak_bytes", "peak_bytes_base", "peak_ratio"]
+    return m[cols + ["regression"]]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic OHLCV.")
+    p.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    p.add_argument("--stages", nargs="+", choices=[s.name for s in STAGES])
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--baseline", default=BASELINE_PATH)
+    p.add_argument("--save", action="store_true", help="write these results as the new baseline")
+    args = p.parse_args(argv)
+
+    results = run_suite(args.sizes, args.stages, args.repeat)
+    print(results.to_string(index=False))
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; rerun with --save to create one")
+        return 0
+
+    report = compare(results, load_baseline(args.baseline))
+    print()
+    print(report.to_string(index=False))
+    regressions = report[report["regression"]]
+    print()
+    print("REGRESSIONS", len(regressions))
+    return 1 if len(regressions) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from data_parquet.dataset import ARROW_PATH, BAR_COLS, PRICE_COLS, frame_from_arrays, load_bar_arrays
+
+
+@dataclass(frozen=True, eq=False)
+class Bars:
+    """Validated OHLCV bars: strictly increasing UTC epoch-ns ts and float64 price/volume arrays.
+
+    Invariants are checked once at construction and the arrays are made read-only, so
+    every consumer can skip its own copy/parse/sort. Accepted wherever a bars DataFrame is.
+    """
+
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __post_init__(self) -> None:
+        n = len(self.ts)
+        for name in BAR_COLS:
+            arr = np.asarray(getattr(self, name))
+            want = np.int64 if name == "ts" else np.float64
+            if arr.dtype != want or arr.ndim != 1:
+                raise TypeError(f"Bars.{name} must be a 1-D {np.dtype(want).name} array, got {arr.dtype}")
+            if len(arr) != n:
+                raise ValueError(f"Bars.{name} has {len(arr)} rows, expected {n}")
+            if arr.flags.writeable:
+                arr = arr.view()
+                arr.flags.writeable = False
+            object.__setattr__(self, name, arr)
+        if n > 1 and not (self.ts[1:] > self.ts[:-1]).all():
+            raise ValueError("Bars.ts must be strictly increasing (sorted, no duplicates)")
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Bars":
+        """Parse ts to UTC and sort by it; duplicated ts raise ValueError.
+
+        The arrays are copies, so freezing them never touches the caller's columns.
+        """
+        missing = set(BAR_COLS) - set(df.columns)
+        if missing:
+            raise ValueError(f"df missing cols: {missing}")
+        ts = pd.DatetimeIndex(pd.to_datetime(df["ts"], utc=True)).as_unit("ns").asi8
+        order = np.argsort(ts, kind="stable")
+        if len(ts) > 1 and (np.diff(ts[order]) == 0).any():
+            raise ValueError("df['ts'] has duplicates")
+        sorted_already = bool((order == np.arange(len(ts))).all())
+        cols = {c: df[c].to_numpy(dtype=np.float64) for c in PRICE_COLS}
+        if sorted_already:
+            ts = np.array(ts, copy=True)
+            cols = {c: np.array(a, copy=True) for c, a in cols.items()}
+        else:
+            ts = ts[order]
+            cols = {c: a[order] for c, a in cols.items()}
+        return cls(ts=ts, **cols)
+
+    @classmethod
+    def from_arrow(cls, path: str = ARROW_PATH) -> "Bars":
+        """Memory-mapped bars from a write_bars_ipc file (no copies)."""
+        arrays, _ = load_bar_arrays(path, BAR_COLS)
+        return cls(**arrays)
+
+    def slice(self, start: int, stop: int) -> "Bars":
+        return Bars(**{c: getattr(self, c)[start:stop] for c in BAR_COLS})
+
+    @cached_property
+    def ts_index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.ts.view("datetime64[ns]"), name="ts").tz_localize("UTC")
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {c: getattr(self, c) for c in BAR_COLS}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Zero-copy DataFrame view, flagged presorted."""
+        return frame_from_arrays(self.arrays(), presorted=True)
+
+
+def as_frame(bars: Any) -> Any:
+    """Bars -> presorted DataFrame view; anything else is returned unchanged."""
+    return bars.to_frame() if isinstance(bars, Bars) else bars
@@ -3,8 +3,9 @@ from datetime import datetime, timezone
 import pandas as pd
 import yaml
 
-RAW_PATH = "data_raw/BTCUSD_USD_1h_raw.parquet"
-CANON_PATH = "data_parquet/BTCUSD_USD_1h_20220323_now.parquet"
+from data_parquet.dataset import ARROW_PATH, CANON_PATH, write_bars_ipc
+from data_raw.store import load_raw, partition_dir
+
 META_PATH = "reports/dataset_meta.json"
 
 def now_utc_iso():
@@ -13,7 +14,7 @@ def now_utc_iso():
 def main():
     cfg = yaml.safe_load(open("config/v1.yaml"))
 
-    df = pd.read_parquet(RAW_PATH)
+    df = load_raw(partition_dir(cfg["symbol"], cfg["timeframe"]))
     df = df.drop_duplicates(subset=["ts_ms"]).sort_values("ts_ms").reset_index(drop=True)
 
     df["ts"] = pd.to_datetime(df["ts_ms"], unit="ms", utc=True)
@@ -21,6 +22,7 @@ def main():
     df = df[["ts", "open", "high", "low", "close", "volume"]]
 
     df.to_parquet(CANON_PATH, index=False)
+    write_bars_ipc(df, ARROW_PATH)
 
     meta = {
         "exchange": cfg.get("exchange"),
@@ -32,6 +34,7 @@ def main():
         "last_ts": str(df["ts"].iloc[-1]),
         "build_time_utc": now_utc_iso(),
         "canonical_path": CANON_PATH,
+        "arrow_path": ARROW_PATH,
     }
     with open(META_PATH, "w") as f:
         json.dump(meta, f, indent=2)
@@ -40,6 +43,7 @@ def main():
     print("first_ts", meta["first_ts"])
     print("last_ts", meta["last_ts"])
     print("canonical_path", CANON_PATH)
+    print("arrow_path", ARROW_PATH)
     print("meta_path", META_PATH)
 
 if __name__ == "__main__":
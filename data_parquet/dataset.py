@@ -0,0 +1,122 @@
+import os
+import uuid
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+CANON_PATH = "data_parquet/BTCUSD_USD_1h_20220323_now.parquet"
+ARROW_PATH = "data_parquet/BTCUSD_USD_1h_20220323_now.arrow"
+
+BAR_COLS = ["ts", "open", "high", "low", "close", "volume"]
+PRICE_COLS = BAR_COLS[1:]
+
+# DataFrame.attrs key set by the bar loaders on frames whose ts is datetime64 UTC, strictly
+# increasing, on a 0..n-1 RangeIndex. The engine, strategies and splitters skip copy/parse/sort
+# for them. It is only a hint: attrs survive concat, reversal and sort+reset_index, so
+# is_presorted() re-checks the ts column before the fast path is taken.
+PRESORTED_ATTR = "bars_presorted"
+
+
+def _ts_strictly_increasing(ts: pd.Series) -> bool:
+    dtype = ts.dtype
+    if not isinstance(dtype, pd.DatetimeTZDtype) or str(dtype.tz) != "UTC":
+        return False
+    ns = ts.array.asi8  # view, no copy
+    return len(ns) < 2 or bool((ns[1:] > ns[:-1]).all())
+
+
+def is_presorted(df: pd.DataFrame) -> bool:
+    """True for flagged bars on a unit-step RangeIndex whose ts really is sorted and unique (O(n), no copy)."""
+    if not (bool(df.attrs.get(PRESORTED_ATTR)) and isinstance(df.index, pd.RangeIndex) and df.index.step == 1):
+        return False
+    return "ts" in df.columns and _ts_strictly_increasing(df["ts"])
+
+
+def write_bars_ipc(df: pd.DataFrame, path: str = ARROW_PATH) -> None:
+    """Write canonical bars as one Arrow IPC record batch: ts as int64 epoch ns, OHLCV as float64.
+
+    ts must already be sorted and unique; the file records that in its schema metadata.
+    """
+    ts_ns = pd.DatetimeIndex(pd.to_datetime(df["ts"], utc=True)).as_unit("ns").asi8
+    if len(ts_ns) > 1 and not (np.diff(ts_ns) > 0).all():
+        raise ValueError("ts must be sorted and unique")
+
+    arrays = [pa.array(ts_ns, type=pa.int64())]
+    arrays += [pa.array(df[c].to_numpy(dtype=np.float64), type=pa.float64()) for c in PRICE_COLS]
+    schema = pa.schema(
+        [pa.field("ts", pa.int64())] + [pa.field(c, pa.float64()) for c in PRICE_COLS],
+        metadata={"ts_unit": "ns", "ts_tz": "UTC", "sorted": "true"},
+    )
+    batch = pa.record_batch(arrays, schema=schema)
+
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with pa.OSFile(tmp, "wb") as sink:
+        with ipc.new_file(sink, schema) as writer:
+            writer.write_batch(batch)
+    os.replace(tmp, path)
+
+
+def load_bar_arrays(
+    path: str = ARROW_PATH,
+    columns: Optional[Sequence[str]] = None,
+) -> Tuple[Dict[str, np.ndarray], bool]:
+    """Memory-map an IPC bars file and return read-only NumPy views of the projected columns.
+
+    ts comes back as int64 epoch ns. The flag is True when the file was written sorted.
+    """
+    reader = ipc.open_file(pa.memory_map(path, "r"))
+    sorted_flag = (reader.schema.metadata or {}).get(b"sorted") == b"true"
+    cols = list(columns) if columns is not None else list(reader.schema.names)
+
+    chunks = [reader.get_batch(i) for i in range(reader.num_record_batches)]
+    if len(chunks) == 1:
+        batch = chunks[0]
+        out = {c: batch.column(c).to_numpy(zero_copy_only=True) for c in cols}
+    else:
+        table = pa.Table.from_batches(chunks).select(cols)
+        out = {c: table.column(c).to_numpy() for c in cols}
+    return out, sorted_flag
+
+
+def frame_from_arrays(arrays: Dict[str, np.ndarray], presorted: bool, ts_unit: str = "ns") -> pd.DataFrame:
+    """DataFrame over the given arrays without copying; an int64 "ts" becomes datetime64[ts_unit, UTC]."""
+    data = {}
+    for c, arr in arrays.items():
+        if c == "ts":
+            data[c] = pd.Series(pd.DatetimeIndex(arr.view(f"datetime64[{ts_unit}]")).tz_localize("UTC"), copy=False)
+        else:
+            data[c] = pd.Series(arr, copy=False)
+    df = pd.DataFrame(data, copy=False)
+    df.attrs[PRESORTED_ATTR] = presorted and "ts" in arrays
+    return df
+
+
+def load_bars_frame(
+    path: str = ARROW_PATH,
+    columns: Optional[Sequence[str]] = None,
+    writable: bool = False,
+) -> pd.DataFrame:
+    """DataFrame over the memory-mapped columns (ts as datetime64[ns, UTC]), flagged presorted.
+
+    The columns are read-only views of the file: in-place writes such as
+    df.loc[i, "close"] = x raise ValueError. Adding or replacing whole columns works.
+    writable=True returns a private in-memory copy instead.
+    """
+    arrays, sorted_flag = load_bar_arrays(path, columns)
+    if writable:
+        arrays = {c: np.array(a) for c, a in arrays.items()}
+    return frame_from_arrays(arrays, sorted_flag)
+
+
+def load_canonical_bars(columns: Optional[Sequence[str]] = None, writable: bool = False) -> pd.DataFrame:
+    """Canonical bars from the Arrow file, or from the parquet when it has not been built yet.
+
+    The Arrow path is zero-copy and read-only (see load_bars_frame); pass writable=True,
+    or .copy() the frame, before modifying values in place.
+    """
+    if os.path.exists(ARROW_PATH):
+        return load_bars_frame(ARROW_PATH, columns, writable=writable)
+    return pd.read_parquet(CANON_PATH, columns=list(columns) if columns is not None else None)
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from data_parquet.bars import Bars
+from data_parquet.dataset import PRESORTED_ATTR, frame_from_arrays, load_canonical_bars
+from data_raw.fetch_ohlcv import timeframe_ms
+from features.cache import bars_hash
+
+DERIVED_DIR = "data_parquet/derived"
+# Bump when resample_bars output changes; it keys the derived cache.
+RESAMPLE_VERSION = "v1"
+
+
+def resample_bars(bars: Any, rule: str, base: str = "1h") -> pd.DataFrame:
+    """Aggregate bars into rule-sized buckets ("4h", "12h", "1d", ...) anchored at the UTC epoch.
+
+    One vectorized pass: each bucket is a run of rows with the same ts // rule. Buckets are
+    labelled by their start; empty buckets are skipped. bar_count and missing_bars
+    (expected base bars minus bar_count) carry the gap information.
+    """
+    b = bars if isinstance(bars, Bars) else Bars.from_frame(bars)
+    step = timeframe_ms(rule) * 1_000_000
+    base_ns = timeframe_ms(base) * 1_000_000
+    if step <= 0 or step % base_ns:
+        raise ValueError(f"rule {rule!r} must be a positive multiple of base {base!r}")
+
+    n = len(b)
+    if n == 0:
+        empty = {**b.arrays(), "bar_count": np.zeros(0, dtype=np.int64), "missing_bars": np.zeros(0, dtype=np.int64)}
+        return frame_from_arrays(empty, presorted=True)
+
+    bucket = b.ts // step
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    count = np.diff(np.r_[starts, n])
+
+    arrays = {
+        "ts": bucket[starts] * step,
+        "open": b.open[starts],
+        "high": np.maximum.reduceat(b.high, starts),
+        "low": np.minimum.reduceat(b.low, starts),
+        "close": b.close[starts + count - 1],
+        "volume": np.add.reduceat(b.volume, starts),
+        "bar_count": count,
+        "missing_bars": step // base_ns - count,
+    }
+    return frame_from_arrays(arrays, presorted=True)
+
+
+def derived_key(source_hash: str, rule: str, base: str) -> str:
+    params = f"{source_hash}|{RESAMPLE_VERSION}|rule={rule}|base={base}"
+    return hashlib.sha256(params.encode()).hexdigest()[:32]
+
+
+def cached_resample(bars: Any, rule: str, base: str = "1h", root: str = DERIVED_DIR) -> pd.DataFrame:
+    """resample_bars, cached as derived parquet keyed by the source bars_hash."""
+    frame = bars.to_frame() if isinstance(bars, Bars) else bars
+    path = Path(root) / f"{rule}_{derived_key(bars_hash(frame), rule, base)}.parquet"
+    if path.exists():
+        out = pd.read_parquet(path)
+        out.attrs[PRESORTED_ATTR] = True
+        return out
+
+    out = resample_bars(bars, rule, base)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    out.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return out
+
+
+def resample_all(bars: Any, rules: Sequence[str], base: str = "1h", root: Optional[str] = DERIVED_DIR) -> Dict[str, pd.DataFrame]:
+    b = bars if isinstance(bars, Bars) else Bars.from_frame(bars)
+    if root is None:
+        return {rule: resample_bars(b, rule, base) for rule in rules}
+    return {rule: cached_resample(b, rule, base, root) for rule in rules}
+
+
+def main():
+    cfg = yaml.safe_load(open("config/v1.yaml"))
+    base = cfg["timeframe"]
+    out = resample_all(load_canonical_bars(), cfg["resample_timeframes"], base)
+    for rule, df in out.items():
+        incomplete = int((df["missing_bars"] > 0).sum())
+        print(rule, "bars", len(df), "incomplete", incomplete)
+
+
+if __name__ == "__main__":
+    main()
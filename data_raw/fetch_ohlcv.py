@@ -1,11 +1,15 @@
 import time
 from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
 import pandas as pd
-import ccxt
 import yaml
 
-RAW_PATH = "data_raw/BTCUSD_USD_1h_raw.parquet"
+from data_raw.store import RAW_COLS, RAW_ROOT, append_rows, last_stored_ts, migrate_legacy, partition_dir
+
 HOUR_MS = 60 * 60 * 1000
+PAGE_LIMIT = 720
+
+TIMEFRAME_UNITS_MS = {"m": 60 * 1000, "h": HOUR_MS, "d": 24 * HOUR_MS, "w": 7 * 24 * HOUR_MS}
 
 def utc_ms(dt_str: str) -> int:
     dt = datetime.strptime(dt_str, "%Y-%m-%d")
@@ -15,6 +19,72 @@ def utc_ms(dt_str: str) -> int:
 def ms_to_iso(ms: int) -> str:
     return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat()
 
+def timeframe_ms(timeframe: str) -> int:
+    return int(timeframe[:-1]) * TIMEFRAME_UNITS_MS[timeframe[-1]]
+
+def make_exchange(exchange_id: str) -> Any:
+    import ccxt  # only needed against a live exchange
+
+    ex = getattr(ccxt, exchange_id)({"enableRateLimit": True})
+    ex.load_markets()
+    return ex
+
+def next_page(batch: List[list], since: int, step: int) -> Tuple[List[list], int]:
+    """Rows of a fetched page at or after since, and the since of the next request.
+
+    The forward pager of fetch_forward and the async scheduler: no rows means paging is done.
+    """
+    rows = [r for r in batch if r[0] >= since]
+    return rows, (rows[-1][0] + step if rows else since)
+
+def fetch_forward(
+    ex: Any,
+    symbol: str,
+    timeframe: str,
+    since: int,
+    limit: int = PAGE_LIMIT,
+    sleep: Callable[[float], None] = time.sleep,
+) -> List[list]:
+    """Page forward from since (inclusive) until the exchange returns nothing newer."""
+    step = timeframe_ms(timeframe)
+    pages = []
+    while True:
+        batch = ex.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
+        batch, since = next_page(batch, since, step)
+        if not batch:
+            break
+        pages.append(batch)
+        sleep(ex.rateLimit / 1000)
+    return [r for page in pages for r in page]
+
+def fetch_incremental(
+    ex: Any,
+    symbol: str,
+    timeframe: str,
+    start_ms: int,
+    root: str = RAW_ROOT,
+    limit: int = PAGE_LIMIT,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Dict[str, Any]:
+    """Fetch bars newer than the last stored one into the month-partitioned raw store.
+
+    The last stored bar is fetched again, since it may have been written while still open.
+    """
+    path = partition_dir(symbol, timeframe, root)
+    last = last_stored_ts(path)
+    since = start_ms if last is None else last
+
+    rows = fetch_forward(ex, symbol, timeframe, since, limit=limit, sleep=sleep)
+    written = append_rows(path, pd.DataFrame(rows, columns=RAW_COLS))
+
+    return {
+        "path": path,
+        "since": since,
+        "rows_fetched": len(rows),
+        "files_written": written,
+        "last_ts": last_stored_ts(path),
+    }
+
 def main():
     cfg = yaml.safe_load(open("config/recent_analyze.yaml"))
     exchange_id = cfg["exchange"]
@@ -22,59 +92,24 @@ def main():
     timeframe = cfg["timeframe"]
     start = utc_ms(cfg["start_date"])
 
-    ex = getattr(ccxt, exchange_id)({"enableRateLimit": True})
-    ex.load_markets()
+    path = partition_dir(symbol, timeframe)
+    migrate_legacy(path)
+
+    ex = make_exchange(exchange_id)
 
     print("exchange", exchange_id)
     print("symbol", symbol)
     print("timeframe", timeframe)
     print("start_utc", cfg["start_date"])
-    print("raw_path", RAW_PATH)
-
-    limit = 720
-
-    newest = ex.fetch_ohlcv(symbol, timeframe=timeframe, since=None, limit=limit)
-    if not newest:
-        print("no_data_returned_from_since_none")
-        df = pd.DataFrame(columns=["ts_ms","open","high","low","close","volume"])
-        df.to_parquet(RAW_PATH, index=False)
-        return
-
-    all_rows = newest[:]
-    earliest_ts = all_rows[0][0]
-    loops = 1
-    print("seed_rows", len(newest), "earliest_seed", ms_to_iso(earliest_ts), "latest_seed", ms_to_iso(all_rows[-1][0]))
-
-    while earliest_ts > start:
-        loops += 1
-        target_since = max(start, earliest_ts - (limit * HOUR_MS))
-        batch = ex.fetch_ohlcv(symbol, timeframe=timeframe, since=target_since, limit=limit)
-
-        if not batch:
-            print("empty_batch_at", target_since, ms_to_iso(target_since))
-            break
-
-        batch = [r for r in batch if r[0] < earliest_ts]
-        if not batch:
-            print("no_older_rows_returned_at", target_since, ms_to_iso(target_since))
-            break
-
-        all_rows = batch + all_rows
-        earliest_ts = all_rows[0][0]
-
-        if loops % 10 == 0:
-            print("loops", loops, "rows", len(all_rows), "earliest", ms_to_iso(earliest_ts), "latest", ms_to_iso(all_rows[-1][0]))
-
-        time.sleep(ex.rateLimit / 1000)
+    print("raw_dir", path)
 
-    df = pd.DataFrame(all_rows, columns=["ts_ms", "open", "high", "low", "close", "volume"])
-    df = df.drop_duplicates(subset=["ts_ms"]).sort_values("ts_ms").reset_index(drop=True)
-    df.to_parquet(RAW_PATH, index=False)
+    summary = fetch_incremental(ex, symbol, timeframe, start)
 
-    print("done_rows", len(df))
-    if len(df):
-        print("done_first", ms_to_iso(int(df["ts_ms"].iloc[0])))
-        print("done_last", ms_to_iso(int(df["ts_ms"].iloc[-1])))
+    print("since", ms_to_iso(summary["since"]))
+    print("rows_fetched", summary["rows_fetched"])
+    print("files_written", len(summary["files_written"]))
+    if summary["last_ts"] is not None:
+        print("done_last", ms_to_iso(summary["last_ts"]))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,199 @@
+import asyncio
+import bisect
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from data_raw.fetch_ohlcv import PAGE_LIMIT, next_page, timeframe_ms, utc_ms
+from data_raw.store import RAW_COLS, RAW_ROOT, append_rows, last_stored_ts, migrate_legacy, partition_dir
+
+Sleep = Callable[[float], Awaitable[None]]
+
+
+def _retryable_errors() -> Tuple[type, ...]:
+    errors: Tuple[type, ...] = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+    try:
+        import ccxt
+    except ImportError:
+        return errors
+    return errors + (ccxt.NetworkError, ccxt.RateLimitExceeded)
+
+
+# Transient network and rate-limit failures; anything else (bad symbol, auth, bugs) fails fast.
+RETRY_ON = _retryable_errors()
+
+
+class TokenBucket:
+    """Async token bucket: at most `capacity` requests in a burst, refilled at `rate` per second."""
+
+    def __init__(self, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be > 0 and capacity >= 1")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._t = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._t) * self.rate)
+                self._t = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+@dataclass(frozen=True)
+class FetchJob:
+    exchange_id: str
+    symbol: str
+    timeframe: str
+    start_ms: int
+
+
+async def _call(ex: Any, symbol: str, timeframe: str, since: int, limit: int) -> List[list]:
+    if asyncio.iscoroutinefunction(ex.fetch_ohlcv):
+        return await ex.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
+    return await asyncio.to_thread(ex.fetch_ohlcv, symbol, timeframe=timeframe, since=since, limit=limit)
+
+
+async def _fetch_page(
+    ex: Any,
+    bucket: TokenBucket,
+    job: FetchJob,
+    since: int,
+    limit: int,
+    max_retries: int,
+    backoff: float,
+    retry_on: Tuple[type, ...],
+    sleep: Sleep,
+) -> List[list]:
+    attempt = 0
+    while True:
+        await bucket.acquire()
+        try:
+            return await _call(ex, job.symbol, job.timeframe, since, limit)
+        except retry_on:
+            if attempt >= max_retries:
+                raise
+            await sleep(backoff * (2 ** attempt))
+            attempt += 1
+
+
+def _month_start_ms(ts_ms: int) -> int:
+    return int(np.datetime64(ts_ms, "ms").astype("datetime64[M]").astype("datetime64[ms]").astype(np.int64))
+
+
+async def _store(path: str, rows: List[list]) -> None:
+    # append_rows is a blocking read-modify-write; keep it off the event loop.
+    if rows:
+        await asyncio.to_thread(append_rows, path, pd.DataFrame(rows, columns=RAW_COLS))
+
+
+async def run_fetch_job(
+    ex: Any,
+    bucket: TokenBucket,
+    job: FetchJob,
+    root: str = RAW_ROOT,
+    limit: int = PAGE_LIMIT,
+    max_retries: int = 5,
+    backoff: float = 1.0,
+    retry_on: Tuple[type, ...] = RETRY_ON,
+    sleep: Sleep = asyncio.sleep,
+) -> Dict[str, Any]:
+    """Page one (symbol, timeframe) forward from its last stored bar (after migrating legacy bars).
+
+    Pages are buffered and each month file is written once, when paging moves past that
+    month; the rest is written when the job ends or fails, so an interrupted job resumes
+    from the last stored bar (refetched, as in fetch_incremental) on the next run.
+    """
+    path = partition_dir(job.symbol, job.timeframe, root)
+    step = timeframe_ms(job.timeframe)
+    await asyncio.to_thread(migrate_legacy, path)
+    last = await asyncio.to_thread(last_stored_ts, path)
+    since = job.start_ms if last is None else last
+    fetched = 0
+    pending: List[list] = []
+
+    try:
+        while True:
+            batch = await _fetch_page(ex, bucket, job, since, limit, max_retries, backoff, retry_on, sleep)
+            batch, since = next_page(batch, since, step)
+            if not batch:
+                break
+            pending.extend(batch)
+            fetched += len(batch)
+
+            done = bisect.bisect_left(pending, _month_start_ms(batch[-1][0]), key=lambda r: r[0])
+            if done:
+                await _store(path, pending[:done])
+                pending = pending[done:]
+    finally:
+        await _store(path, pending)
+
+    return {"path": path, "rows_fetched": fetched, "last_ts": await asyncio.to_thread(last_stored_ts, path)}
+
+
+async def run_fetch_jobs(
+    exchanges: Dict[str, Any],
+    jobs: Sequence[FetchJob],
+    buckets: Optional[Dict[str, TokenBucket]] = None,
+    **job_kwargs: Any,
+) -> pd.DataFrame:
+    """Run every job concurrently; jobs on the same exchange share one token bucket.
+
+    Buckets default to the exchange's ccxt rateLimit (ms per request). A job that fails
+    after its retries is reported in the "error" column and does not stop the others.
+    """
+    if buckets is None:
+        buckets = {name: TokenBucket(rate=1000.0 / max(ex.rateLimit, 1)) for name, ex in exchanges.items()}
+
+    async def one(job: FetchJob) -> Dict[str, Any]:
+        row = {"exchange": job.exchange_id, "symbol": job.symbol, "timeframe": job.timeframe}
+        try:
+            out = await run_fetch_job(exchanges[job.exchange_id], buckets[job.exchange_id], job, **job_kwargs)
+            return {**row, **out, "error": None}
+        except Exception as e:
+            return {**row, "path": None, "rows_fetched": None, "last_ts": None, "error": repr(e)}
+
+    rows = await asyncio.gather(*(one(job) for job in jobs))
+    return pd.DataFrame(list(rows))
+
+
+def jobs_from_config(cfg: Dict[str, Any]) -> List[FetchJob]:
+    """Jobs for every configured symbol x timeframe (lists, or the single symbol/timeframe keys)."""
+    symbols = cfg.get("symbols") or [cfg["symbol"]]
+    timeframes = cfg.get("timeframes") or [cfg["timeframe"]]
+    start = utc_ms(cfg["start_date"])
+    return [FetchJob(cfg["exchange"], s, tf, start) for s in symbols for tf in timeframes]
+
+
+async def _main_async(cfg: Dict[str, Any]) -> pd.DataFrame:
+    import ccxt.async_support as ccxt_async  # only needed against a live exchange
+
+    # Rate limiting is done by the shared token bucket, not by ccxt.
+    ex = getattr(ccxt_async, cfg["exchange"])({"enableRateLimit": False})
+    try:
+        await ex.load_markets()
+        return await run_fetch_jobs({cfg["exchange"]: ex}, jobs_from_config(cfg))
+    finally:
+        await ex.close()
+
+
+def main():
+    cfg = yaml.safe_load(open("config/recent_analyze.yaml"))
+    summary = asyncio.run(_main_async(cfg))
+    print(summary.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import glob
+import os
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+RAW_ROOT = "data_raw"
+RAW_COLS = ["ts_ms", "open", "high", "low", "close", "volume"]
+
+# Raw bars live in one directory per (symbol, timeframe), one parquet file per UTC month:
+#   data_raw/BTCUSD_USD_1h/2024-01.parquet
+# Appends only rewrite the months they touch. Before that, each partition was one file,
+#   data_raw/BTCUSD_USD_1h_raw.parquet
+# which migrate_legacy() imports once into an empty partition.
+
+
+def partition_dir(symbol: str, timeframe: str, root: str = RAW_ROOT) -> str:
+    name = symbol.replace("/", "").replace(":", "_")
+    return os.path.join(root, f"{name}_{timeframe}")
+
+
+def legacy_raw_path(path: str) -> str:
+    return path + "_raw.parquet"
+
+
+def month_files(path: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(path, "????-??.parquet")))
+
+
+def _month_keys(ts_ms: np.ndarray) -> np.ndarray:
+    return np.datetime_as_string(ts_ms.astype("datetime64[ms]"), unit="M")
+
+
+def last_stored_ts(path: str) -> Optional[int]:
+    """Latest ts_ms on disk, read from the newest month file only."""
+    files = month_files(path)
+    if not files:
+        return None
+    ts = pq.read_table(files[-1], columns=["ts_ms"]).column("ts_ms").to_numpy()
+    return int(ts.max()) if len(ts) else None
+
+
+def append_rows(path: str, rows: pd.DataFrame) -> List[str]:
+    """Merge rows into their month files (newer rows win on equal ts_ms); returns files written."""
+    if rows.empty:
+        return []
+    rows = rows[RAW_COLS].astype({"ts_ms": np.int64})
+    os.makedirs(path, exist_ok=True)
+
+    written = []
+    keys = _month_keys(rows["ts_ms"].to_numpy())
+    for key in np.unique(keys):
+        fname = os.path.join(path, f"{key}.parquet")
+        part = rows[keys == key]
+        if os.path.exists(fname):
+            part = pd.concat([pd.read_parquet(fname), part], ignore_index=True)
+        part = part.drop_duplicates(subset=["ts_ms"], keep="last").sort_values("ts_ms").reset_index(drop=True)
+
+        tmp = fname + ".tmp"
+        part.to_parquet(tmp, index=False)
+        os.replace(tmp, fname)
+        written.append(fname)
+    return written
+
+
+def read_raw(path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    files = month_files(path)
+    cols = list(columns) if columns is not None else RAW_COLS
+    if not files:
+        return pd.DataFrame(columns=cols)
+    return pd.concat([pd.read_parquet(f, columns=cols) for f in files], ignore_index=True)
+
+
+def migrate_legacy(path: str) -> List[str]:
+    """Import the partition's legacy single-file raw bars if the partition is still empty."""
+    legacy = legacy_raw_path(path)
+    if last_stored_ts(path) is not None or not os.path.exists(legacy):
+        return []
+    return append_rows(path, pd.read_parquet(legacy))
+
+
+def load_raw(path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """read_raw after migrating legacy bars; raises FileNotFoundError if there are none."""
+    migrate_legacy(path)
+    df = read_raw(path, columns)
+    if df.empty:
+        raise FileNotFoundError(f"no raw bars in {path}; run data_raw/fetch_ohlcv.py first")
+    return df
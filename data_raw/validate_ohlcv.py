@@ -1,48 +1,99 @@
 import json
 from datetime import datetime, timezone
+from typing import Any, Dict, Tuple
+
+import numpy as np
 import pandas as pd
 
-RAW_PATH = "data_raw/BTCUSD_USD_1h_raw.parquet"
+from data_raw.store import load_raw, partition_dir
+
+RAW_DIR = partition_dir("BTC/USD:USD", "1h")
 REPORT_PATH = "reports/data_quality.json"
+GAP_INDEX_PATH = "data_raw/BTCUSD_USD_1h_gaps.parquet"
 HOUR_MS = 60 * 60 * 1000
 
+GAP_COLS = ["gap_start", "gap_end", "missing_bars"]
+
 def ms_to_iso(ms: int) -> str:
     return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat()
 
-def main():
-    df = pd.read_parquet(RAW_PATH)
-    issues = {}
+def _dedupe_sorted(ts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Row order after drop_duplicates(keep="first").sort_values(): a stable sort keeps the
+    # first occurrence of each ts at the head of its group.
+    order = None if (len(ts) < 2 or bool((ts[1:] >= ts[:-1]).all())) else np.argsort(ts, kind="stable")
+    ts_sorted = ts if order is None else ts[order]
+    keep = np.ones(len(ts_sorted), dtype=bool)
+    keep[1:] = ts_sorted[1:] != ts_sorted[:-1]
+    rows = np.flatnonzero(keep) if order is None else order[keep]
+    return ts_sorted[keep], rows
+
+def gap_index(ts_ms: np.ndarray, step_ms: int = HOUR_MS) -> pd.DataFrame:
+    """One row per gap in sorted unique ts_ms.
 
-    df = df.drop_duplicates(subset=["ts_ms"]).sort_values("ts_ms").reset_index(drop=True)
+    gap_start is the last bar before the gap and gap_end the first bar after it (both
+    present); missing_bars counts the whole steps absent in between. Off-grid steps
+    that skip no whole bar are left to the non_hour_step_count check.
+    """
+    diffs = np.diff(ts_ms)
+    at = np.flatnonzero(diffs >= 2 * step_ms)
+    return pd.DataFrame(
+        {
+            "gap_start": pd.to_datetime(ts_ms[at], unit="ms", utc=True),
+            "gap_end": pd.to_datetime(ts_ms[at + 1], unit="ms", utc=True),
+            "missing_bars": (diffs[at] // step_ms - 1).astype(np.int64),
+        },
+        columns=GAP_COLS,
+    )
 
-    issues["rows"] = int(len(df))
-    issues["first_utc"] = ms_to_iso(int(df["ts_ms"].iloc[0]))
-    issues["last_utc"] = ms_to_iso(int(df["ts_ms"].iloc[-1]))
+def validate_ohlcv(df: pd.DataFrame, step_ms: int = HOUR_MS) -> Tuple[Dict[str, Any], pd.DataFrame]:
+    """Vectorized data-quality report and gap index for raw bars keyed by ts_ms.
 
-    dup_count = int(df["ts_ms"].duplicated().sum())
-    issues["duplicate_count"] = dup_count
+    Duplicates are counted on the raw rows; every other check runs on the deduped,
+    sorted rows (first occurrence kept), matching what build_dataset writes.
+    """
+    ts_raw = df["ts_ms"].to_numpy(dtype=np.int64)
+    ts, rows = _dedupe_sorted(ts_raw)
+    issues: Dict[str, Any] = {}
 
-    diffs = df["ts_ms"].diff().dropna()
-    issues["non_hour_step_count"] = int((diffs != HOUR_MS).sum())
+    issues["rows"] = int(len(ts))
+    issues["first_utc"] = ms_to_iso(int(ts[0])) if len(ts) else None
+    issues["last_utc"] = ms_to_iso(int(ts[-1])) if len(ts) else None
+    issues["duplicate_count"] = int(len(ts_raw) - len(ts))
 
-    missing_hours = 0
-    for i in range(1, len(df)):
-        gap = int(df.loc[i, "ts_ms"] - df.loc[i - 1, "ts_ms"])
-        if gap > HOUR_MS:
-            missing_hours += int(gap / HOUR_MS) - 1
+    diffs = np.diff(ts)
+    issues["non_hour_step_count"] = int((diffs != step_ms).sum())
 
-    issues["missing_hours_total"] = int(missing_hours)
-    issues["negative_price_rows"] = int(((df[["open","high","low","close"]] <= 0).any(axis=1)).sum())
-    issues["negative_volume_rows"] = int((df["volume"] < 0).sum())
-    issues["zero_close_rows"] = int((df["close"] == 0).sum())
+    gaps = gap_index(ts, step_ms)
+    issues["gap_count"] = int(len(gaps))
+    issues["missing_hours_total"] = int(gaps["missing_bars"].sum())
+
+    o = df["open"].to_numpy(dtype=np.float64)[rows]
+    h = df["high"].to_numpy(dtype=np.float64)[rows]
+    l = df["low"].to_numpy(dtype=np.float64)[rows]
+    c = df["close"].to_numpy(dtype=np.float64)[rows]
+    v = df["volume"].to_numpy(dtype=np.float64)[rows]
+
+    issues["negative_price_rows"] = int(((o <= 0) | (h <= 0) | (l <= 0) | (c <= 0)).sum())
+    issues["negative_volume_rows"] = int((v < 0).sum())
+    issues["zero_close_rows"] = int((c == 0).sum())
+    issues["ohlc_inconsistent_rows"] = int(((h < np.maximum(o, c)) | (l > np.minimum(o, c))).sum())
 
     issues["pass"] = bool(
         issues["duplicate_count"] == 0 and
         issues["missing_hours_total"] == 0 and
         issues["negative_price_rows"] == 0 and
         issues["negative_volume_rows"] == 0 and
-        issues["zero_close_rows"] == 0
+        issues["zero_close_rows"] == 0 and
+        issues["ohlc_inconsistent_rows"] == 0
     )
+    return issues, gaps
+
+def main():
+    df = load_raw(RAW_DIR)
+    issues, gaps = validate_ohlcv(df)
+
+    gaps.to_parquet(GAP_INDEX_PATH, index=False)
+    issues["gap_index_path"] = GAP_INDEX_PATH
 
     with open(REPORT_PATH, "w") as f:
         json.dump(issues, f, indent=2)
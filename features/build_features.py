@@ -1,16 +1,16 @@
 import pandas as pd
 
+from features.registry import compute_features
 
-def build_features(df: pd.DataFrame) -> pd.DataFrame:
-    d = df.copy()
-    d = d.sort_values("ts").reset_index(drop=True)
-
-    d["ret_1"] = d["close"].pct_change(1)
-    d["ret_4"] = d["close"].pct_change(4)
-    d["ret_24"] = d["close"].pct_change(24)
+# Bump FEATURE_VERSION whenever build_features output changes; it keys the feature cache.
+FEATURE_VERSION = "v2"
+RET_WINDOWS = (1, 4, 24)
+VOL_WINDOW = 24
+# Leading rows of any series that build_features drops (ret_24 and vol_24 are undefined there).
+WARMUP_ROWS = max(max(RET_WINDOWS), VOL_WINDOW)
+FEATURE_COLS = ["close", *(f"ret_{k}" for k in RET_WINDOWS), f"vol_{VOL_WINDOW}"]
 
-    d["vol_24"] = d["ret_1"].rolling(24).std()
 
-    cols = ["ts", "close", "ret_1", "ret_4", "ret_24", "vol_24"]
-    out = d[cols].dropna().reset_index(drop=True)
-    return out
+def build_features(df: pd.DataFrame) -> pd.DataFrame:
+    # The registry drops the warm-up rows; dropna still removes rows hit by missing inputs.
+    return compute_features(df, FEATURE_COLS).dropna().reset_index(drop=True)
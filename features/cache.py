@@ -0,0 +1,126 @@
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from data_parquet.dataset import frame_from_arrays
+from features.build_features import FEATURE_VERSION, RET_WINDOWS, VOL_WINDOW, build_features
+
+CACHE_DIR = "data_parquet/feature_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_HASH_COLS = ["open", "high", "low", "close", "volume"]
+# Layout of the cache files (2: one batch, ts as int64); part of the key so old files are never read.
+CACHE_FORMAT = 2
+
+
+def bars_hash(df: pd.DataFrame) -> str:
+    """Content hash of bars: sorted UTC ts (epoch ns) plus the OHLCV columns present, as float64."""
+    ts_ns = pd.DatetimeIndex(pd.to_datetime(df["ts"], utc=True)).as_unit("ns").asi8
+    order = np.argsort(ts_ns, kind="stable")
+    h = hashlib.sha256()
+    h.update(ts_ns[order].tobytes())
+    for col in _HASH_COLS:
+        if col in df.columns:
+            h.update(col.encode())
+            h.update(np.ascontiguousarray(df[col].to_numpy(dtype=np.float64)[order]).tobytes())
+    return h.hexdigest()
+
+
+def feature_key(data_hash: str) -> str:
+    params = f"{data_hash}|{FEATURE_VERSION}|fmt={CACHE_FORMAT}|ret={','.join(map(str, RET_WINDOWS))}|vol={VOL_WINDOW}"
+    return hashlib.sha256(params.encode()).hexdigest()[:32]
+
+
+class FeatureStore:
+    """On-disk cache of build_features output as Arrow IPC files, read back memory-mapped.
+
+    Files are keyed by bars_hash + FEATURE_VERSION + window parameters. Hits refresh the
+    file mtime; writes evict least-recently-used files until the cache fits in max_bytes.
+    A hit is a frame over read-only views of the mapped file (the map stays open while
+    the frame is alive); .copy() it before writing values in place.
+    """
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._last_touch_ns = 0
+
+    def path_for(self, df: pd.DataFrame) -> Path:
+        return self.root / f"{feature_key(bars_hash(df))}.arrow"
+
+    def get_or_build(self, df: pd.DataFrame) -> pd.DataFrame:
+        path = self.path_for(df)
+        cached = self._load(path)
+        if cached is not None:
+            return cached
+
+        feats = build_features(df)
+        self._write(path, feats)
+        self._evict(keep=path)
+        return feats
+
+    def _load(self, path: Path) -> Optional[pd.DataFrame]:
+        # No context manager: the returned columns are views of the map and keep it open.
+        try:
+            reader = ipc.open_file(pa.memory_map(str(path), "r"))
+        except FileNotFoundError:
+            return None  # never built, or evicted by another process
+        batch = reader.get_batch(0)
+        arrays = {c: batch.column(c).to_numpy(zero_copy_only=True) for c in batch.schema.names}
+        unit = (batch.schema.metadata or {}).get(b"ts_unit", b"ns").decode()
+        out = frame_from_arrays(arrays, presorted=False, ts_unit=unit)
+        self._touch(path)
+        return out
+
+    def _write(self, path: Path, feats: pd.DataFrame) -> None:
+        # One record batch, ts as int64 in its own unit, so _load maps every column zero-copy.
+        ts = pd.DatetimeIndex(pd.to_datetime(feats["ts"], utc=True))
+        cols = [c for c in feats.columns if c != "ts"]
+        arrays = [pa.array(ts.asi8, type=pa.int64())] + [pa.array(feats[c].to_numpy()) for c in cols]
+        batch = pa.record_batch(arrays, names=["ts", *cols])
+        batch = batch.replace_schema_metadata({"ts_unit": ts.unit, "ts_tz": "UTC"})
+
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with ipc.new_file(sink, batch.schema) as writer:
+                writer.write_batch(batch)
+        os.replace(tmp, path)
+        self._touch(path)
+
+    def _touch(self, path: Path) -> None:
+        # Strictly increasing mtimes, so LRU order survives coarse filesystem clocks.
+        now = max(time.time_ns(), self._last_touch_ns + 1)
+        self._last_touch_ns = now
+        os.utime(path, ns=(now, now))
+
+    def _evict(self, keep: Path) -> None:
+        files = []
+        for p in self.root.glob("*.arrow"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process since the glob
+            files.append((st.st_mtime_ns, st.st_size, p))
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if p == keep:
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+
+
+def cached_build_features(df: pd.DataFrame, store: Optional[FeatureStore] = None) -> pd.DataFrame:
+    if store is None:
+        return build_features(df)
+    return store.get_or_build(df)
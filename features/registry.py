@@ -0,0 +1,270 @@
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_parquet.bars import as_frame
+from data_parquet.dataset import is_presorted
+
+Kernel = Callable[..., np.ndarray]
+
+
+@dataclass(frozen=True)
+class Feature:
+    """A registered feature: kernel(*dep_arrays) -> float64 array aligned to the bars.
+
+    lookback is how many rows the kernel itself needs beyond its inputs being defined;
+    the full warm-up adds the deepest dependency's warm-up (see warmup_rows).
+    """
+
+    name: str
+    deps: Tuple[str, ...]
+    lookback: int
+    kernel: Kernel
+
+
+# Fixed features by name, and parameterised families resolved from the name on demand.
+_FEATURES: Dict[str, Feature] = {}
+_FAMILIES: List[Tuple["re.Pattern[str]", Callable[..., Feature]]] = []
+
+
+def register(name: str, deps: Sequence[str], lookback: int) -> Callable[[Kernel], Kernel]:
+    def wrap(kernel: Kernel) -> Kernel:
+        _FEATURES[name] = Feature(name, tuple(deps), int(lookback), kernel)
+        return kernel
+
+    return wrap
+
+
+def register_family(pattern: str) -> Callable[[Callable[..., Feature]], Callable[..., Feature]]:
+    def wrap(factory: Callable[..., Feature]) -> Callable[..., Feature]:
+        _FAMILIES.append((re.compile(pattern), factory))
+        return factory
+
+    return wrap
+
+
+def get_feature(name: str) -> Feature:
+    if name in _FEATURES:
+        return _FEATURES[name]
+    for pattern, factory in _FAMILIES:
+        m = pattern.fullmatch(name)
+        if m:
+            feature = factory(name, *m.groups())
+            _FEATURES[name] = feature
+            return feature
+    raise KeyError(f"unknown feature: {name!r}")
+
+
+def _is_base(name: str) -> bool:
+    # Anything that is not a feature is an input column: OHLCV, or e.g. close_ETH for another asset.
+    return name not in _FEATURES and not any(p.fullmatch(name) for p, _ in _FAMILIES)
+
+
+def warmup_rows(names: Iterable[str]) -> int:
+    """Leading rows that are undefined for at least one of the features, on gap-free input."""
+    memo: Dict[str, int] = {}
+
+    def visit(name: str) -> int:
+        if name in memo:
+            return memo[name]
+        if _is_base(name):
+            memo[name] = 0
+            return 0
+        f = get_feature(name)
+        memo[name] = f.lookback + max((visit(d) for d in f.deps), default=0)
+        return memo[name]
+
+    return max((visit(n) for n in names), default=0)
+
+
+def _resolve(names: Sequence[str]) -> List[Feature]:
+    """Requested features and their dependencies, dependencies first, each once."""
+    order: List[Feature] = []
+    seen: Dict[str, bool] = {}
+
+    def visit(name: str) -> None:
+        if _is_base(name):
+            return
+        state = seen.get(name)
+        if state is True:
+            return
+        if state is False:
+            raise ValueError(f"feature dependency cycle at {name!r}")
+        seen[name] = False
+        f = get_feature(name)
+        for d in f.deps:
+            visit(d)
+        seen[name] = True
+        order.append(f)
+
+    for n in names:
+        visit(n)
+    return order
+
+
+def compute_features(df: pd.DataFrame, names: Sequence[str], trim: bool = True) -> pd.DataFrame:
+    """Compute only the requested features (and what they depend on), each exactly once.
+
+    Returns ts (in the input's dtype) plus the requested columns. With trim=True the first
+    warmup_rows(names) rows are sliced off instead of scanning for NaNs.
+    """
+    df = as_frame(df)
+    if not is_presorted(df):
+        df = df.copy()
+        # Datetime ts keeps the caller's dtype (naive or tz-aware); anything else is parsed as UTC.
+        if not pd.api.types.is_datetime64_any_dtype(df["ts"]):
+            df["ts"] = pd.to_datetime(df["ts"], utc=True)
+        df = df.sort_values("ts").reset_index(drop=True)
+
+    values: Dict[str, np.ndarray] = {}
+
+    def column(name: str) -> np.ndarray:
+        if name not in values:
+            if name not in df.columns:
+                raise KeyError(f"missing input column: {name!r}")
+            values[name] = df[name].to_numpy(dtype=np.float64)
+        return values[name]
+
+    for f in _resolve(names):
+        values[f.name] = f.kernel(*[column(d) for d in f.deps])
+
+    out = pd.DataFrame({"ts": df["ts"].array, **{n: column(n) for n in names}})
+    if trim:
+        out = out.iloc[warmup_rows(names):].reset_index(drop=True)
+    return out
+
+
+# ---------------------------------------------------------------- kernels
+
+
+def _shift(x: np.ndarray, k: int) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if k < len(x):
+        out[k:] = x[: len(x) - k]
+    return out
+
+
+def _rolling_mean(x: np.ndarray, n: int) -> np.ndarray:
+    return pd.Series(x).rolling(n).mean().to_numpy()
+
+
+def _rolling_std(x: np.ndarray, n: int) -> np.ndarray:
+    """Sample std (ddof=1) per window; pandas' single-pass online update, O(len(x)) for any n."""
+    return pd.Series(x).rolling(n).std().to_numpy()
+
+
+def window_std(x: np.ndarray, n: int) -> np.ndarray:
+    """Sample std (ddof=1) per window, two-pass over each window's values in order.
+
+    O(len(x) * n), but every value depends on its own n inputs only, so FeatureState can
+    recompute the newest one from its ring buffer and match build_features bit for bit.
+    """
+    out = np.full(len(x), np.nan)
+    if len(x) < n:
+        return out
+    w = np.lib.stride_tricks.sliding_window_view(np.asarray(x, dtype=np.float64), n)
+    # inf returns (after a zero close) give nan windows, as in pandas, without warnings.
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total = w[:, 0].copy()
+        for j in range(1, n):
+            total += w[:, j]
+        mean = total / n
+        ss = np.zeros(len(w))
+        for j in range(n):
+            d = w[:, j] - mean
+            ss += d * d
+        out[n - 1 :] = np.sqrt(ss / (n - 1))
+    return out
+
+
+def _zscore(x: np.ndarray, n: int) -> np.ndarray:
+    std = _rolling_std(x, n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(std > 0, (x - _rolling_mean(x, n)) / std, np.nan)
+
+
+@register("logret_1", deps=["close"], lookback=1)
+def _logret_1(close: np.ndarray) -> np.ndarray:
+    return np.log(close / _shift(close, 1))
+
+
+@register("true_range", deps=["high", "low", "close"], lookback=1)
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev = _shift(close, 1)
+    return np.maximum(high - low, np.maximum(np.abs(high - prev), np.abs(low - prev)))
+
+
+@register("range_pct", deps=["high", "low", "close"], lookback=0)
+def _range_pct(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    return (high - low) / close
+
+
+@register_family(r"ret_(\d+)")
+def _ret(name: str, k: str) -> Feature:
+    k = int(k)
+
+    def kernel(close: np.ndarray) -> np.ndarray:
+        # Same arithmetic as pct_change(k): close / close.shift(k) - 1, inf after a zero close.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return close / _shift(close, k) - 1
+
+    return Feature(name, ("close",), k, kernel)
+
+
+@register_family(r"vol_(\d+)")
+def _vol(name: str, n: str) -> Feature:
+    n = int(n)
+    return Feature(name, ("ret_1",), n - 1, lambda r: window_std(r, n))
+
+
+@register_family(r"ewm_vol_(\d+)")
+def _ewm_vol(name: str, span: str) -> Feature:
+    span = int(span)
+
+    def kernel(logret: np.ndarray) -> np.ndarray:
+        var = pd.Series(logret * logret).ewm(span=span, adjust=False, min_periods=span).mean()
+        return np.sqrt(var.to_numpy())
+
+    return Feature(name, ("logret_1",), span - 1, kernel)
+
+
+@register_family(r"atr_(\d+)")
+def _atr(name: str, n: str) -> Feature:
+    n = int(n)
+    return Feature(name, ("true_range",), n - 1, lambda tr: _rolling_mean(tr, n))
+
+
+@register_family(r"range_z_(\d+)")
+def _range_z(name: str, n: str) -> Feature:
+    n = int(n)
+    return Feature(name, ("range_pct",), n - 1, lambda x: _zscore(x, n))
+
+
+@register_family(r"volume_z_(\d+)")
+def _volume_z(name: str, n: str) -> Feature:
+    n = int(n)
+    return Feature(name, ("volume",), n - 1, lambda x: _zscore(x, n))
+
+
+@register_family(r"xret_(\w+?)_(\d+)_lag(\d+)")
+def _cross_ret(name: str, asset: str, k: str, lag: str) -> Feature:
+    # k-bar return of another asset's close column (close_<asset>), lagged by lag bars.
+    k, lag = int(k), int(lag)
+    return Feature(name, (f"close_{asset}",), k + lag, lambda c: _shift(c / _shift(c, k) - 1, lag))
+
+
+def feature_names() -> List[str]:
+    """Fixed feature names plus the family patterns, for discovery."""
+    return sorted(_FEATURES) + [p.pattern for p, _ in _FAMILIES]
+
+
+def feature_info(names: Sequence[str]) -> pd.DataFrame:
+    """Dependencies, own lookback and total warm-up of each feature."""
+    rows = []
+    for n in names:
+        f = get_feature(n)
+        rows.append({"name": n, "deps": f.deps, "lookback": f.lookback, "warmup_rows": warmup_rows([n])})
+    return pd.DataFrame(rows)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, create_model
 
 class FeatureObject(BaseModel):
     ts: str
@@ -7,3 +7,8 @@ class FeatureObject(BaseModel):
     ret_4: float
     ret_24: float
     vol_24: float
+
+def feature_schema(names, model_name: str = "Features"):
+    """FeatureObject-style model for an arbitrary registry feature list."""
+    fields = {"ts": (str, ...), **{n: (float, ...) for n in names}}
+    return create_model(model_name, **fields)
@@ -0,0 +1,86 @@
+import math
+from collections import deque
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from data_parquet.bars import as_frame
+from data_parquet.dataset import is_presorted
+from features.build_features import RET_WINDOWS, VOL_WINDOW
+from features.registry import window_std
+from features.schema import FeatureObject
+
+
+class FeatureState:
+    """Incremental build_features: one FeatureObject per new bar in O(VOL_WINDOW).
+
+    Keeps the last max(RET_WINDOWS) + 1 closes and the last VOL_WINDOW 1-bar returns
+    in ring buffers and recomputes vol_24 from the return buffer with the batch kernel
+    (registry.window_std), so every field matches build_features exactly.
+    """
+
+    def __init__(self) -> None:
+        self._closes: deque = deque(maxlen=max(RET_WINDOWS) + 1)
+        self._rets: deque = deque(maxlen=VOL_WINDOW)
+        self.last_ts: Optional[pd.Timestamp] = None
+
+    @property
+    def warmup_bars(self) -> int:
+        return max(max(RET_WINDOWS), VOL_WINDOW) + 1
+
+    def update(self, ts: Any, close: float) -> Optional[FeatureObject]:
+        ts = pd.Timestamp(ts)
+        ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+        if self.last_ts is not None and ts <= self.last_ts:
+            raise ValueError(f"bars must arrive in increasing ts order: {ts} <= {self.last_ts}")
+        self.last_ts = ts
+
+        close = float(close)
+        ret_1 = close / self._closes[-1] - 1 if self._closes else math.nan
+        self._closes.append(close)
+        self._rets.append(ret_1)
+
+        if len(self._closes) <= max(RET_WINDOWS) or len(self._rets) < VOL_WINDOW:
+            return None
+
+        rets = {k: close / self._closes[-1 - k] - 1 for k in RET_WINDOWS}
+        vol = float(window_std(np.fromiter(self._rets, np.float64, VOL_WINDOW), VOL_WINDOW)[-1])
+
+        if math.isnan(close) or math.isnan(vol) or any(math.isnan(v) for v in rets.values()):
+            return None
+
+        return FeatureObject(
+            ts=ts.isoformat(),
+            close=close,
+            ret_1=rets[1],
+            ret_4=rets[4],
+            ret_24=rets[24],
+            vol_24=vol,
+        )
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "FeatureState":
+        state = cls()
+        df = as_frame(df)
+        tail = df.tail(state.warmup_bars) if is_presorted(df) else df.sort_values("ts").tail(state.warmup_bars)
+        for ts, close in zip(tail["ts"], tail["close"]):
+            state.update(ts, close)
+        return state
+
+    @classmethod
+    def from_parquet(cls, path: str) -> "FeatureState":
+        """Warm-start from the last bars of a canonical parquet, reading only the tail row groups."""
+        pf = pq.ParquetFile(path)
+        need = cls().warmup_bars
+        groups = []
+        rows = 0
+        for g in range(pf.num_row_groups - 1, -1, -1):
+            groups.insert(0, g)
+            rows += pf.metadata.row_group(g).num_rows
+            if rows >= need:
+                break
+        tail = pf.read_row_groups(groups, columns=["ts", "close"]).to_pandas()
+        tail["ts"] = pd.to_datetime(tail["ts"], utc=True)
+        return cls.from_frame(tail)
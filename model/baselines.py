@@ -1,18 +1,26 @@
+import numpy as np
 import pandas as pd
 
+from data_parquet.bars import Bars
+from model.signals import DOWN, UP, signal_series
+
 def _ts_utc(df: pd.DataFrame) -> pd.DatetimeIndex:
+    if isinstance(df, Bars):
+        return df.ts_index
     ts = pd.to_datetime(df["ts"], utc=True)  # Simple, handles all cases
     return pd.DatetimeIndex(ts, name="ts")
 
 def always_up(df: pd.DataFrame) -> pd.Series:
     ts = _ts_utc(df)
-    return pd.Series("up", index=ts, dtype="object")
+    return signal_series(np.full(len(ts), UP), ts)
 
 def yesterday_equals_today(df: pd.DataFrame) -> pd.Series:
     ts = _ts_utc(df)
-    close = pd.to_numeric(df["close"], errors="coerce")
-    close.index = ts  # FIX: Align index before pct_change
+    if isinstance(df, Bars):
+        close = pd.Series(df.close, index=ts)
+    else:
+        close = pd.to_numeric(df["close"], errors="coerce")
+        close.index = ts  # FIX: Align index before pct_change
     ret = close.pct_change()
-    sig = pd.Series("up", index=ts, dtype="object")
-    sig.loc[ret < 0] = "down"
-    return sig.fillna("up")
+    # NaN returns (first bar) stay "up"
+    return signal_series(np.where(ret.to_numpy() < 0, DOWN, UP), ts)
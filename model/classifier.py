@@ -1,7 +1,16 @@
+import numpy as np
+import pandas as pd
+
 from features.schema import FeatureObject
+from model.signals import DOWN, SIGNAL_DTYPE, UP
 
 def classify(f: FeatureObject) -> dict:
     if f.ret_4 > 0:
         return {"direction": "up", "confidence": 1.0}
     else:
         return {"direction": "down", "confidence": 1.0}
+
+def classify_batch(feats: pd.DataFrame) -> np.ndarray:
+    # Column-wise equivalent of classify() as int8 signal codes; classify stays the reference.
+    ret_4 = feats["ret_4"].to_numpy(dtype=np.float64)
+    return np.where(ret_4 > 0, UP, DOWN).astype(SIGNAL_DTYPE)
@@ -1,5 +1,10 @@
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
 import pandas as pd
 
+from model.signals import SIGNAL_DTYPE, encode_signals, signal_series
+
 
 def _apply_min_hold(signals: pd.Series, hold_bars: int = 24) -> pd.Series:
     s = signals.copy().fillna("flat")
@@ -76,17 +81,140 @@ def _apply_confirm_switch(signals: pd.Series, confirm_bars: int = 2) -> pd.Serie
     return pd.Series(out, index=s.index, dtype="object")
 
 
-def apply_signal_filters(raw_signals: pd.Series, confirm_bars: int = 2, hold_bars: int = 24) -> pd.Series:
+def _runs(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Run-length encoding: start index and value of each run of equal codes.
+    starts = np.r_[0, np.flatnonzero(np.diff(codes)) + 1]
+    return starts, codes[starts]
+
+
+def _expand(starts: np.ndarray, vals: np.ndarray, n: int) -> np.ndarray:
+    return np.repeat(vals.astype(SIGNAL_DTYPE), np.diff(np.r_[starts, n]))
+
+
+def _confirm_runs(starts: np.ndarray, vals: np.ndarray, n: int, confirm_bars: int) -> Tuple[np.ndarray, np.ndarray]:
+    # A non-flat run switches the state once it reaches max(confirm_bars, 2) bars: the
+    # first bar only arms the pending value, so confirm_bars=1 still needs a repeat.
+    need = max(int(confirm_bars), 2)
+    lengths = np.diff(np.r_[starts, n])
+    ok = (vals != 0) & (lengths >= need)
+    ev_pos = starts[ok] + need - 1
+    ev_val = vals[ok]
+    if len(ev_val):
+        changed = np.r_[True, ev_val[1:] != ev_val[:-1]]
+        ev_pos, ev_val = ev_pos[changed], ev_val[changed]
+    return np.r_[0, ev_pos], np.r_[SIGNAL_DTYPE(0), ev_val].astype(SIGNAL_DTYPE)
+
+
+def _hold_runs(starts: np.ndarray, vals: np.ndarray, n: int, hold_bars: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Walks switch events instead of bars. The hold counter is not incremented on the
+    # entry bar, so the first switch needs one bar more than later ones.
+    hold_bars = int(hold_bars)
+    r_count = len(vals)
+    run_idx = np.arange(r_count)
+    next_run = {
+        side: np.minimum.accumulate(np.where(vals == side, run_idx, r_count)[::-1])[::-1]
+        for side in (1, -1)
+    }
+
+    nonflat = np.flatnonzero(vals != 0)
+    if n == 0 or len(nonflat) == 0:
+        return np.zeros(1, dtype=np.int64), np.zeros(1, dtype=SIGNAL_DTYPE)
+
+    first = int(nonflat[0])
+    last = int(vals[first])
+    out_starts: List[int] = [0, int(starts[first])]
+    out_vals: List[int] = [0, last]
+    threshold = out_starts[-1] + 1 + hold_bars
+
+    while threshold < n:
+        r = int(np.searchsorted(starts, threshold, side="right")) - 1
+        if vals[r] == -last:
+            t = threshold
+        else:
+            r2 = int(next_run[-last][r])
+            if r2 == r_count:
+                break
+            t = int(starts[r2])
+        last = -last
+        out_starts.append(t)
+        out_vals.append(last)
+        threshold = t + max(hold_bars, 1)
+
+    if out_starts[1] == 0:
+        out_starts, out_vals = out_starts[1:], out_vals[1:]
+    return np.asarray(out_starts, dtype=np.int64), np.asarray(out_vals, dtype=SIGNAL_DTYPE)
+
+
+def confirm_switch_codes(codes: np.ndarray, confirm_bars: int = 2) -> np.ndarray:
+    codes = np.asarray(codes, dtype=SIGNAL_DTYPE)
+    n = len(codes)
+    if n == 0:
+        return codes.copy()
+    return _expand(*_confirm_runs(*_runs(codes), n, confirm_bars), n)
+
+
+def min_hold_codes(codes: np.ndarray, hold_bars: int = 24) -> np.ndarray:
+    codes = np.asarray(codes, dtype=SIGNAL_DTYPE)
+    n = len(codes)
+    if n == 0:
+        return codes.copy()
+    return _expand(*_hold_runs(*_runs(codes), n, hold_bars), n)
+
+
+def _check_filter_args(confirm_bars: int, hold_bars: int) -> None:
     if confirm_bars < 1:
         raise ValueError("confirm_bars must be >= 1")
     if hold_bars < 0:
         raise ValueError("hold_bars must be >= 0")
 
-    raw_signals = raw_signals.fillna("flat")
-    bad = set(raw_signals.unique()) - {"up", "down", "flat"}
-    if bad:
-        raise ValueError(f"Unexpected signal values: {bad}")
 
-    confirmed = _apply_confirm_switch(raw_signals, confirm_bars=confirm_bars)
-    held = _apply_min_hold(confirmed, hold_bars=hold_bars)
-    return held
+def filter_signal_codes(codes: np.ndarray, confirm_bars: int = 2, hold_bars: int = 24) -> np.ndarray:
+    """Fused confirm + min-hold over int8 codes (1 up, -1 down, 0 flat).
+
+    Confirm output is kept as runs and fed straight into the hold pass; only the final
+    per-bar array is materialized.
+    """
+    _check_filter_args(confirm_bars, hold_bars)
+    codes = np.asarray(codes, dtype=SIGNAL_DTYPE)
+    n = len(codes)
+    if n == 0:
+        return codes.copy()
+    confirmed = _confirm_runs(*_runs(codes), n, confirm_bars)
+    return _expand(*_hold_runs(*confirmed, n, hold_bars), n)
+
+
+def filter_signal_codes_grid(codes: np.ndarray, pairs: Iterable[Tuple[int, int]]) -> np.ndarray:
+    """Apply many (confirm_bars, hold_bars) pairs to one raw signal; returns (pairs, bars) int8.
+
+    Raw runs are computed once and confirm runs once per distinct confirm_bars.
+    """
+    pairs = [(int(c), int(h)) for c, h in pairs]
+    for c, h in pairs:
+        _check_filter_args(c, h)
+    codes = np.asarray(codes, dtype=SIGNAL_DTYPE)
+    n = len(codes)
+    out = np.zeros((len(pairs), n), dtype=SIGNAL_DTYPE)
+    if n == 0:
+        return out
+
+    raw = _runs(codes)
+    confirmed: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    for j, (c, h) in enumerate(pairs):
+        if c not in confirmed:
+            confirmed[c] = _confirm_runs(*raw, n, c)
+        out[j] = _expand(*_hold_runs(*confirmed[c], n, h), n)
+    return out
+
+
+def apply_signal_filters(raw_signals: pd.Series, confirm_bars: int = 2, hold_bars: int = 24) -> pd.Series:
+    # Accepts int8 codes or old-style labels; always returns int8 codes.
+    _check_filter_args(confirm_bars, hold_bars)
+    codes = filter_signal_codes(encode_signals(raw_signals), confirm_bars=confirm_bars, hold_bars=hold_bars)
+    return signal_series(codes, raw_signals.index, name=raw_signals.name)
+
+
+def apply_signal_filters_grid(raw_signals: pd.Series, pairs: Iterable[Tuple[int, int]]) -> pd.DataFrame:
+    pairs = [(int(c), int(h)) for c, h in pairs]
+    codes = filter_signal_codes_grid(encode_signals(raw_signals), pairs)
+    columns = pd.MultiIndex.from_tuples(pairs, names=["confirm_bars", "hold_bars"])
+    return pd.DataFrame(codes.T, index=raw_signals.index, columns=columns)
@@ -0,0 +1,65 @@
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+# Signals are int8 codes end to end; labels only exist at the edges for old callers.
+UP = 1
+DOWN = -1
+FLAT = 0
+
+SIGNAL_DTYPE = np.int8
+SIGNAL_CODES = {"flat": FLAT, "up": UP, "down": DOWN}
+SIGNAL_LABELS = np.array(["down", "flat", "up"], dtype=object)  # indexed by code + 1
+
+
+def encode_signals(values: Any) -> np.ndarray:
+    """Return int8 codes for labels ("up"/"down"/"flat", NaN -> flat), a Categorical, or codes."""
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.to_numpy()
+    arr = np.asarray(values)
+
+    if arr.dtype.kind in "iub":
+        bad = (arr < DOWN) | (arr > UP)
+        if bad.any():
+            raise ValueError(f"Unexpected signal values: {set(arr[bad].tolist())}")
+        return arr.astype(SIGNAL_DTYPE)
+
+    if arr.dtype.kind == "f":
+        arr = np.where(np.isnan(arr), FLAT, arr)
+        bad = ~np.isin(arr, (DOWN, FLAT, UP))
+        if bad.any():
+            raise ValueError(f"Unexpected signal values: {set(arr[bad].tolist())}")
+        return arr.astype(SIGNAL_DTYPE)
+
+    vals = np.asarray(arr, dtype=object)
+    codes = np.zeros(len(vals), dtype=SIGNAL_DTYPE)
+    is_up = vals == "up"
+    is_down = vals == "down"
+    bad = ~(is_up | is_down | (vals == "flat") | pd.isna(vals))
+    if bad.any():
+        raise ValueError(f"Unexpected signal values: {set(vals[bad].tolist())}")
+    codes[is_up] = UP
+    codes[is_down] = DOWN
+    return codes
+
+
+def signal_series(codes: Any, index: pd.Index, name: Optional[str] = None) -> pd.Series:
+    return pd.Series(np.asarray(codes, dtype=SIGNAL_DTYPE), index=index, name=name)
+
+
+def as_signal_series(signals: pd.Series) -> pd.Series:
+    """Convert an old-style label Series (or a code Series) to the int8 signal type."""
+    return signal_series(encode_signals(signals), signals.index, name=signals.name)
+
+
+def decode_signals(signals: Any) -> Any:
+    """Map int8 codes back to "up"/"down"/"flat" labels for old callers and reports."""
+    if isinstance(signals, pd.DataFrame):
+        out = {col: SIGNAL_LABELS[encode_signals(signals[col]).astype(np.intp) + 1] for col in signals.columns}
+        return pd.DataFrame(out, index=signals.index, columns=signals.columns, dtype="object")
+    if isinstance(signals, pd.Series):
+        labels = SIGNAL_LABELS[encode_signals(signals).astype(np.intp) + 1]
+        return pd.Series(labels, index=signals.index, name=signals.name, dtype="object")
+    return SIGNAL_LABELS[encode_signals(signals).astype(np.intp) + 1]
+
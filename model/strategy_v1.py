@@ -1,35 +1,30 @@
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
-from features.build_features import build_features
-from features.schema import FeatureObject
-from model.classifier import classify
+from data_parquet.bars import as_frame
+from data_parquet.dataset import is_presorted
+from features.cache import FeatureStore, cached_build_features
+from model.classifier import classify_batch
 from model.signal_filters import apply_signal_filters
+from model.signals import DOWN, FLAT, SIGNAL_DTYPE, UP, signal_series
 
 
-def _to_utc_ts(x) -> pd.Timestamp:
-    ts = pd.Timestamp(x)
-    if ts.tzinfo is None:
-        return ts.tz_localize("UTC")
-    return ts.tz_convert("UTC")
-
-
-def build_signals_v1(
-    df: pd.DataFrame,
-    confirm_bars: int = 2,
-    hold_bars: int = 24,
-) -> pd.Series:
-    df = df.copy()
-    df["ts"] = pd.to_datetime(df["ts"], utc=True)
-    df = df.sort_values("ts")
+def raw_signals_v1(df: pd.DataFrame, feature_store: Optional[FeatureStore] = None) -> pd.Series:
+    """Unfiltered classifier directions on every bar, flat where features are undefined."""
+    df = as_frame(df)
+    if not is_presorted(df):
+        df = df.copy()
+        df["ts"] = pd.to_datetime(df["ts"], utc=True)
+        df = df.sort_values("ts")
 
-    if df["ts"].duplicated().any():
-        raise ValueError("df['ts'] has duplicates, engine alignment will be unreliable")
+        if df["ts"].duplicated().any():
+            raise ValueError("df['ts'] has duplicates, engine alignment will be unreliable")
 
     ts_index = pd.DatetimeIndex(df["ts"], name="ts")
 
-    sig = pd.Series("flat", index=ts_index, dtype="object")
-
-    feats = build_features(df)
+    feats = cached_build_features(df, feature_store)
 
     required = ["ts", "close", "ret_1", "ret_4", "ret_24", "vol_24"]
     missing = [c for c in required if c not in feats.columns]
@@ -38,35 +33,31 @@ def build_signals_v1(
 
     feats = feats.dropna(subset=required)
 
-    for row in feats.itertuples(index=False):
-        ts_utc = _to_utc_ts(row.ts)
+    pos = ts_index.get_indexer(pd.to_datetime(feats["ts"], utc=True))
+    keep = pos >= 0
+    direction = classify_batch(feats)[keep]
 
-        if ts_utc not in sig.index:
-            continue
+    bad = set(direction.tolist()) - {UP, DOWN}
+    if bad:
+        raise ValueError(f"Classifier returned invalid direction: {bad}")
 
-        fobj = FeatureObject(
-            ts=ts_utc.isoformat(),
-            close=float(row.close),
-            ret_1=float(row.ret_1),
-            ret_4=float(row.ret_4),
-            ret_24=float(row.ret_24),
-            vol_24=float(row.vol_24),
-        )
+    values = np.full(len(ts_index), FLAT, dtype=SIGNAL_DTYPE)
+    values[pos[keep]] = direction
+    return signal_series(values, ts_index)
 
-        out = classify(fobj)
-        direction = out.get("direction")
 
-        if direction == "up":
-            sig.at[ts_utc] = "up"
-        elif direction == "down":
-            sig.at[ts_utc] = "down"
-        else:
-            raise ValueError(f"Classifier returned invalid direction: {direction}")
+def build_signals_v1(
+    df: pd.DataFrame,
+    confirm_bars: int = 2,
+    hold_bars: int = 24,
+    feature_store: Optional[FeatureStore] = None,
+) -> pd.Series:
+    sig = raw_signals_v1(df, feature_store)
 
     sig = apply_signal_filters(sig, confirm_bars=confirm_bars, hold_bars=hold_bars)
 
-    valid = {"up", "down", "flat"}
-    bad = set(pd.unique(sig.dropna())) - valid
+    valid = {UP, DOWN, FLAT}
+    bad = set(pd.unique(sig).tolist()) - valid
     if bad:
         raise ValueError(f"Invalid signals after filters: {bad}")
 
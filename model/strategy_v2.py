@@ -1,72 +1,57 @@
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
-from features.build_features import build_features
-from features.schema import FeatureObject
-from model.classifier import classify
+from data_parquet.bars import as_frame
+from data_parquet.dataset import is_presorted
+from features.cache import FeatureStore, cached_build_features
+from model.classifier import classify_batch
 from model.signal_filters import apply_signal_filters
+from model.signals import DOWN, FLAT, SIGNAL_DTYPE, UP, signal_series
 
 
-def build_signals_v2(
+def raw_signals_v2(
     df: pd.DataFrame,
-    confirm_bars: int = 3,
-    hold_bars: int = 72,
     min_abs_ret1: float = 0.001,
     max_vol24: float = 0.05,
+    feature_store: Optional[FeatureStore] = None,
 ) -> pd.Series:
-    df = df.copy()
-    df["ts"] = pd.to_datetime(df["ts"], utc=True)
-    df = df.sort_values("ts")
+    """Unfiltered (inverted, gated) directions on every bar, flat where features are undefined."""
+    df = as_frame(df)
+    if not is_presorted(df):
+        df = df.copy()
+        df["ts"] = pd.to_datetime(df["ts"], utc=True)
+        df = df.sort_values("ts")
 
-    if df["ts"].duplicated().any():
-        raise ValueError("df['ts'] has duplicates, engine alignment will be unreliable")
+        if df["ts"].duplicated().any():
+            raise ValueError("df['ts'] has duplicates, engine alignment will be unreliable")
 
-    feats = build_features(df)
+    feats = cached_build_features(df, feature_store)
     feats = feats.dropna(subset=["ts", "close", "ret_1", "ret_4", "ret_24", "vol_24"])
 
     ts_index = pd.DatetimeIndex(df["ts"], name="ts")
-    sig = pd.Series("flat", index=ts_index, dtype="object")
-    ts_set = set(ts_index)
-
-    for row in feats.itertuples(index=False):
-        ts_utc = pd.Timestamp(row.ts)
-        if ts_utc.tzinfo is None:
-            ts_utc = ts_utc.tz_localize("UTC")
-        else:
-            ts_utc = ts_utc.tz_convert("UTC")
-
-        if ts_utc not in ts_set:
-            continue
-
-        r1 = float(row.ret_1)
-        v24 = float(row.vol_24)
-
-        if abs(r1) < min_abs_ret1:
-            continue
-
-        if v24 > max_vol24:
-            continue
 
-        fobj = FeatureObject(
-            ts=str(ts_utc),
-            close=float(row.close),
-            ret_1=float(row.ret_1),
-            ret_4=float(row.ret_4),
-            ret_24=float(row.ret_24),
-            vol_24=float(row.vol_24),
-        )
+    pos = ts_index.get_indexer(pd.to_datetime(feats["ts"], utc=True))
+    r1 = feats["ret_1"].to_numpy(dtype=float)
+    v24 = feats["vol_24"].to_numpy(dtype=float)
+    direction = classify_batch(feats)
+    keep = (pos >= 0) & ~(np.abs(r1) < min_abs_ret1) & ~(v24 > max_vol24)
+    keep &= (direction == UP) | (direction == DOWN)
 
-        out = classify(fobj)
-        direction = out.get("direction")
+    # FIX: invert direction (your flipped test proves current mapping is backwards)
+    values = np.full(len(ts_index), FLAT, dtype=SIGNAL_DTYPE)
+    values[pos[keep]] = -direction[keep]
+    return signal_series(values, ts_index)
 
-        if direction not in ("up", "down"):
-            continue
-
-        # FIX: invert direction (your flipped test proves current mapping is backwards)
-        if direction == "up":
-            direction = "down"
-        else:
-            direction = "up"
-
-        sig.at[ts_utc] = direction
 
+def build_signals_v2(
+    df: pd.DataFrame,
+    confirm_bars: int = 3,
+    hold_bars: int = 72,
+    min_abs_ret1: float = 0.001,
+    max_vol24: float = 0.05,
+    feature_store: Optional[FeatureStore] = None,
+) -> pd.Series:
+    sig = raw_signals_v2(df, min_abs_ret1=min_abs_ret1, max_vol24=max_vol24, feature_store=feature_store)
     return apply_signal_filters(sig, confirm_bars=confirm_bars, hold_bars=hold_bars)
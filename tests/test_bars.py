@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import EngineConfig, run_engine
+from backtest.walkforward import STRATEGY_BUILDERS, split_walkforward
+from data_parquet.bars import Bars
+from data_parquet.dataset import write_bars_ipc
+from features.build_features import build_features
+
+
+def _random_bars(start: str, end: str, seed: int) -> pd.DataFrame:
+    ts = pd.date_range(start, end, freq="h", tz="UTC")
+    n = len(ts)
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.004, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": ts,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.uniform(1.0, 10.0, n),
+        }
+    )
+
+
+def test_bars_invariants_are_checked_at_construction():
+    df = _random_bars("2023-01-01", "2023-01-05", seed=0)
+    bars = Bars.from_frame(df.sample(frac=1.0, random_state=1))
+    np.testing.assert_array_equal(bars.ts_index, df["ts"].dt.as_unit("ns"))
+    np.testing.assert_array_equal(bars.close, df["close"].to_numpy())
+    assert not bars.close.flags.writeable
+
+    ordered = Bars.from_frame(df)
+    assert not np.shares_memory(ordered.close, df["close"].to_numpy())
+    df.loc[0, "close"] = -1.0
+    assert ordered.close[0] > 0
+
+    arrays = bars.arrays()
+    with pytest.raises(ValueError, match="strictly increasing"):
+        Bars(**{**arrays, "ts": arrays["ts"][::-1].copy()})
+    with pytest.raises(ValueError, match="rows"):
+        Bars(**{**arrays, "close": arrays["close"][:-1]})
+    with pytest.raises(TypeError):
+        Bars(**{**arrays, "volume": arrays["volume"].astype(np.float32)})
+    with pytest.raises(ValueError, match="duplicates"):
+        Bars.from_frame(pd.concat([df, df.iloc[:1]]))
+
+
+def test_bars_from_arrow_is_memory_mapped(tmp_path):
+    df = _random_bars("2023-01-01", "2023-01-10", seed=3)
+    path = str(tmp_path / "bars.arrow")
+    write_bars_ipc(df, path)
+    bars = Bars.from_arrow(path)
+    assert not bars.close.flags.owndata
+    frame = bars.to_frame()
+    assert np.shares_memory(frame["close"].to_numpy(), bars.close)
+    pd.testing.assert_frame_equal(frame, df.assign(ts=df["ts"].dt.as_unit("ns")))
+
+
+def test_every_entry_point_accepts_bars():
+    df = _random_bars("2022-11-01", "2024-01-20", seed=6)
+    bars = Bars.from_frame(df)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+
+    pd.testing.assert_frame_equal(build_features(bars), build_features(df), check_dtype=False)
+
+    df_splits = split_walkforward(df)
+    for name, split in split_walkforward(bars).items():
+        start = int(bars.ts_index.searchsorted(df_splits[name]["ts"].iloc[0]))
+        split_bars = bars.slice(start, start + len(split))
+        for strategy, build in STRATEGY_BUILDERS.items():
+            from_bars = build(split_bars)
+            from_df = build(df_splits[name])
+            np.testing.assert_array_equal(from_bars.to_numpy(), from_df.to_numpy())
+            _, _, m_bars = run_engine(split_bars, from_bars, cfg)
+            _, _, m_df = run_engine(df_splits[name], from_df, cfg)
+            assert m_bars == m_df, (name, strategy)
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import EngineConfig, run_engine
+from backtest.walkforward import split_walkforward
+from data_parquet.dataset import is_presorted, load_bar_arrays, load_bars_frame, write_bars_ipc
+from features.build_features import build_features
+from model.strategy_v1 import build_signals_v1
+from model.strategy_v2 import build_signals_v2
+
+
+def _random_bars(start: str, end: str, seed: int) -> pd.DataFrame:
+    ts = pd.date_range(start, end, freq="h", tz="UTC")
+    n = len(ts)
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.004, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": ts,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.uniform(1.0, 10.0, n),
+        }
+    )
+
+
+def test_arrow_bars_round_trip_as_memory_mapped_views(tmp_path):
+    df = _random_bars("2022-12-01", "2023-02-01", seed=2)
+    path = str(tmp_path / "bars.arrow")
+    write_bars_ipc(df, path)
+
+    arrays, sorted_flag = load_bar_arrays(path, columns=["ts", "close"])
+    assert sorted_flag
+    assert list(arrays) == ["ts", "close"]
+    assert arrays["ts"].dtype == np.int64
+    assert not arrays["close"].flags.owndata and not arrays["close"].flags.writeable
+    np.testing.assert_array_equal(arrays["ts"], df["ts"].dt.as_unit("ns").astype("int64").to_numpy())
+
+    loaded = load_bars_frame(path)
+    assert is_presorted(loaded)
+    pd.testing.assert_frame_equal(loaded, df.assign(ts=df["ts"].dt.as_unit("ns")))
+
+    assert is_presorted(loaded.iloc[10:50])
+    assert not is_presorted(loaded.sort_values("close"))
+    assert not is_presorted(loaded[loaded["close"] > loaded["close"].median()])
+
+
+def test_write_rejects_unsorted_bars(tmp_path):
+    df = _random_bars("2023-01-01", "2023-01-03", seed=1)
+    with pytest.raises(ValueError):
+        write_bars_ipc(df.iloc[::-1], str(tmp_path / "bad.arrow"))
+
+
+def test_presorted_bars_give_identical_results(tmp_path):
+    df = _random_bars("2022-11-01", "2024-01-20", seed=5)
+    path = str(tmp_path / "bars.arrow")
+    write_bars_ipc(df, path)
+    fast = load_bars_frame(path)
+
+    # Shuffled input takes the copy/parse/sort path everywhere.
+    slow = df.sample(frac=1.0, random_state=0)
+    slow["ts"] = slow["ts"].astype(str)
+
+    slow_feats = build_features(slow.assign(ts=pd.to_datetime(slow["ts"], utc=True)))
+    pd.testing.assert_frame_equal(build_features(fast), slow_feats, check_dtype=False)
+
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+    fast_splits = split_walkforward(fast)
+    slow_splits = split_walkforward(slow)
+    for name in fast_splits:
+        f_df, s_df = fast_splits[name], slow_splits[name]
+        assert is_presorted(f_df)
+        for build in (build_signals_v1, build_signals_v2):
+            f_sig, s_sig = build(f_df), build(s_df)
+            np.testing.assert_array_equal(f_sig.to_numpy(), s_sig.to_numpy())
+            _, f_eq, f_m = run_engine(f_df, f_sig, cfg)
+            _, s_eq, s_m = run_engine(s_df, s_sig, cfg)
+            assert f_m == s_m
+            np.testing.assert_array_equal(f_eq["equity"].to_numpy(), s_eq["equity"].to_numpy())
+
+
+def test_stale_presorted_flag_is_not_trusted(tmp_path):
+    df = _random_bars("2023-01-01", "2023-01-10", seed=3)
+    path = str(tmp_path / "bars.arrow")
+    write_bars_ipc(df, path)
+    loaded = load_bars_frame(path)
+
+    # attrs survive these, but the ts column no longer is sorted and unique.
+    reversed_ = loaded.iloc[::-1].reset_index(drop=True)
+    doubled = pd.concat([loaded, loaded.iloc[50:]], ignore_index=True)
+    assert reversed_.attrs and doubled.attrs
+    assert not is_presorted(reversed_) and not is_presorted(doubled)
+
+    pd.testing.assert_frame_equal(build_features(reversed_), build_features(loaded))
+    with pytest.raises(ValueError, match="duplicates"):
+        build_signals_v1(doubled)
+
+
+def test_loaded_bars_are_read_only_unless_writable(tmp_path):
+    df = _random_bars("2023-01-01", "2023-01-03", seed=4)
+    path = str(tmp_path / "bars.arrow")
+    write_bars_ipc(df, path)
+
+    mapped = load_bars_frame(path)
+    with pytest.raises(ValueError, match="read-only"):
+        mapped.loc[0, "close"] = 1.0
+    assert (mapped.assign(close=1.0)["close"] == 1.0).all()
+
+    own = load_bars_frame(path, writable=True)
+    own.loc[0, "close"] = 1.0
+    assert own.loc[0, "close"] == 1.0
+    assert load_bars_frame(path).loc[0, "close"] == df.loc[0, "close"]
+    assert is_presorted(own)
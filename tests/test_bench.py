@@ -0,0 +1,51 @@
+from bench.suite import (
+    MINUTE_MS,
+    RESULT_COLS,
+    STAGES,
+    compare,
+    load_baseline,
+    main,
+    raw_frame,
+    run_suite,
+    save_baseline,
+    synthetic_bars,
+)
+from data_parquet.dataset import is_presorted
+from data_raw.validate_ohlcv import validate_ohlcv
+
+
+def test_synthetic_bars_are_clean_canonical_bars():
+    bars = synthetic_bars(3_000, seed=1)
+    assert is_presorted(bars)
+    issues, gaps = validate_ohlcv(raw_frame(bars))
+    assert issues["pass"] and gaps.empty
+
+    minutes = synthetic_bars(3_000, seed=1, step_ms=MINUTE_MS)
+    issues, gaps = validate_ohlcv(raw_frame(minutes), MINUTE_MS)
+    assert issues["pass"] and gaps.empty and issues["non_hour_step_count"] == 0
+
+
+def test_suite_baseline_round_trip_and_regression_flag(tmp_path):
+    results = run_suite(sizes=[2_000], repeat=1)
+    assert list(results.columns) == RESULT_COLS
+    assert list(results["stage"]) == [s.name for s in STAGES]
+    assert list(results["bars"]) == [2_000 * s.scale for s in STAGES]
+    assert (results["wall_s"] > 0).all() and (results["peak_bytes"] > 0).all()
+
+    path = str(tmp_path / "baseline.json")
+    save_baseline(results, path)
+    baseline = load_baseline(path)
+    assert not compare(results, baseline)["regression"].any()
+
+    slower = results.assign(wall_s=results["wall_s"] * 2 + 0.01)
+    bigger = results.assign(peak_bytes=results["peak_bytes"] * 2)
+    assert compare(slower, baseline)["regression"].all()
+    assert compare(bigger, baseline)["regression"].all()
+
+
+def test_main_saves_then_compares(tmp_path, capsys):
+    path = str(tmp_path / "b.json")
+    args = ["--sizes", "1500", "--stages", "validate_ohlcv", "split_walkforward", "--repeat", "1", "--baseline", path]
+    assert main(args + ["--save"]) == 0
+    assert main(args) in (0, 1)
+    assert "REGRESSIONS" in capsys.readouterr().out
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from features.schema import FeatureObject
+from model.classifier import classify, classify_batch
+from model.signals import SIGNAL_CODES
+
+
+def test_classify_batch_matches_scalar_classify():
+    rng = np.random.default_rng(0)
+    n = 500
+    feats = pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+            "close": 100.0 + rng.normal(0.0, 1.0, n),
+            "ret_1": rng.normal(0.0, 0.01, n),
+            "ret_4": rng.normal(0.0, 0.02, n),
+            "ret_24": rng.normal(0.0, 0.05, n),
+            "vol_24": np.abs(rng.normal(0.0, 0.01, n)),
+        }
+    )
+    feats.loc[:9, "ret_4"] = 0.0
+
+    batch = classify_batch(feats)
+
+    scalar = [
+        classify(
+            FeatureObject(
+                ts=row.ts.isoformat(),
+                close=float(row.close),
+                ret_1=float(row.ret_1),
+                ret_4=float(row.ret_4),
+                ret_24=float(row.ret_24),
+                vol_24=float(row.vol_24),
+            )
+        )["direction"]
+        for row in feats.itertuples(index=False)
+    ]
+
+    assert batch.dtype == np.int8
+    assert batch.tolist() == [SIGNAL_CODES[d] for d in scalar]
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from backtest.checkpoint import load_checkpoint, resume_engine
+from backtest.engine import EngineConfig, run_engine
+from model.strategy_v2 import build_signals_v2
+
+
+def _random_bars(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.004, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+def test_resume_in_chunks_matches_single_run(tmp_path):
+    df = _random_bars(3_000, seed=3)
+    sig = build_signals_v2(df, confirm_bars=1, hold_bars=0)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+    trades_ref, equity_ref, _ = run_engine(df, sig, cfg)
+
+    ckpt = str(tmp_path / "state.json")
+    trades_dir = str(tmp_path / "trades")
+    equity_dir = str(tmp_path / "equity")
+
+    # hourly-style updates: each call sees the full history but only processes new bars
+    for end in (1_000, 1_001, 1_737, 2_500, 3_000):
+        resume_engine(df.iloc[:end], sig, cfg, ckpt, trades_dir, equity_dir)
+
+    new_trades, new_equity, state = resume_engine(df, sig, cfg, ckpt, trades_dir, equity_dir)
+    assert new_trades.empty and new_equity.empty
+    assert state.bar_idx == len(df) - 1
+
+    equity = pd.read_parquet(equity_dir)
+    pd.testing.assert_frame_equal(equity.reset_index(drop=True), equity_ref, check_exact=True)
+
+    state = load_checkpoint(ckpt, cfg)
+    closed = [ev.trade for ev in state.liquidate()]
+    trades = pd.concat([pd.read_parquet(trades_dir), pd.DataFrame(closed)], ignore_index=True)
+    for col in ["decision_ts", "entry_ts", "exit_ts"]:
+        trades[col] = pd.to_datetime(trades[col], utc=True)
+    trades = trades.sort_values("entry_bar_idx").reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(trades, trades_ref, check_exact=True)
+
+
+def test_resume_prepares_only_the_new_bars(tmp_path, monkeypatch):
+    import backtest.checkpoint as checkpoint
+
+    df = _random_bars(2_000, seed=4)
+    sig = build_signals_v2(df, confirm_bars=1, hold_bars=0)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+    paths = [str(tmp_path / name) for name in ("state.json", "trades", "equity")]
+    resume_engine(df.iloc[:1_990], sig, cfg, *paths)
+
+    seen = []
+    prepare, align = checkpoint._prepare_bars, checkpoint._align_signals
+    monkeypatch.setattr(checkpoint, "_prepare_bars", lambda d: seen.append(len(d)) or prepare(d))
+    monkeypatch.setattr(checkpoint, "_align_signals", lambda s, ts: seen.append(len(s)) or align(s, ts))
+    _, equity, state = resume_engine(df, sig, cfg, *paths)
+
+    assert seen == [10, 10]
+    assert len(equity) == 10 and state.bar_idx == len(df) - 1
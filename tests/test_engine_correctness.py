@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
-from backtest.engine import EngineConfig, run_engine
+import pytest
+
+from backtest.engine import ENGINE_MODES, EngineConfig, run_engine
+from model.signals import decode_signals, encode_signals
 
 def _df_two_bars():
     return pd.DataFrame({
@@ -11,30 +15,33 @@ def _df_two_bars():
         "volume":[1.0, 1.0],
     })
 
-def test_entry_fills_next_open():
+@pytest.mark.parametrize("mode", ENGINE_MODES)
+def test_entry_fills_next_open(mode):
     df = _df_two_bars()
     ts = pd.DatetimeIndex(df["ts"])
     sig = pd.Series(["up","up"], index=ts)
 
     cfg = EngineConfig(fee_taker=0.0, slippage_side=0.0, stop_loss_pct=0.99, initial_equity=1.0)
-    trades, equity, metrics = run_engine(df, sig, cfg)
+    trades, equity, metrics = run_engine(df, sig, cfg, mode=mode)
 
     assert len(trades) == 1
     assert trades.iloc[0]["entry_ts"] == df.loc[0,"ts"]  # scheduled at close 0, filled at open bar 0 in this engine timing
 
-def test_fee_applied_on_entry_and_exit():
+@pytest.mark.parametrize("mode", ENGINE_MODES)
+def test_fee_applied_on_entry_and_exit(mode):
     df = _df_two_bars()
     ts = pd.DatetimeIndex(df["ts"])
     sig = pd.Series(["up","down"], index=ts)
 
     cfg = EngineConfig(fee_taker=0.1, slippage_side=0.0, stop_loss_pct=0.99, initial_equity=1.0)
-    trades, equity, metrics = run_engine(df, sig, cfg)
+    trades, equity, metrics = run_engine(df, sig, cfg, mode=mode)
 
     assert len(trades) == 1
     assert trades.iloc[0]["fee_entry"] > 0
     assert trades.iloc[0]["fee_exit"] > 0
 
-def test_long_stop_triggers_on_low():
+@pytest.mark.parametrize("mode", ENGINE_MODES)
+def test_long_stop_triggers_on_low(mode):
     df = pd.DataFrame({
         "ts": pd.to_datetime(["2026-01-01T00:00:00Z"], utc=True),
         "open": [100.0],
@@ -47,12 +54,13 @@ def test_long_stop_triggers_on_low():
     sig = pd.Series(["up"], index=ts)
 
     cfg = EngineConfig(fee_taker=0.0, slippage_side=0.0, stop_loss_pct=0.02, initial_equity=1.0)
-    trades, equity, metrics = run_engine(df, sig, cfg)
+    trades, equity, metrics = run_engine(df, sig, cfg, mode=mode)
 
     assert len(trades) == 1
     assert trades.iloc[0]["exit_reason"] == "stop"
 
-def test_no_multiple_positions():
+@pytest.mark.parametrize("mode", ENGINE_MODES)
+def test_no_multiple_positions(mode):
     df = pd.DataFrame({
         "ts": pd.to_datetime(["2026-01-01T00:00:00Z","2026-01-01T01:00:00Z","2026-01-01T02:00:00Z"], utc=True),
         "open": [100.0, 100.0, 100.0],
@@ -65,6 +73,64 @@ def test_no_multiple_positions():
     sig = pd.Series(["up","up","up"], index=ts)
 
     cfg = EngineConfig(fee_taker=0.0, slippage_side=0.0, stop_loss_pct=0.99, initial_equity=1.0)
-    trades, equity, metrics = run_engine(df, sig, cfg)
+    trades, equity, metrics = run_engine(df, sig, cfg, mode=mode)
 
     assert len(trades) <= 1
+
+
+def _random_bars(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    open_ = np.r_[100.0, close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.006, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+@pytest.mark.parametrize("hold_min_bars", [0, 1, 12])
+def test_array_mode_matches_frame_mode(hold_min_bars):
+    df = _random_bars(3000, seed=hold_min_bars)
+    rng = np.random.default_rng(100 + hold_min_bars)
+    labels = rng.choice(["up", "down", "flat"], size=len(df), p=[0.3, 0.3, 0.4])
+    sig = pd.Series(labels, index=pd.DatetimeIndex(df["ts"]), dtype="object")
+
+    cfg = EngineConfig(
+        fee_taker=0.0004,
+        slippage_side=0.0001,
+        stop_loss_pct=0.01,
+        initial_equity=1_000.0,
+        hold_min_bars=hold_min_bars,
+    )
+    t_ref, e_ref, m_ref = run_engine(df, sig, cfg, mode="frame")
+    t_arr, e_arr, m_arr = run_engine(df, sig, cfg, mode="array")
+
+    assert set(t_ref["exit_reason"]) >= {"signal", "stop"}
+    pd.testing.assert_frame_equal(t_arr, t_ref, check_exact=True)
+    pd.testing.assert_frame_equal(e_arr, e_ref, check_exact=True)
+    assert m_arr == m_ref
+
+
+@pytest.mark.parametrize("mode", ENGINE_MODES)
+def test_label_and_code_signals_are_equivalent(mode):
+    df = _random_bars(500, seed=5)
+    codes = np.random.default_rng(6).choice(np.array([1, -1, 0], dtype=np.int8), size=len(df))
+    sig_codes = pd.Series(codes, index=pd.DatetimeIndex(df["ts"]))
+    sig_labels = decode_signals(sig_codes)
+    assert sig_labels.dtype == object
+
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1.0)
+    t_lab, e_lab, m_lab = run_engine(df, sig_labels, cfg, mode=mode)
+    t_code, e_code, m_code = run_engine(df, sig_codes, cfg, mode=mode)
+
+    pd.testing.assert_frame_equal(t_code, t_lab)
+    pd.testing.assert_frame_equal(e_code, e_lab)
+    assert m_code == m_lab
+    assert encode_signals(sig_labels).tolist() == codes.tolist()
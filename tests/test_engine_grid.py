@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from backtest.batch import METRIC_COLS, config_grid, run_engine_grid, run_strategy_matrix
+from backtest.engine import EngineConfig, run_engine
+from model.baselines import always_up, yesterday_equals_today
+from model.strategy_v1 import build_signals_v1
+from model.strategy_v2 import build_signals_v2
+
+
+def _random_bars(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    open_ = np.r_[100.0, close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.006, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+def test_grid_matches_single_runs():
+    df = _random_bars(2000, seed=7)
+    rng = np.random.default_rng(8)
+    labels = rng.choice(["up", "down", "flat"], size=len(df), p=[0.3, 0.3, 0.4])
+    sig = pd.Series(labels, index=pd.DatetimeIndex(df["ts"]), dtype="object")
+
+    base = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+    configs = config_grid(
+        base,
+        stop_loss_pct=[0.005, 0.02],
+        hold_min_bars=[0, 3, 12],
+        fee_taker=[0.0, 0.0004],
+        slippage_side=[0.0, 0.0001],
+    )
+    assert len(configs) == 24
+
+    table, details = run_engine_grid(df, sig, configs, keep=[0, 5])
+    assert len(table) == len(configs)
+    assert sorted(details) == [0, 5]
+
+    for j, cfg in enumerate(configs):
+        trades, equity, metrics = run_engine(df, sig, cfg, mode="array")
+        row = table.iloc[j]
+        assert row["stop_loss_pct"] == cfg.stop_loss_pct
+        for key in METRIC_COLS:
+            if key in ("avg_fees", "total_fees"):
+                assert np.isclose(row[key], metrics[key], rtol=1e-12, atol=0.0)
+            else:
+                assert row[key] == metrics[key], (j, key)
+
+        if j in details:
+            pd.testing.assert_frame_equal(details[j][0], trades)
+            pd.testing.assert_frame_equal(details[j][1], equity)
+
+
+def test_strategy_matrix_matches_single_runs():
+    df = _random_bars(1500, seed=11)
+    signals = pd.DataFrame(
+        {
+            "always_up": always_up(df),
+            "yesterday_equals_today": yesterday_equals_today(df),
+            "v1": build_signals_v1(df),
+            "v2": build_signals_v2(df),
+        }
+    )
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+
+    table = run_strategy_matrix(df, signals, cfg)
+    assert list(table["strategy"]) == list(signals.columns)
+
+    for j, name in enumerate(signals.columns):
+        _, _, metrics = run_engine(df, signals[name], cfg, mode="array")
+        row = table.iloc[j]
+        for key in METRIC_COLS:
+            if key in ("avg_fees", "total_fees"):
+                assert np.isclose(row[key], metrics[key], rtol=1e-12, atol=0.0)
+            else:
+                assert row[key] == metrics[key], (name, key)
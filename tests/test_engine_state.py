@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from backtest.engine import EngineConfig, EngineState, run_engine
+from model.strategy_v2 import build_signals_v2
+
+CANON_PATH = "data_parquet/BTCUSD_USD_1h_20220323_now.parquet"
+
+
+def _bars(n: int, seed: int) -> pd.DataFrame:
+    try:
+        df = pd.read_parquet(CANON_PATH)
+        df["ts"] = pd.to_datetime(df["ts"], utc=True)
+        return df.sort_values("ts").reset_index(drop=True)
+    except FileNotFoundError:
+        pass
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.004, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range("2022-03-23 10:00", periods=n, freq="h", tz="UTC"),
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+def test_engine_state_replay_matches_reference_engine():
+    df = _bars(33_878, seed=0)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+
+    sig = build_signals_v2(df, confirm_bars=1, hold_bars=0)
+
+    t_ref, e_ref, m_ref = run_engine(df, sig, cfg, mode="frame")
+    t_new, e_new, m_new = run_engine(df, sig, cfg)
+
+    assert set(t_ref["exit_reason"]) == {"signal", "stop", "eod"}
+    pd.testing.assert_frame_equal(t_new, t_ref, check_exact=True)
+    pd.testing.assert_frame_equal(e_new, e_ref, check_exact=True)
+    assert m_new == m_ref
+
+
+def test_engine_state_streams_events_one_bar_at_a_time():
+    df = _bars(2_000, seed=1).iloc[:2_000]
+    sig = build_signals_v2(df)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+    trades_ref, equity_ref, _ = run_engine(df, sig, cfg, mode="frame")
+
+    state = EngineState(cfg)
+    exits = []
+    for i, row in enumerate(df.itertuples(index=False)):
+        events = state.on_bar(row.ts, row.open, row.high, row.low, row.close, int(sig.iloc[i]))
+        exits.extend(ev.trade for ev in events if ev.kind == "exit")
+        assert state.equity == equity_ref["equity"].iloc[i]
+        assert state.drawdown == equity_ref["drawdown"].iloc[i]
+    exits.extend(ev.trade for ev in state.liquidate())
+
+    assert state.position == 0
+    assert len(exits) == len(trades_ref)
+    assert [t["exit_ts"] for t in exits] == list(trades_ref["exit_ts"])
+    assert [t["net_pnl_dollars"] for t in exits] == list(trades_ref["net_pnl_dollars"])
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.build_features import build_features
+from features.cache import FeatureStore, bars_hash
+from model.strategy_v1 import build_signals_v1
+
+
+def _random_bars(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+def test_feature_store_round_trip_and_hash(tmp_path):
+    df = _random_bars(500, seed=0)
+    store = FeatureStore(root=str(tmp_path))
+
+    first = store.get_or_build(df)
+    assert len(list(tmp_path.glob("*.arrow"))) == 1
+    second = store.get_or_build(df.sample(frac=1.0, random_state=0))
+
+    pd.testing.assert_frame_equal(first, build_features(df))
+    pd.testing.assert_frame_equal(second, first)
+
+    changed = df.copy()
+    changed.loc[10, "close"] *= 1.01
+    assert bars_hash(changed) != bars_hash(df)
+    store.get_or_build(changed)
+    assert len(list(tmp_path.glob("*.arrow"))) == 2
+
+
+def test_feature_store_evicts_least_recently_used(tmp_path):
+    frames = [_random_bars(400, seed=s) for s in range(3)]
+    store = FeatureStore(root=str(tmp_path))
+    paths = [store.path_for(df) for df in frames]
+
+    store.get_or_build(frames[0])
+    store.get_or_build(frames[1])
+    store.max_bytes = paths[0].stat().st_size * 2 + 1
+    store.get_or_build(frames[0])  # refresh 0, so 1 is now least recently used
+    # A file another process removes between the glob and the stat is skipped.
+    (tmp_path / "gone.arrow").symlink_to(tmp_path / "missing.arrow")
+    store.get_or_build(frames[2])
+
+    assert paths[0].exists()
+    assert not paths[1].exists()
+    assert paths[2].exists()
+
+
+def test_strategy_uses_feature_store(tmp_path):
+    df = _random_bars(300, seed=4)
+    store = FeatureStore(root=str(tmp_path))
+    pd.testing.assert_series_equal(build_signals_v1(df, feature_store=store), build_signals_v1(df))
+    pd.testing.assert_series_equal(build_signals_v1(df, feature_store=store), build_signals_v1(df))
+
+
+def test_feature_store_hits_are_memory_mapped(tmp_path):
+    df = _random_bars(300, seed=5)
+    store = FeatureStore(root=str(tmp_path))
+    built = store.get_or_build(df)
+    hit = store.get_or_build(df)
+
+    pd.testing.assert_frame_equal(hit, built)
+    close = hit["close"].to_numpy()
+    assert not close.flags.owndata and not close.flags.writeable
+    with pytest.raises(ValueError):
+        hit.loc[0, "close"] = 0.0
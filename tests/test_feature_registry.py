@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import registry
+from features.build_features import WARMUP_ROWS, build_features
+from features.registry import compute_features, feature_info, warmup_rows
+from features.schema import feature_schema
+
+
+def _random_bars(n: int, seed: int) -> pd.DataFrame:
+    ts = pd.date_range("2023-01-01", periods=n, freq="h", tz="UTC")
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.004, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": ts,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.uniform(1.0, 10.0, n),
+            "close_ETH": 0.05 * close * np.exp(rng.normal(0.0, 0.01, n)),
+        }
+    )
+
+
+def test_build_features_matches_pandas_reference():
+    df = _random_bars(2_000, seed=0)
+    names = ["close", "ret_1", "ret_4", "ret_24", "vol_24"]
+    ref = df[["ts", "close"]].copy()
+    for k in (1, 4, 24):
+        ref[f"ret_{k}"] = df["close"].pct_change(k)
+    ref["vol_24"] = ref["ret_1"].rolling(24).std()
+    ref = ref.dropna().reset_index(drop=True)
+
+    assert warmup_rows(names) == WARMUP_ROWS
+    pd.testing.assert_frame_equal(build_features(df), ref)
+    pd.testing.assert_frame_equal(compute_features(df, names), ref)
+
+
+def test_extended_features_match_pandas_and_warmups_are_exact():
+    df = _random_bars(1_500, seed=1)
+    names = ["atr_14", "range_z_48", "volume_z_48", "ewm_vol_24", "xret_ETH_4_lag1", "ret_168"]
+    out = compute_features(df, names, trim=False)
+
+    for name in names:
+        col = out[name].to_numpy()
+        assert np.isnan(col[: warmup_rows([name])]).all(), name
+        assert not np.isnan(col[warmup_rows([name]) :]).any(), name
+
+    prev = df["close"].shift(1)
+    tr = pd.concat([df["high"] - df["low"], (df["high"] - prev).abs(), (df["low"] - prev).abs()], axis=1).max(axis=1)
+    tr[prev.isna()] = np.nan
+    np.testing.assert_allclose(out["atr_14"], tr.rolling(14).mean(), rtol=1e-12)
+
+    rng_pct = (df["high"] - df["low"]) / df["close"]
+    z = (rng_pct - rng_pct.rolling(48).mean()) / rng_pct.rolling(48).std()
+    np.testing.assert_allclose(out["range_z_48"], z, rtol=1e-9, atol=1e-12)
+
+    logret = np.log(df["close"] / df["close"].shift(1))
+    ewm = np.sqrt((logret**2).ewm(span=24, adjust=False, min_periods=24).mean())
+    np.testing.assert_allclose(out["ewm_vol_24"], ewm, rtol=1e-12)
+
+    xret = df["close_ETH"].pct_change(4).shift(1)
+    np.testing.assert_allclose(out["xret_ETH_4_lag1"], xret, rtol=1e-12)
+
+    trimmed = compute_features(df, names)
+    assert len(trimmed) == len(df) - warmup_rows(names)
+    assert not trimmed.isna().any().any()
+
+
+def test_only_requested_features_and_shared_deps_are_computed(monkeypatch):
+    calls = []
+    original = registry._FEATURES["logret_1"]
+
+    def counting_kernel(close):
+        calls.append(1)
+        return original.kernel(close)
+
+    counted = registry.Feature(original.name, original.deps, original.lookback, counting_kernel)
+    monkeypatch.setitem(registry._FEATURES, "logret_1", counted)
+
+    df = _random_bars(300, seed=2)
+    out = compute_features(df, ["ewm_vol_12", "ewm_vol_24", "volume"])
+    assert list(out.columns) == ["ts", "ewm_vol_12", "ewm_vol_24", "volume"]
+    assert calls == [1]
+
+    info = feature_info(["ewm_vol_24", "atr_14"]).set_index("name")
+    assert info.loc["ewm_vol_24", "warmup_rows"] == 24
+    assert info.loc["atr_14", "deps"] == ("true_range",)
+
+    with pytest.raises(KeyError):
+        compute_features(df, ["xret_SOL_1_lag1"])
+
+
+def test_feature_schema_accepts_registry_rows():
+    df = _random_bars(100, seed=3)
+    names = ["ret_1", "atr_14"]
+    row = compute_features(df, names).iloc[-1]
+    model = feature_schema(names)
+    obj = model(ts=str(row["ts"]), **{n: float(row[n]) for n in names})
+    assert obj.atr_14 == row["atr_14"]
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from features.build_features import build_features
+from features.streaming import FeatureState
+
+
+def _random_bars(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.005, n)))
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range("2022-03-23 10:00", periods=n, freq="h", tz="UTC"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+def _stream(state: FeatureState, df: pd.DataFrame) -> pd.DataFrame:
+    rows = [state.update(ts, close) for ts, close in zip(df["ts"], df["close"])]
+    return pd.DataFrame([r.model_dump() for r in rows if r is not None])
+
+
+def test_feature_state_matches_batch_features():
+    df = _random_bars(20_000, seed=1)
+    batch = build_features(df)
+    streamed = _stream(FeatureState(), df)
+
+    assert len(streamed) == len(batch)
+    assert streamed["ts"].tolist() == [ts.isoformat() for ts in batch["ts"]]
+    for col in ["close", "ret_1", "ret_4", "ret_24", "vol_24"]:
+        assert np.array_equal(streamed[col].to_numpy(), batch[col].to_numpy()), col
+
+
+def test_feature_state_warm_start_from_parquet_tail(tmp_path):
+    df = _random_bars(3_000, seed=2)
+    path = tmp_path / "bars.parquet"
+    df.iloc[:2_000].to_parquet(path, index=False, row_group_size=100)
+
+    state = FeatureState.from_parquet(str(path))
+    streamed = _stream(state, df.iloc[2_000:])
+
+    batch = build_features(df).iloc[-1_000:].reset_index(drop=True)
+    assert streamed["ts"].tolist() == [ts.isoformat() for ts in batch["ts"]]
+    for col in ["ret_24", "vol_24"]:
+        assert np.array_equal(streamed[col].to_numpy(), batch[col].to_numpy()), col
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_raw.fetch_ohlcv import HOUR_MS, fetch_incremental
+from data_raw.store import legacy_raw_path, load_raw, month_files, partition_dir, read_raw
+
+T0 = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+
+
+class FakeExchange:
+    """Serves a fixed candle history the way ccxt.fetch_ohlcv pages it."""
+
+    rateLimit = 0
+
+    def __init__(self, n: int, max_page: int = 500):
+        rng = np.random.default_rng(0)
+        close = 40_000.0 + np.cumsum(rng.normal(0.0, 50.0, n))
+        self.candles = [
+            [T0 + i * HOUR_MS, float(c), float(c) + 10.0, float(c) - 10.0, float(c), 1.0] for i, c in enumerate(close)
+        ]
+        self.visible = n
+        self.max_page = max_page
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=None):
+        self.calls.append(since)
+        rows = [r for r in self.candles[: self.visible] if r[0] >= since]
+        return [list(r) for r in rows[: min(limit, self.max_page)]]
+
+
+def test_incremental_fetch_appends_only_new_bars(tmp_path):
+    ex = FakeExchange(n=24 * 70)
+    ex.visible = 24 * 62
+    root = str(tmp_path)
+    no_sleep = lambda s: None
+
+    first = fetch_incremental(ex, "BTC/USD:USD", "1h", T0, root=root, sleep=no_sleep)
+    path = partition_dir("BTC/USD:USD", "1h", root)
+    assert first["rows_fetched"] == 24 * 62
+    assert [os.path.basename(f) for f in month_files(path)] == ["2024-01.parquet", "2024-02.parquet", "2024-03.parquet"]
+
+    # The last stored bar was still open: the refresh must overwrite it.
+    ex.candles[24 * 62 - 1][4] += 123.0
+    ex.visible = 24 * 70
+    ex.calls.clear()
+    second = fetch_incremental(ex, "BTC/USD:USD", "1h", T0, root=root, sleep=no_sleep)
+
+    assert second["since"] == T0 + (24 * 62 - 1) * HOUR_MS
+    assert second["rows_fetched"] == 24 * 8 + 1
+    assert len(ex.calls) == 2
+    assert [os.path.basename(f) for f in second["files_written"]] == ["2024-03.parquet"]
+    assert second["last_ts"] == T0 + (24 * 70 - 1) * HOUR_MS
+
+    stored = read_raw(path)
+    expected = pd.DataFrame(ex.candles, columns=["ts_ms", "open", "high", "low", "close", "volume"])
+    pd.testing.assert_frame_equal(stored, expected)
+
+
+def test_incremental_fetch_is_a_noop_when_up_to_date(tmp_path):
+    ex = FakeExchange(n=100)
+    root = str(tmp_path)
+    fetch_incremental(ex, "BTC/USD:USD", "1h", T0, root=root, sleep=lambda s: None)
+    again = fetch_incremental(ex, "BTC/USD:USD", "1h", T0, root=root, sleep=lambda s: None)
+    assert again["rows_fetched"] == 1
+    assert len(read_raw(partition_dir("BTC/USD:USD", "1h", root))) == 100
+
+
+def test_load_raw_migrates_the_legacy_file_once(tmp_path):
+    path = partition_dir("BTC/USD:USD", "1h", str(tmp_path))
+    with pytest.raises(FileNotFoundError, match="no raw bars"):
+        load_raw(path)
+
+    legacy = pd.DataFrame(FakeExchange(n=24 * 40).candles, columns=["ts_ms", "open", "high", "low", "close", "volume"])
+    legacy.iloc[::-1].to_parquet(legacy_raw_path(path), index=False)
+    pd.testing.assert_frame_equal(load_raw(path), legacy)
+    assert [os.path.basename(f) for f in month_files(path)] == ["2024-01.parquet", "2024-02.parquet"]
+
+    # Once the partition has bars the legacy file is ignored.
+    legacy.iloc[:10].to_parquet(legacy_raw_path(path), index=False)
+    assert len(load_raw(path)) == 24 * 40
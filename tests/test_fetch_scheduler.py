@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_raw.fetch_ohlcv import timeframe_ms
+from data_raw.fetch_scheduler import FetchJob, TokenBucket, run_fetch_job, run_fetch_jobs
+from data_raw.store import RAW_COLS, legacy_raw_path, month_files, partition_dir, read_raw
+
+T0 = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+
+
+class StubExchange:
+    """Async stand-in for a ccxt.async_support exchange with injectable failures."""
+
+    rateLimit = 5
+
+    def __init__(self, histories, fail_every=0, fail_after=None):
+        self.histories = histories
+        self.fail_every = fail_every
+        self.fail_after = fail_after
+        self.calls = []
+
+    async def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=None):
+        self.calls.append((symbol, timeframe, since, time.monotonic()))
+        n = len(self.calls)
+        if self.fail_after is not None and n > self.fail_after:
+            raise RuntimeError("connection dropped")
+        if self.fail_every and n % self.fail_every == 0:
+            raise ConnectionError("transient")
+        await asyncio.sleep(0)
+        rows = [r for r in self.histories[(symbol, timeframe)] if r[0] >= since]
+        return [list(r) for r in rows[: min(limit, 300)]]
+
+
+def _history(n, timeframe, seed):
+    rng = np.random.default_rng(seed)
+    step = timeframe_ms(timeframe)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 1.0, n))
+    return [[T0 + i * step, float(c), float(c) + 1, float(c) - 1, float(c), 1.0] for i, c in enumerate(close)]
+
+
+def _histories():
+    return {
+        ("BTC/USD:USD", "1h"): _history(1000, "1h", 0),
+        ("ETH/USD:USD", "1h"): _history(700, "1h", 1),
+        ("BTC/USD:USD", "4h"): _history(400, "4h", 2),
+    }
+
+
+def _jobs():
+    return [FetchJob("stub", s, tf, T0) for s, tf in _histories()]
+
+
+def _no_sleep(seconds):
+    return asyncio.sleep(0)
+
+
+def _assert_stored(root, histories):
+    for (symbol, timeframe), rows in histories.items():
+        stored = read_raw(partition_dir(symbol, timeframe, root))
+        pd.testing.assert_frame_equal(stored, pd.DataFrame(rows, columns=list(stored.columns)))
+
+
+def test_scheduler_fetches_all_jobs_with_retries(tmp_path):
+    histories = _histories()
+    ex = StubExchange(histories, fail_every=4)
+    summary = asyncio.run(
+        run_fetch_jobs({"stub": ex}, _jobs(), root=str(tmp_path), sleep=_no_sleep)
+    )
+
+    assert summary["error"].isna().all()
+    assert summary["rows_fetched"].tolist() == [1000, 700, 400]
+    _assert_stored(str(tmp_path), histories)
+
+
+def test_scheduler_shares_one_token_bucket_per_exchange(tmp_path):
+    ex = StubExchange(_histories())
+    bucket = TokenBucket(rate=200.0, capacity=2)
+    start = time.monotonic()
+    asyncio.run(run_fetch_jobs({"stub": ex}, _jobs(), buckets={"stub": bucket}, root=str(tmp_path)))
+    elapsed = time.monotonic() - start
+
+    # 4 + 3 + 2 data pages plus one empty page per job, all through the same bucket.
+    assert len(ex.calls) == 12
+    assert elapsed >= (len(ex.calls) - 2) / 200.0
+    # Jobs run concurrently: every job has started before any job makes its last request.
+    keys = [(c[0], c[1]) for c in ex.calls]
+    first = [keys.index(k) for k in set(keys)]
+    last = [len(keys) - 1 - keys[::-1].index(k) for k in set(keys)]
+    assert len(first) == 3 and max(first) < min(last)
+
+
+def test_scheduler_resumes_after_interruption(tmp_path):
+    histories = _histories()
+    root = str(tmp_path)
+    broken = StubExchange(histories, fail_after=4)
+    first = asyncio.run(run_fetch_jobs({"stub": broken}, _jobs(), root=root, max_retries=0))
+    assert first["error"].notna().any()
+
+    ex = StubExchange(histories)
+    second = asyncio.run(run_fetch_jobs({"stub": ex}, _jobs(), root=root))
+    assert second["error"].isna().all()
+    _assert_stored(root, histories)
+
+    # Jobs that had stored pages restart from their last stored bar, not from the start.
+    resumed = [since for _, _, since, _ in ex.calls if since != T0]
+    assert resumed
+
+
+def test_scheduler_writes_each_month_once_off_the_event_loop(tmp_path, monkeypatch):
+    import data_raw.fetch_scheduler as scheduler
+
+    histories = {("BTC/USD:USD", "1h"): _history(24 * 75, "1h", 3)}
+    writes = []
+    append = scheduler.append_rows
+
+    def recording_append(path, rows):
+        writes.append((threading.current_thread() is not threading.main_thread(), len(rows)))
+        return append(path, rows)
+
+    monkeypatch.setattr(scheduler, "append_rows", recording_append)
+    job = FetchJob("stub", "BTC/USD:USD", "1h", T0)
+    ex = StubExchange(histories)
+    out = asyncio.run(run_fetch_job(ex, TokenBucket(rate=1e6), job, root=str(tmp_path), limit=100))
+
+    assert out["rows_fetched"] == 24 * 75
+    assert len(month_files(out["path"])) == 3
+    # One write per month (January, February, then the open March tail), none on the loop thread.
+    assert [n for _, n in writes] == [24 * 31, 24 * 29, 24 * 15]
+    assert all(off_loop for off_loop, _ in writes)
+    _assert_stored(str(tmp_path), histories)
+
+
+def test_scheduler_does_not_retry_non_network_errors(tmp_path):
+    ex = StubExchange(_histories(), fail_after=0)
+    summary = asyncio.run(run_fetch_jobs({"stub": ex}, _jobs()[:1], root=str(tmp_path), sleep=_no_sleep))
+    assert summary["error"].str.contains("RuntimeError").all()
+    assert len(ex.calls) == 1
+
+
+def test_scheduler_migrates_legacy_bars_before_paging(tmp_path):
+    histories = {("BTC/USD:USD", "1h"): _history(1000, "1h", 4)}
+    rows = histories[("BTC/USD:USD", "1h")]
+    path = partition_dir("BTC/USD:USD", "1h", str(tmp_path))
+    pd.DataFrame(rows[:600], columns=RAW_COLS).to_parquet(legacy_raw_path(path), index=False)
+
+    ex = StubExchange(histories)
+    job = FetchJob("stub", "BTC/USD:USD", "1h", T0)
+    out = asyncio.run(run_fetch_job(ex, TokenBucket(rate=1e6), job, root=str(tmp_path)))
+
+    # Paging starts at the last legacy bar, not at start_ms.
+    assert ex.calls[0][2] == rows[599][0]
+    assert out["rows_fetched"] == 401
+    _assert_stored(str(tmp_path), histories)
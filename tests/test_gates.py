@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from backtest.gates import GateConfig, evaluate_gates, gate_matrix, load_gate_config
+
+
+def _rows(records):
+    cols = ["strategy", "config_hash", "split", "data_hash", "final_equity", "max_drawdown"]
+    return pd.DataFrame(records, columns=cols).assign(initial_equity=1_000.0)
+
+
+def test_gates_from_config():
+    gates = load_gate_config()
+    assert gates.max_drawdown == 0.10
+    assert gates.must_beat_baselines
+    assert gates.baselines == ("always_up", "yesterday_equals_today")
+
+
+def test_gate_matrix_and_ranking():
+    rows = _rows(
+        [
+            ("always_up", "a", "test", "d1", 1_100.0, 0.30),
+            ("yesterday_equals_today", "a", "test", "d1", 1_050.0, 0.20),
+            ("always_up", "b", "test", "d1", 1_300.0, 0.30),
+            ("v2", "a", "test", "d1", 1_200.0, 0.05),  # beats both config-a baselines
+            ("v2", "b", "test", "d1", 1_200.0, 0.05),  # loses to always_up under config b
+            ("v1", "a", "test", "d1", 1_400.0, 0.15),  # drawdown gate fails
+            ("v1", "c", "test", "d1", 1_250.0, 0.08),  # no config-c baselines: best in window
+            ("v2", "a", "test", "d2", 1_500.0, 0.01),  # other bars, no baselines at all
+        ]
+    )
+    gated = evaluate_gates(rows, GateConfig(max_drawdown=0.10))
+    assert len(gated) == 5
+
+    m = gate_matrix(gated)
+    assert list(m.columns) == ["gate_max_drawdown", "gate_beats_always_up", "gate_beats_yesterday_equals_today", "passed"]
+    assert m["passed"].tolist() == [True, False, False, False, False]
+    assert m["gate_beats_always_up"].tolist() == [True, False, True, False, False]
+    assert m["gate_max_drawdown"].tolist() == [True, True, False, True, True]
+    np.testing.assert_allclose(gated["excess_growth"][:4], [0.1, -0.1, 0.3, -0.05])
+    assert np.isnan(gated.loc[4, "excess_growth"])
+
+    # Within window d1: the passing candidate first, then failures by growth.
+    assert gated["rank"].tolist() == [1, 4, 2, 3, 1]
+
+    relaxed = evaluate_gates(rows, GateConfig(max_drawdown=0.10, must_beat_baselines=False))
+    assert relaxed["passed"].tolist() == [True, True, False, True, True]
+    assert "gate_beats_always_up" not in relaxed.columns
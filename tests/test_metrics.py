@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from backtest.batch import TRADE_COLS, config_grid, run_batch_curves, run_strategy_matrix
+from backtest.engine import EngineConfig, run_engine
+from backtest.metrics import PERF_COLS, monthly_returns, run_metrics, score_curves, trade_metrics
+from model.baselines import always_up, yesterday_equals_today
+from model.strategy_v1 import build_signals_v1
+
+
+def _random_bars(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    open_ = np.r_[100.0, close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.006, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+def test_batch_scores_match_single_runs():
+    df = _random_bars(2500, seed=3)
+    rng = np.random.default_rng(4)
+    codes = rng.choice([1, -1, 0], size=len(df), p=[0.3, 0.3, 0.4]).astype(np.int8)
+    sig = pd.Series(codes, index=pd.DatetimeIndex(df["ts"]))
+    base = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+    configs = config_grid(base, stop_loss_pct=[0.005, 0.02], hold_min_bars=[0, 12])
+
+    _, curves = run_batch_curves(df["open"], df["high"], df["low"], df["close"], codes, configs)
+    assert curves.equity.shape == (len(configs), len(df))
+    assert list(curves.trades.columns) == TRADE_COLS
+    scores = score_curves(curves.equity, df["ts"], 1_000.0, curves.trades)
+
+    for j, cfg in enumerate(configs):
+        trades, equity, _ = run_engine(df, sig, cfg)
+        np.testing.assert_array_equal(curves.equity[j], equity["equity"].to_numpy())
+        mine = curves.trades[curves.trades["column"] == j]
+        completed = trades.dropna(subset=["exit_px"])
+        np.testing.assert_array_equal(mine["bars_held"], completed["bars_held"])
+        np.testing.assert_allclose(mine["net_ret"], completed["net_ret"], rtol=1e-12, atol=1e-15)
+
+        single = run_metrics(trades, equity, cfg.initial_equity)
+        np.testing.assert_allclose([single[c] for c in PERF_COLS], scores.iloc[j].to_numpy(), rtol=1e-12)
+
+
+def test_hand_computed_metrics():
+    ts = pd.date_range("2024-01-31 22:00", periods=4, freq="h", tz="UTC")
+    equity = np.array([[110.0, 99.0, 99.0, 121.0], [100.0, 100.0, 100.0, 100.0]])
+    trades = pd.DataFrame(
+        {"column": [0, 0, 0], "bars_held": [1, 1, 1], "net_ret": [0.1, -0.1, -0.05]}
+    )
+
+    scores = score_curves(equity, ts, 100.0, trades)
+    r = np.array([0.1, -0.1, 0.0, 2.0 / 9.0])
+    ppy = 365.25 * 24
+    assert np.isclose(scores.loc[0, "sharpe"], r.mean() / r.std(ddof=1) * np.sqrt(ppy))
+    assert np.isclose(scores.loc[0, "sortino"], r.mean() / np.sqrt(0.01 / 4) * np.sqrt(ppy))
+    assert np.isclose(scores.loc[0, "max_drawdown"], 0.1)
+    assert scores.loc[0, "max_dd_duration"] == 2
+    assert np.isclose(scores.loc[0, "cagr"], 1.21 ** (ppy / 4) - 1)
+    assert np.isclose(scores.loc[0, "exposure"], 3 / 4)
+    assert (scores.loc[0, "max_win_streak"], scores.loc[0, "max_loss_streak"]) == (1, 2)
+    assert np.isnan(scores.loc[1, "sharpe"]) and np.isnan(scores.loc[1, "avg_bars_held"])
+    assert scores.loc[1, "max_drawdown"] == 0.0 and scores.loc[1, "max_win_streak"] == 0
+
+    months = monthly_returns(equity, ts, 100.0)
+    assert list(months.columns) == ["2024-01", "2024-02"]
+    np.testing.assert_allclose(months.iloc[0], [-0.01, 121.0 / 99.0 - 1])
+
+    streaks = trade_metrics(trades.assign(net_ret=[0.1, 0.2, 0.3]), 2, 4, ppy)
+    assert list(streaks["max_win_streak"]) == [3, 0]
+
+
+def test_strategy_matrix_score_columns():
+    df = _random_bars(1500, seed=5)
+    signals = pd.DataFrame(
+        {
+            "always_up": always_up(df),
+            "yesterday_equals_today": yesterday_equals_today(df),
+            "v1": build_signals_v1(df),
+        }
+    )
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+
+    plain = run_strategy_matrix(df, signals, cfg)
+    scored = run_strategy_matrix(df, signals, cfg, score=True)
+    pd.testing.assert_frame_equal(scored[plain.columns], plain)
+    assert set(PERF_COLS) <= set(scored.columns)
+
+    trades, equity, _ = run_engine(df, signals["v1"], cfg)
+    single = run_metrics(trades, equity, cfg.initial_equity)
+    np.testing.assert_allclose(scored.loc[2, PERF_COLS].to_numpy(dtype=float), [single[c] for c in PERF_COLS], rtol=1e-12)
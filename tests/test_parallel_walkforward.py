@@ -0,0 +1,66 @@
+from dataclasses import asdict
+
+import numpy as np
+import pandas as pd
+
+from backtest import parallel
+from backtest.engine import EngineConfig, run_engine
+from backtest.parallel import run_walkforward_parallel
+from backtest.walkforward import STRATEGY_BUILDERS, split_walkforward
+from data_parquet.dataset import write_bars_ipc
+
+
+def _random_bars(start: str, end: str, seed: int) -> pd.DataFrame:
+    ts = pd.date_range(start, end, freq="h", tz="UTC")
+    n = len(ts)
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.004, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": ts,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+def test_parallel_walkforward_is_deterministic_and_matches_serial_loop():
+    df = _random_bars("2022-10-01", "2024-02-15", seed=9)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+
+    serial = run_walkforward_parallel(df, cfg, workers=1)
+    pooled = run_walkforward_parallel(df, cfg, workers=3)
+    pd.testing.assert_frame_equal(pooled, serial)
+
+    assert list(serial["split"].unique()) == ["train", "validate", "test"]
+    assert len(serial) == 3 * len(STRATEGY_BUILDERS)
+
+    for split_name, split_df in split_walkforward(df).items():
+        for strategy, build in STRATEGY_BUILDERS.items():
+            _, _, metrics = run_engine(split_df, build(split_df), cfg)
+            row = serial[(serial["split"] == split_name) & (serial["strategy"] == strategy)].iloc[0]
+            assert row[list(metrics)].to_dict() == metrics
+
+
+def test_jobs_run_on_views_of_the_mapped_bars(tmp_path):
+    df = _random_bars("2023-01-01", "2023-02-15", seed=3)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+    path = str(tmp_path / "bars.arrow")
+    write_bars_ipc(df, path)
+
+    parallel._open_bars(path)
+    try:
+        close = parallel._worker_arrays["close"]
+        assert not close.flags.owndata and not close.flags.writeable
+        row = parallel._run_job(("all", 100, len(df), "v2"), asdict(cfg))
+    finally:
+        parallel._close_bars()
+
+    part = df.iloc[100:].reset_index(drop=True)
+    _, _, metrics = run_engine(part, STRATEGY_BUILDERS["v2"](part), cfg)
+    assert row == {"split": "all", "strategy": "v2", **metrics}
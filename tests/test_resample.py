@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import EngineConfig, run_engine
+from data_parquet.bars import Bars
+from data_parquet.resample import cached_resample, resample_bars
+from model.strategy_v1 import build_signals_v1
+
+
+def _random_bars(start: str, end: str, seed: int) -> pd.DataFrame:
+    ts = pd.date_range(start, end, freq="h", tz="UTC")
+    n = len(ts)
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.004, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": ts,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.uniform(1.0, 10.0, n),
+        }
+    )
+
+
+@pytest.mark.parametrize("rule", ["4h", "12h", "1d"])
+def test_resample_matches_pandas_and_reports_gaps(rule):
+    df = _random_bars("2023-01-01 03:00", "2023-03-01", seed=1)
+    df = df.drop(df.index[[5, 6, 7, 100]].tolist() + list(range(400, 430))).reset_index(drop=True)
+
+    out = resample_bars(df, rule)
+
+    agg = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    pandas_rule = rule.replace("d", "D")
+    ref = df.set_index("ts").resample(pandas_rule).agg(agg)
+    ref["bar_count"] = df.set_index("ts")["close"].resample(pandas_rule).count()
+    ref = ref[ref["bar_count"] > 0].reset_index()
+
+    pd.testing.assert_frame_equal(out.drop(columns="missing_bars"), ref.astype({"bar_count": np.int64}), check_dtype=False)
+    step = {"4h": 4, "12h": 12, "1d": 24}[rule]
+    assert (out["missing_bars"] == step - out["bar_count"]).all()
+    assert out["missing_bars"].sum() == len(out) * step - len(df)
+
+
+def test_resample_cache_is_keyed_to_source(tmp_path):
+    df = _random_bars("2023-01-01", "2023-01-20", seed=2)
+    first = cached_resample(Bars.from_frame(df), "4h", root=str(tmp_path))
+    assert len(list(tmp_path.glob("4h_*.parquet"))) == 1
+    again = cached_resample(df, "4h", root=str(tmp_path))
+    pd.testing.assert_frame_equal(again, first)
+    assert len(list(tmp_path.glob("4h_*.parquet"))) == 1
+
+    changed = df.copy()
+    changed.loc[10, "close"] *= 1.01
+    cached_resample(changed, "4h", root=str(tmp_path))
+    assert len(list(tmp_path.glob("4h_*.parquet"))) == 2
+
+
+def test_higher_timeframe_bars_run_through_strategy_and_engine():
+    df = _random_bars("2022-01-01", "2023-06-01", seed=3)
+    bars_4h = resample_bars(df, "4h")
+    signals = build_signals_v1(bars_4h)
+    assert signals.index.equals(pd.DatetimeIndex(bars_4h["ts"], name="ts"))
+
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0, hold_min_bars=3)
+    _, equity, metrics = run_engine(bars_4h, signals, cfg)
+    assert len(equity) == len(bars_4h)
+    assert metrics["num_trades"] > 0
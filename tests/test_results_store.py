@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import pytest
+
+from backtest.engine import EngineConfig, run_engine
+from backtest.results import KEY_COLS, ResultsStore, config_hash, data_hash
+from backtest.gates import GateConfig, evaluate_gates
+from backtest.section9_eval import candidate_row, load_test_metrics
+from model.baselines import always_up, yesterday_equals_today
+from model.strategy_v1 import build_signals_v1
+
+
+def _bars(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    open_ = np.r_[100.0, close[:-1]]
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+            "open": open_,
+            "high": np.maximum(open_, close) * 1.002,
+            "low": np.minimum(open_, close) * 0.998,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+CFG = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+
+
+def test_append_run_round_trip_and_latest(tmp_path):
+    store = ResultsStore("exp", root=str(tmp_path))
+    df = _bars(600, seed=1)
+    trades, equity, metrics = run_engine(df, build_signals_v1(df), CFG)
+
+    store.append_run("v1", "test", CFG, df, {**metrics, "final_equity": -1.0})
+    run_id = store.append_run("v1", "test", CFG, df, metrics, trades, equity)
+
+    rows = store.query()
+    assert len(rows) == 1 and list(rows.columns[:4]) == KEY_COLS
+    assert rows.loc[0, "run_id"] == run_id
+    assert rows.loc[0, "final_equity"] == metrics["final_equity"]
+    assert rows.loc[0, "config_hash"] == config_hash(CFG)
+    assert rows.loc[0, "data_hash"] == data_hash(df)
+    assert len(store.query(latest=False)) == 2 and len(store.runs()) == 2
+
+    stored = store.query("equity", filters={"strategy": "v1"}, columns=["ts", "equity"])
+    pd.testing.assert_frame_equal(stored, equity[["ts", "equity"]])
+    assert len(store.query("trades", filters={"run_id": run_id})) == len(trades)
+
+
+def test_query_filters_and_schema_growth(tmp_path):
+    store = ResultsStore("sweep", root=str(tmp_path))
+    grid = pd.DataFrame(
+        {
+            "strategy": ["v1", "v1", "v2", "v2"],
+            "config_hash": ["a", "b", "a", "b"],
+            "split": ["test", "validate", "test", "validate"],
+            "data_hash": "d",
+            "final_equity": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+    assert len(store.append("metrics", grid)) == 4
+    store.append("metrics", grid.iloc[:1].assign(config_hash="c", sharpe=1.5))
+
+    hit = store.query(filters={"split": "test", "config_hash": ["a", "c"]})
+    assert sorted(hit["final_equity"]) == [1.0, 1.0, 3.0]
+    assert hit["sharpe"].isna().sum() == 2
+
+    expr = store.query(filters=pc.field("final_equity") > 2.5)
+    assert sorted(expr["final_equity"]) == [3.0, 4.0]
+    assert store.query(filters={"strategy": "missing"}).empty
+
+
+def test_section9_reads_one_query(tmp_path):
+    store = ResultsStore("walkforward", root=str(tmp_path))
+    df = _bars(400, seed=2)
+    builders = {"v2": build_signals_v1, "always_up": always_up, "yesterday_equals_today": yesterday_equals_today}
+    for name, build in builders.items():
+        _, _, metrics = run_engine(df, build(df), CFG)
+        store.append_run(name, "test", CFG, df, metrics)
+    store.append_run("always_up", "test", CFG, df.iloc[:200], {"final_equity": 0.0})
+
+    m = load_test_metrics(store, config_hash(CFG))
+    assert sorted(m["strategy"]) == ["always_up", "v2", "yesterday_equals_today"]
+    assert (m["data_hash"] == data_hash(df)).all()
+
+
+def test_section9_gates_the_frozen_config_not_the_best_ranked(tmp_path):
+    store = ResultsStore("walkforward", root=str(tmp_path))
+    df = _bars(400, seed=2)
+    other = {"fee_taker": 0.0}
+    store.append_run("v2", "test", CFG, df, {"final_equity": 1.1, "max_drawdown": 0.05})
+    store.append_run("v2", "test", other, df, {"final_equity": 9.0, "max_drawdown": 0.01})
+    store.append_run("always_up", "test", CFG, df, {"final_equity": 1.0, "max_drawdown": 0.2})
+
+    gates = GateConfig(max_drawdown=0.1, baselines=("always_up",))
+    gated = evaluate_gates(load_test_metrics(store, config_hash(CFG)), gates)
+    v = candidate_row(gated, config_hash(CFG))
+    assert v["final_equity"] == 1.1 and v["rank"] == 2
+    with pytest.raises(FileNotFoundError):
+        load_test_metrics(store, "0" * 16)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import EngineConfig, run_engine
+from backtest.robustness import resample_paths, robustness_report
+from model.strategy_v1 import build_signals_v1
+
+
+def _random_bars(n: int, seed: int) -> pd.DataFrame:
+    ts = pd.date_range("2023-01-01", periods=n, freq="h", tz="UTC")
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.004, n)) * close
+    return pd.DataFrame(
+        {
+            "ts": ts,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+def _naive_stats(returns: np.ndarray, idx: np.ndarray, initial_equity: float) -> pd.DataFrame:
+    rows = []
+    for path in idx:
+        eq = initial_equity * np.cumprod(1.0 + returns[path])
+        peak = np.maximum(np.maximum.accumulate(eq), initial_equity)
+        under = eq < peak
+        longest = run = 0
+        for u in under:
+            run = run + 1 if u else 0
+            longest = max(longest, run)
+        rows.append([eq[-1], ((peak - eq) / peak).max(), longest, under.mean()])
+    return pd.DataFrame(rows, columns=["final_equity", "max_drawdown", "max_underwater", "underwater_frac"])
+
+
+@pytest.mark.parametrize("method,block", [("bootstrap", 1), ("block", 7)])
+def test_resampled_paths_match_naive_loop(method, block):
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0005, 0.02, 200)
+    paths = resample_paths(returns, n_paths=60, method=method, block_size=block, seed=11, initial_equity=100.0)
+
+    draw = np.random.default_rng(11)
+    if method == "bootstrap":
+        idx = draw.integers(0, 200, size=(60, 200), dtype=np.int32)
+    else:
+        starts = draw.integers(0, 200, size=(60, 29), dtype=np.int32)
+        idx = ((starts[:, :, None] + np.arange(7)) % 200).reshape(60, -1)[:, :200]
+
+    expected = _naive_stats(returns, idx, 100.0)
+    np.testing.assert_allclose(paths["final_equity"], expected["final_equity"], rtol=1e-10)
+    np.testing.assert_allclose(paths["max_drawdown"], expected["max_drawdown"], rtol=1e-10, atol=1e-14)
+    np.testing.assert_array_equal(paths["max_underwater"], expected["max_underwater"])
+    np.testing.assert_allclose(paths["underwater_frac"], expected["underwater_frac"])
+
+
+def test_resampling_is_deterministic_and_chunk_invariant():
+    returns = np.random.default_rng(1).normal(0.0, 0.01, 500)
+    a = resample_paths(returns, n_paths=250, method="block", block_size=24, seed=5)
+    b = resample_paths(returns, n_paths=250, method="block", block_size=24, seed=5, chunk_elems=3_000)
+    c = resample_paths(returns, n_paths=250, method="block", block_size=24, seed=6)
+    pd.testing.assert_frame_equal(a, b)
+    assert not a.equals(c)
+
+
+def test_robustness_report_on_engine_run():
+    df = _random_bars(3_000, seed=2)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+    trades, equity, _ = run_engine(df, build_signals_v1(df), cfg)
+
+    report = robustness_report(trades, equity, n_paths=200, seed=3)
+    assert len(report) == 2 * 2 * 4
+    assert set(report["source"]) == {"trades", "bars"}
+    assert list(report.columns[:3]) == ["source", "method", "stat"]
+
+    pd.testing.assert_frame_equal(report, robustness_report(trades, equity, n_paths=200, seed=3))
+    dd = report[report["stat"] == "max_drawdown"]
+    assert ((dd["p05"] <= dd["p50"]) & (dd["p50"] <= dd["p95"])).all()
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from model.signal_filters import (
+    _apply_confirm_switch,
+    _apply_min_hold,
+    apply_signal_filters,
+    apply_signal_filters_grid,
+    min_hold_codes,
+)
+from model.signals import SIGNAL_LABELS, decode_signals, encode_signals
+
+
+def _sticky_labels(n: int, seed: int, stay: float, p_flat: float) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    draws = rng.choice(3, size=n, p=[(1 - p_flat) / 2, p_flat, (1 - p_flat) / 2])
+    keep = rng.random(n) < stay
+    idx = np.where(keep, 0, np.arange(n))
+    idx = np.maximum.accumulate(idx)
+    return pd.Series(SIGNAL_LABELS[draws[idx]], index=pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"))
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_fused_filters_match_reference_loops(seed):
+    raw = _sticky_labels(2000, seed, stay=0.1 * seed + 0.3, p_flat=0.3)
+    for confirm_bars in (1, 2, 3, 6):
+        confirmed = _apply_confirm_switch(raw, confirm_bars=confirm_bars)
+        for hold_bars in (0, 1, 24, 72):
+            expected = _apply_min_hold(confirmed, hold_bars=hold_bars)
+            got = apply_signal_filters(raw, confirm_bars=confirm_bars, hold_bars=hold_bars)
+            assert got.dtype == np.int8
+            pd.testing.assert_series_equal(decode_signals(got), expected)
+
+
+def test_min_hold_codes_handles_interleaved_flats():
+    raw = _sticky_labels(1000, 42, stay=0.5, p_flat=0.5)
+    codes = encode_signals(raw)
+    for hold_bars in (0, 3, 10):
+        expected = _apply_min_hold(raw, hold_bars=hold_bars)
+        assert list(decode_signals(min_hold_codes(codes, hold_bars))) == list(expected)
+
+
+def test_filter_grid_matches_single_pairs():
+    raw = _sticky_labels(1500, 3, stay=0.6, p_flat=0.2)
+    pairs = [(c, h) for c in (1, 2, 3) for h in (0, 12, 24, 72)]
+    grid = apply_signal_filters_grid(raw, pairs)
+    assert grid.shape == (len(raw), len(pairs))
+    for c, h in pairs:
+        pd.testing.assert_series_equal(
+            grid[(c, h)], apply_signal_filters(raw, confirm_bars=c, hold_bars=h), check_names=False
+        )
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from data_raw.validate_ohlcv import HOUR_MS, validate_ohlcv
+
+
+def _raw_bars(n: int, step_ms: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ts = 1_640_995_200_000 + np.arange(n, dtype=np.int64) * step_ms
+    close = 40_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame(
+        {
+            "ts_ms": ts,
+            "open": open_,
+            "high": np.maximum(open_, close) * 1.001,
+            "low": np.minimum(open_, close) * 0.999,
+            "close": close,
+            "volume": rng.uniform(1.0, 5.0, n),
+        }
+    )
+
+
+def _loop_missing_hours(ts_ms: pd.Series) -> int:
+    ts = ts_ms.drop_duplicates().sort_values().to_numpy()
+    missing = 0
+    for i in range(1, len(ts)):
+        gap = int(ts[i] - ts[i - 1])
+        if gap > HOUR_MS:
+            missing += int(gap / HOUR_MS) - 1
+    return missing
+
+
+def test_validator_counts_and_gap_index():
+    df = _raw_bars(500, HOUR_MS)
+    df = df.drop(index=list(range(10, 13)) + [100] + list(range(300, 350))).reset_index(drop=True)
+    df.loc[5, "ts_ms"] += HOUR_MS // 2  # off-grid bar
+    df.loc[20, "high"] = df.loc[20, "open"] * 0.99  # high below open
+    df.loc[21, "low"] = df.loc[21, "close"] * 1.01  # low above close
+    dups = df.iloc[[7, 200, 201]].copy()
+    dups["high"] = 0.0  # duplicates are dropped, keeping the first occurrence
+    df = pd.concat([df, dups], ignore_index=True)
+
+    issues, gaps = validate_ohlcv(df)
+
+    assert issues["rows"] == 446
+    assert issues["duplicate_count"] == 3
+    assert issues["missing_hours_total"] == _loop_missing_hours(df["ts_ms"]) == 54
+    assert issues["non_hour_step_count"] == 5
+    assert issues["ohlc_inconsistent_rows"] == 2
+    assert issues["negative_price_rows"] == 0
+    assert issues["pass"] is False
+
+    assert list(gaps.columns) == ["gap_start", "gap_end", "missing_bars"]
+    assert gaps["missing_bars"].tolist() == [3, 1, 50]
+    t0 = pd.Timestamp(1_640_995_200_000, unit="ms", tz="UTC")
+    assert gaps["gap_start"].iloc[0] == t0 + pd.Timedelta(hours=9)
+    assert gaps["gap_end"].iloc[0] == t0 + pd.Timedelta(hours=13)
+
+
+def test_validator_passes_clean_minute_data():
+    # Speed at this size is tracked by the bench suite, not asserted here.
+    df = _raw_bars(3_000_000, 60_000, seed=1)
+    issues, gaps = validate_ohlcv(df, step_ms=60_000)
+
+    assert issues["pass"] is True
+    assert issues["rows"] == 3_000_000
+    assert gaps.empty
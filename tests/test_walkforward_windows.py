@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.batch import METRIC_COLS
+from backtest.engine import EngineConfig, run_engine, run_engine_arrays
+from backtest.walkforward import SPLIT_BOUNDS, STRATEGY_BUILDERS
+from backtest.windows import (
+    WindowSpec,
+    ROLLING_STRATEGIES,
+    generate_windows,
+    load_walkforward_config,
+    run_rolling_strategy,
+    run_rolling_walkforward,
+    run_windows,
+    split_bounds_from_config,
+)
+
+
+def _bars(n: int, seed: int = 4) -> pd.DataFrame:
+    ts = pd.date_range("2022-01-01", periods=n, freq="h", tz="UTC")
+    rng = np.random.default_rng(seed)
+    close = 20_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame(
+        {
+            "ts": ts,
+            "open": open_,
+            "high": np.maximum(open_, close) * 1.002,
+            "low": np.minimum(open_, close) * 0.998,
+            "close": close,
+            "volume": np.ones(n),
+        }
+    )
+
+
+def test_split_bounds_come_from_config():
+    wf = load_walkforward_config()
+    assert split_bounds_from_config(wf) == SPLIT_BOUNDS
+    assert split_bounds_from_config({**wf, "validate": ["2023-01-01", "2023-06-30"]})["validate"] == (
+        "2023-01-01",
+        "2023-07-01",
+    )
+    assert SPLIT_BOUNDS["test"][1] is None
+    spec = WindowSpec.from_config(wf["rolling"])
+    assert spec.mode in ("rolling", "anchored")
+
+
+@pytest.mark.parametrize("mode", ["rolling", "anchored"])
+def test_windows_match_naive_timestamp_masks(mode):
+    df = _bars(24 * 40)
+    # Drop a block of bars so index ranges and calendar durations diverge.
+    df = df.drop(df.index[300:340]).reset_index(drop=True)
+    spec = WindowSpec(mode=mode, train=pd.Timedelta("10D"), test=pd.Timedelta("3D"), step=pd.Timedelta("2D"))
+    windows = generate_windows(df["ts"], spec)
+
+    t0 = df["ts"].iloc[0]
+    assert len(windows) == 14
+    for w in windows:
+        train_end = t0 + spec.train + w.index * spec.step
+        train_start = t0 if mode == "anchored" else t0 + w.index * spec.step
+        train_mask = (df["ts"] >= train_start) & (df["ts"] < train_end)
+        test_mask = (df["ts"] >= train_end) & (df["ts"] < train_end + spec.test)
+        assert np.flatnonzero(train_mask).tolist() == list(range(w.train_start, w.train_stop))
+        assert np.flatnonzero(test_mask).tolist() == list(range(w.test_start, w.test_stop))
+    assert windows[-1].test_stop <= len(df)
+
+
+def test_run_windows_matches_engine_on_copies():
+    df = _bars(24 * 30)
+    rng = np.random.default_rng(1)
+    codes = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=len(df))
+    spec = WindowSpec(mode="rolling", train=pd.Timedelta("7D"), test=pd.Timedelta("5D"), step=pd.Timedelta("5D"))
+    windows = generate_windows(df["ts"], spec)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+
+    o, h, l, c = (df[k].to_numpy() for k in ("open", "high", "low", "close"))
+    table = run_windows(df["ts"], o, h, l, c, codes, windows, cfg)
+    assert len(table) == len(windows)
+
+    for w, row in zip(windows, table.itertuples()):
+        part = df.iloc[w.test].reset_index(drop=True).copy()
+        _, _, metrics = run_engine_arrays(
+            part["ts"], part["open"].to_numpy(), part["high"].to_numpy(), part["low"].to_numpy(),
+            part["close"].to_numpy(), codes[w.test].copy(), cfg,
+        )
+        assert row.final_equity == metrics["final_equity"]
+        assert row.num_trades == metrics["num_trades"]
+
+
+@pytest.mark.parametrize("strategy", ["v1", "v2"])
+def test_rolling_retrain_matches_naive_per_window_rebuild(strategy):
+    df = _bars(24 * 60, seed=11)
+    # Bump volatility in a stretch so v2's vol gate fires in some windows.
+    shock = np.exp(np.cumsum(np.random.default_rng(2).normal(0.0, 0.06, 101)))
+    df.loc[600:700, ["open", "high", "low", "close"]] *= shock[:, None]
+    spec = WindowSpec(mode="rolling", train=pd.Timedelta("10D"), test=pd.Timedelta("5D"), step=pd.Timedelta("4D"))
+    windows = generate_windows(df["ts"], spec)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+
+    table = run_rolling_strategy(df, strategy, windows, cfg)
+    builder = STRATEGY_BUILDERS[strategy]
+
+    assert len(table) == len(windows)
+    for w, row in zip(windows, table.to_dict("records")):
+        window_df = df.iloc[w.train_start : w.test_stop].reset_index(drop=True)
+        signals = builder(window_df)
+        test_df = df.iloc[w.test].reset_index(drop=True)
+        _, _, naive = run_engine(test_df, signals, cfg)
+        for k in METRIC_COLS:
+            assert row[k] == naive[k], (w.index, k)
+
+
+def test_rolling_walkforward_runs_every_strategy_on_every_window():
+    df = _bars(24 * 40, seed=5)
+    spec = WindowSpec(mode="anchored", train=pd.Timedelta("10D"), test=pd.Timedelta("5D"), step=pd.Timedelta("5D"))
+    windows = generate_windows(df["ts"], spec)
+    cfg = EngineConfig(fee_taker=0.0004, slippage_side=0.0001, stop_loss_pct=0.02, initial_equity=1_000.0)
+
+    table = run_rolling_walkforward(df, spec, cfg)
+    names = ["always_up", "yesterday_equals_today", *ROLLING_STRATEGIES]
+    assert table["strategy"].tolist() == [n for n in names for _ in windows]
+
+    v1 = table[table["strategy"] == "v1"].reset_index(drop=True)
+    pd.testing.assert_frame_equal(v1, run_rolling_strategy(df, "v1", windows, cfg))
+    for name in ("always_up", "yesterday_equals_today"):
+        # Naive: rebuild the baseline on the window's own bars, trade its test range.
+        rows = table[table["strategy"] == name]
+        for w, row in zip(windows, rows.to_dict("records")):
+            window_df = df.iloc[w.train_start : w.test_stop].reset_index(drop=True)
+            signals = STRATEGY_BUILDERS[name](window_df)
+            test_df = df.iloc[w.test].reset_index(drop=True)
+            _, _, naive = run_engine(test_df, signals, cfg)
+            for k in METRIC_COLS:
+                assert row[k] == naive[k], (name, w.index, k)